@@ -1,10 +1,25 @@
 """ASV benchmarks for Oct2Py, modeled on tests/test_usage.py."""
 
+from typing import ClassVar
+
 import numpy as np
+from scipy.sparse import random_array
 
 from oct2py import Oct2Py
 
 
+class ImportBenchmarks:
+    """Benchmark importing oct2py in a fresh interpreter."""
+
+    def timeraw_import_oct2py(self):
+        """Time of `import oct2py`."""
+        return "import oct2py"
+
+    def timeraw_import_oct2py_session(self):
+        """Time of importing oct2py and the Oct2Py class."""
+        return "from oct2py import Oct2Py"
+
+
 class StartupBenchmarks:
     """Benchmark Oct2Py session startup and teardown."""
 
@@ -62,6 +77,31 @@ class FevalBenchmarks:
         self.oc.feval("svd", np.array([[1, 2], [1, 3]]), nout=3)
 
 
+class BindBenchmarks:
+    """Benchmark tiny calls through feval(), a bound and a memoized function."""
+
+    def setup(self):
+        self.oc = Oct2Py()
+        self.plus = self.oc.bind("plus")
+        self.memo_plus = self.oc.memoize("plus")
+        self.memo_plus(1, 2)
+
+    def teardown(self):
+        self.oc.exit()
+
+    def time_feval_plus(self):
+        """feval('plus', 1, 2)."""
+        self.oc.feval("plus", 1, 2)
+
+    def time_bound_plus(self):
+        """Bound call: plus(1, 2) from oc.bind('plus')."""
+        self.plus(1, 2)
+
+    def time_memoized_plus(self):
+        """Cached call: plus(1, 2) from oc.memoize('plus')."""
+        self.memo_plus(1, 2)
+
+
 class DynamicFunctionBenchmarks:
     """Benchmark dynamic function dispatch via __getattr__."""
 
@@ -88,6 +128,8 @@ class PushPullBenchmarks:
         self.small = np.ones((3, 3))
         self.medium = np.ones((50, 50))
         self.large = np.ones((200, 200))
+        self.float_list = [float(i) for i in range(1_000_000)]
+        self.str_list = ["s%d" % i for i in range(100_000)]
 
     def teardown(self):
         self.oc.exit()
@@ -117,7 +159,106 @@ class PushPullBenchmarks:
         self.oc.push("arr", self.large)
         self.oc.pull("arr")
 
+    def time_float_list(self):
+        """push a 1M-element Python list of floats."""
+        self.oc.push("lst", self.float_list)
+
+    def time_str_list(self):
+        """push a 100k-element Python list of strings."""
+        self.oc.push("lst", self.str_list)
+
     def time_multi_vars(self):
         """push/pull multiple variables in one call."""
         self.oc.push(["a", "b"], ["foo", [1, 2, 3, 4]])
         self.oc.pull(["a", "b"])
+
+
+class CellStructBenchmarks:
+    """Benchmark pulling large cells and struct arrays."""
+
+    def setup(self):
+        self.oc = Oct2Py()
+        self.oc.eval("scalars = num2cell(1:100000);")
+        self.oc.eval("strings = cellstr(num2str((1:100000)'))';")
+        self.oc.eval("matrices = repmat({ones(3)}, 1, 10000);")
+        self.oc.eval("structs = struct('a', num2cell(1:100000), 'b', 'x');")
+
+    def teardown(self):
+        self.oc.exit()
+
+    def time_cell_scalars(self):
+        """pull a 1x100000 cell of scalars."""
+        self.oc.pull("scalars")
+
+    def time_cellstr(self):
+        """pull a 1x100000 cell of strings."""
+        self.oc.pull("strings")
+
+    def time_cell_matrices(self):
+        """pull a 1x10000 cell of 3x3 matrices."""
+        self.oc.pull("matrices")
+
+    def time_struct_array(self):
+        """pull a 1x100000 struct array with a scalar and a string field."""
+        self.oc.pull("structs")
+
+
+class RawTransportBenchmarks:
+    """Benchmark large array transfer with and without raw array files."""
+
+    params: ClassVar[list[int]] = [0, 1024 * 1024]
+    param_names: ClassVar[list[str]] = ["raw_threshold_bytes"]
+
+    def setup(self, raw_threshold_bytes):
+        self.oc = Oct2Py(raw_threshold_bytes=raw_threshold_bytes)
+        self.large = np.random.default_rng(0).random((2000, 2000))
+
+    def teardown(self, raw_threshold_bytes):
+        self.oc.exit()
+
+    def time_roundtrip_2000x2000(self, raw_threshold_bytes):
+        """feval('double', x) on a 2000x2000 float64 ndarray."""
+        self.oc.feval("double", self.large)
+
+
+class SparseBenchmarks:
+    """Benchmark sparse matrix transfer with and without raw array files."""
+
+    params: ClassVar[list[int]] = [0, 1024 * 1024]
+    param_names: ClassVar[list[str]] = ["raw_threshold_bytes"]
+    timeout = 300
+
+    def setup(self, raw_threshold_bytes):
+        self.oc = Oct2Py(raw_threshold_bytes=raw_threshold_bytes)
+        # 10^7 nonzeros, as in finite element stiffness matrices.
+        self.sparse = random_array((100_000, 100_000), density=1e-3, format="csc", rng=0)
+        self.oc.push("S", self.sparse)
+
+    def teardown(self, raw_threshold_bytes):
+        self.oc.exit()
+
+    def time_push_1e7_nnz(self, raw_threshold_bytes):
+        """push a sparse matrix with 10^7 nonzeros."""
+        self.oc.push("S", self.sparse)
+
+    def time_pull_1e7_nnz(self, raw_threshold_bytes):
+        """pull a sparse matrix with 10^7 nonzeros."""
+        self.oc.pull("S")
+
+
+class RequestServerBenchmarks:
+    """Benchmark small calls with and without the request server."""
+
+    params: ClassVar[list[bool]] = [False, True]
+    param_names: ClassVar[list[str]] = ["request_server"]
+
+    def setup(self, request_server):
+        self.oc = Oct2Py(request_server=request_server)
+        self.oc.feval("ones", 3)
+
+    def teardown(self, request_server):
+        self.oc.exit()
+
+    def time_ones_scalar(self, request_server):
+        """feval('ones', 3) returning a 3x3 matrix."""
+        self.oc.feval("ones", 3)
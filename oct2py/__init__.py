@@ -21,23 +21,51 @@ If you want to run legacy m-files, do not have MATLAB(TM), and do not fully
 trust a code translator, this is your library.
 """
 
-from .utils import Oct2PyError, Oct2PyWarning, get_log  # noqa
+import importlib
+import threading
+from typing import TYPE_CHECKING
 
 from ._version import __version__
 from .check import check
-from .core import Oct2Py, OctaveWorkspaceProxy
 from .demo import demo
-from .io import Cell, Struct, StructArray
-from .settings import Oct2PySettings
 from .speed_check import speed_check
 from .thread_check import thread_check
+from .utils import Oct2PyError, Oct2PyWarning, get_log
+
+if TYPE_CHECKING:
+    from .aio import AsyncOct2Py
+    from .batch import BatchFuture, OctaveBatch
+    from .core import Oct2Py, OctaveWorkspaceProxy
+    from .io import Cell, Struct, StructArray
+    from .pool import Oct2PyPool
+    from .settings import Oct2PySettings
+
+# The modules that define the public names, which are imported on first
+# use so that `import oct2py` does not pull in scipy, pydantic or the
+# Octave kernel.
+_LAZY_NAMES = {
+    "AsyncOct2Py": "aio",
+    "BatchFuture": "batch",
+    "Cell": "io",
+    "Oct2Py": "core",
+    "Oct2PyPool": "pool",
+    "Oct2PySettings": "settings",
+    "OctaveBatch": "batch",
+    "OctaveWorkspaceProxy": "core",
+    "Struct": "io",
+    "StructArray": "io",
+}
 
 __all__ = [
+    "AsyncOct2Py",
+    "BatchFuture",
     "Cell",
     "Oct2Py",
     "Oct2PyError",
+    "Oct2PyPool",
     "Oct2PySettings",
     "Oct2PyWarning",
+    "OctaveBatch",
     "OctaveWorkspaceProxy",
     "Struct",
     "StructArray",
@@ -51,18 +79,104 @@ __all__ = [
     "thread_check",
 ]
 
-try:
-    octave = Oct2Py()
-except Oct2PyError as e:
-    import traceback
 
-    traceback.print_exc()
-    print(f"oct2py: failed to create default session: {e}")  # noqa
+def __getattr__(name):
+    """Import the public names that are loaded on first use."""
+    if name in _LAZY_NAMES:
+        module = importlib.import_module(f".{_LAZY_NAMES[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__():
+    """List the public names, including those not loaded yet."""
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
+class _LazyOct2Py:
+    """The default session, which starts Octave on first use.
+
+    Attribute access is passed on to an `Oct2Py` session that is created
+    the first time it is needed, so importing oct2py does not start Octave.
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_proxy_session", None)
+        object.__setattr__(self, "_proxy_settings", None)
+        object.__setattr__(self, "_proxy_lock", threading.Lock())
+
+    def _get_session(self):
+        """Return the session, starting it if needed."""
+        with self._proxy_lock:
+            if self._proxy_session is None:
+                object.__setattr__(self, "_proxy_session", self._start(self._proxy_settings))
+            return self._proxy_session
+
+    def _configure(self, settings):
+        """Replace the session with one started with the given settings."""
+        with self._proxy_lock:
+            session = self._start(settings)
+            object.__setattr__(self, "_proxy_settings", settings)
+            object.__setattr__(self, "_proxy_session", session)
+
+    def _start(self, settings):
+        """Start a session, explaining a failure to start the default one."""
+        from .core import Oct2Py  # noqa:PLC0415
+
+        try:
+            return Oct2Py(settings=settings)
+        except Oct2PyError as e:
+            msg = f"oct2py: failed to create default session: {e}"
+            raise Oct2PyError(msg) from e
+
+    def __getattr__(self, name):
+        return getattr(self._get_session(), name)
+
+    def __setattr__(self, name, value):
+        # Attributes of the proxy itself (such as a patched `exit`) stay here.
+        if hasattr(type(self), name):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._get_session(), name, value)
+
+    def __delattr__(self, name):
+        if name in self.__dict__:
+            object.__delattr__(self, name)
+        else:
+            delattr(self._get_session(), name)
+
+    def __dir__(self):
+        return dir(self._get_session())
+
+    def __repr__(self):
+        if self._proxy_session is None:
+            return "<oct2py default session (not started)>"
+        return repr(self._proxy_session)
+
+    def exit(self):
+        """Quits this octave session and cleans up, if it was started."""
+        if self._proxy_session is not None:
+            self._proxy_session.exit()
+
+    def restart(self):
+        """Restart the session, if it was started."""
+        if self._proxy_session is not None:
+            self._proxy_session.restart()
+
+
+octave = _LazyOct2Py()
 
 
 def configure(settings=None, **kwargs):
     """Configure (or reconfigure) the default oct2py session.
 
+    The previous session is closed and a new one is started with the
+    settings.  ``oct2py.octave`` stays the same object, so references to
+    it use the new session.
+
     Parameters
     ----------
     settings : Oct2PySettings, optional
@@ -77,11 +191,12 @@ def configure(settings=None, **kwargs):
     >>> import oct2py
     >>> oct2py.configure(backend="disable", timeout=30)  # doctest: +SKIP
     """
-    global octave  # noqa: PLW0603
+    from .settings import Oct2PySettings  # noqa:PLC0415
+
     if settings is None:
         settings = Oct2PySettings(**kwargs)
     octave.exit()
-    octave = Oct2Py(settings=settings)
+    octave._configure(settings)
 
 
 def kill_octave():
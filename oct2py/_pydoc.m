@@ -0,0 +1,34 @@
+function [paths, version, docs, types] = _pydoc(names, fetch)
+% _PYDOC: Look up the documentation of functions for oct2py.
+%
+%   Returns the file that defines each name (empty for built-in and
+%   unknown names) and the Octave version.  If `fetch` is true, also
+%   returns the output of `help` for each name, or the error it raised
+%   prefixed with "error: ", in which case the output of `type` is
+%   returned too.
+
+n = numel(names);
+paths = repmat({''}, 1, n);
+docs = repmat({''}, 1, n);
+types = repmat({''}, 1, n);
+version = OCTAVE_VERSION;
+
+for idx=1:n
+  name = names{idx};
+  paths{idx} = which(name);
+  if ~fetch
+    continue;
+  end
+  try
+    docs{idx} = evalc(sprintf('help("%s")', name));
+  catch err
+    docs{idx} = ['error: ', err.message];
+    try
+      types{idx} = evalc(sprintf('type("%s")', name));
+    catch err
+      types{idx} = ['error: ', err.message];
+    end
+  end
+end
+
+end  % function
@@ -13,6 +13,32 @@ function _pyeval(input_file, output_file)
 %       store_as: Optional name to store the return value in the base
 %         workspace, instead of returning a value.
 %
+%   Alternatively, req may hold a single `batch` field: a cell array of
+%   requests with the fields above.  They are run in order and the result
+%   holds one cell of outputs per request.  Execution stops at the first
+%   error, and the outputs of the requests that completed are still saved.
+%   A request in a batch may have a `batch_refs` field, an N x 3 array of
+%   [arg index, request index, output index] rows, to pass outputs of
+%   earlier requests as arguments without sending them back to Python.
+%
+%   When req has a `raw_threshold` field, the func_args at `raw_indices`
+%   are paths to raw array files written by oct2py, and numeric outputs of
+%   at least `raw_threshold` bytes, including those inside cells and
+%   scalar structs, are written to raw array files named after
+%   `raw_prefix` and returned as a struct with an `oct2py_raw_file` field
+%   holding the path.  This skips the MAT file encoding for large arrays,
+%   and lets oct2py memory-map them instead of copying them.  Sparse
+%   matrices of at least `raw_threshold` bytes, and all logical sparse
+%   matrices, are written as raw sparse files holding their CSC buffers.
+%
+%   When req has an `hdf5_threshold` field and the result is at least that
+%   many bytes, the response is saved in Octave's HDF5 format instead,
+%   which has no 2 GB limit per variable.  Results holding objects, and
+%   errors, are always saved as MAT files.
+%
+%   When req has a `headless` field, the figure queries after the call are
+%   skipped, since the session has not used graphics.
+%
 %   Should save a file containing the result object.
 %
 % Based on Max Jaderberg's web_feval
@@ -20,12 +46,64 @@ function _pyeval(input_file, output_file)
 sentinel = { '__no_value__' };
 result = { sentinel };
 err = '';
+hdf5_threshold = 0;
 
 try
     % Store the simple response in case we don't make it through the script.
     save('-v6', '-mat-binary', output_file, 'result', 'err');
 
     req = load(input_file);
+    if isfield(req, 'hdf5_threshold')
+      hdf5_threshold = req.hdf5_threshold;
+    end
+
+    if isfield(req, 'batch')
+      % Run each request in order, keeping the outputs of the requests
+      % that completed so they are still returned if a later one fails.
+      result = cell(1, 0);
+      for idx=1:numel(req.batch)
+        result{idx} = run_request(req.batch{idx}, sentinel, result);
+      end
+      % Spill only once the batch is done, so later requests can still
+      % refer to the outputs.
+      for idx=1:numel(result)
+        result{idx} = spill_outputs(req.batch{idx}, result{idx});
+      end
+    else
+      result = run_request(req, sentinel, {});
+      result = spill_outputs(req, result);
+    end
+
+    if (~isfield(req, 'headless') &&
+        (strcmp(get(0, 'defaultfigurevisible'), 'on') == 1) &&
+        length(get(0, 'children')))
+      drawnow('expose');
+    end
+
+catch ME
+    err = ME;
+end
+
+
+% Save the output to a file.
+try
+  save_safe_struct(output_file, result, err, hdf5_threshold);
+catch ME
+  result = { sentinel };
+  err = ME;
+  save('-v6', '-mat-binary', output_file, 'result', 'err');
+end
+
+end  % function
+
+
+function result = run_request(req, sentinel, outputs)
+    % Run a single request and return its outputs as a cell array.
+    % outputs holds the output cells of the earlier requests in a batch.
+    result = { sentinel };
+
+    % Errors raised by our own output assignment have a stack this deep.
+    depth = numel(dbstack);
 
     % Add function path to current path.
     if req.dname
@@ -39,6 +117,23 @@ try
       req.func_args{ref_index} = evalin('base', var_name);
     end
 
+    % Replace the arguments that refer to outputs of earlier requests in
+    % the batch.  Each row is [arg index, request index, output index].
+    if isfield(req, 'batch_refs')
+      for idx=1:size(req.batch_refs, 1)
+        ref = req.batch_refs(idx, :);
+        req.func_args{ref(1)} = outputs{ref(2)}{ref(3)};
+      end
+    end
+
+    % Load the arguments that were sent as raw array files.
+    if isfield(req, 'raw_indices')
+      for idx=1:length(req.raw_indices)
+        raw_index = req.raw_indices(idx);
+        req.func_args{raw_index} = read_raw(req.func_args{raw_index});
+      end
+    end
+
     assignin('base', 'ans', sentinel);
 
     % Use the `ans` response if no output arguments are expected.
@@ -108,7 +203,7 @@ try
           evalin('base', 'clear argv');
           result = get_ans(sentinel);
         elseif (strcmp(ME.message, 'element number 1 undefined in return list') != 1 ||
-            length(ME.stack) != 1)
+            length(ME.stack) != depth)
           rethrow(ME);
         else
           result = get_ans(sentinel);
@@ -124,7 +219,7 @@ try
           evalin('base', req.func_name);
           result = get_ans(sentinel);
         elseif (strcmp(ME.message, 'element number 1 undefined in return list') != 1 ||
-            length(ME.stack) != 1)
+            length(ME.stack) != depth)
           rethrow(ME);
         end
       end
@@ -134,27 +229,225 @@ try
       assignin('base', req.store_as, result{1});
       result = { sentinel };
     end
+end
 
-    if ((strcmp(get(0, 'defaultfigurevisible'), 'on') == 1) &&
-        length(get(0, 'children')))
-      drawnow('expose');
+
+function result = spill_outputs(req, result)
+    % Send large array outputs back as raw array files.
+    if isfield(req, 'raw_threshold')
+      for idx=1:numel(result)
+        name = sprintf('%s_out%d', req.raw_prefix, idx);
+        result{idx} = spill_raw(result{idx}, req.raw_threshold, name);
+      end
     end
+end
 
-catch ME
-    err = ME;
+
+function val = spill_raw(val, threshold, name)
+    % Replace a large dense array, or those inside cells and scalar
+    % structs, with references to raw array files.  Struct arrays are left
+    % alone, so their fields are always saved in the MAT file.
+    [classes, itemsizes] = raw_classes();
+    if iscell(val)
+      for idx=1:numel(val)
+        val{idx} = spill_raw(val{idx}, threshold, sprintf('%s_%d', name, idx));
+      end
+      return;
+    end
+    if isstruct(val) && isscalar(val)
+      fields = fieldnames(val);
+      for idx=1:numel(fields)
+        field = fields{idx};
+        val.(field) = spill_raw(val.(field), threshold, sprintf('%s_%d', name, idx));
+      end
+      return;
+    end
+    if issparse(val)
+      % Logical sparse matrices are always sent raw to keep their type.
+      % The values are followed by 4 byte row indices and column pointers.
+      nbytes = nnz(val) * (1 + 7 * ~islogical(val)) * (1 + iscomplex(val));
+      nbytes = nbytes + 4 * (nnz(val) + columns(val) + 1);
+      if nbytes >= threshold || islogical(val)
+        path = [name '.bin'];
+        write_raw_sparse(val, path);
+        val = struct('oct2py_raw_file', path);
+      end
+      return;
+    end
+    code = find(strcmp(class(val), classes));
+    if isempty(code) || isobject(val)
+      return;
+    end
+    nbytes = numel(val) * itemsizes(code) * (1 + iscomplex(val));
+    if nbytes >= threshold
+      path = [name '.bin'];
+      write_raw(val, path);
+      val = struct('oct2py_raw_file', path);
+    end
 end
 
 
-% Save the output to a file.
-try
-  save_safe_struct(output_file, result, err);
-catch ME
-  result = { sentinel };
-  err = ME;
-  save('-v6', '-mat-binary', output_file, 'result', 'err');
+function [classes, itemsizes] = raw_classes()
+    % The classes that can be sent as raw arrays, in the order of their
+    % class codes in the file header.
+    classes = {'double', 'single', 'int8', 'uint8', 'int16', 'uint16', ...
+               'int32', 'uint32', 'int64', 'uint64', 'logical'};
+    itemsizes = [8, 4, 1, 1, 2, 2, 4, 4, 8, 8, 1];
 end
 
-end  % function
+
+function write_raw(val, path)
+    % Save a dense array as a magic, an int64 header of [class code,
+    % complex flag, order flag, ndims, dims] and the column-major data.
+    classes = raw_classes();
+    code = find(strcmp(class(val), classes)) - 1;
+    precision = class(val);
+    if islogical(val)
+      precision = 'uint8';
+    end
+    fid = fopen(path, 'w');
+    if fid < 0
+      error('oct2py:pyeval:raw', 'Could not open "%s" for writing', path);
+    end
+    unwind_protect
+      fwrite(fid, 'OCT2PYRW', 'uchar');
+      fwrite(fid, [code, iscomplex(val), 0, ndims(val), size(val)], 'int64');
+      if iscomplex(val)
+        % Interleave the real and imaginary parts like numpy does.
+        fwrite(fid, [real(val(:)).'; imag(val(:)).'], precision);
+      else
+        fwrite(fid, val, precision);
+      end
+    unwind_protect_cleanup
+      fclose(fid);
+    end_unwind_protect
+end
+
+
+function write_raw_sparse(val, path)
+    % Save a sparse matrix as a magic, an int64 header of [class code,
+    % complex flag, index size, rows, columns, nnz] and the CSC column
+    % pointers, row indices and values, each padded to 8 bytes.
+    [ridx, ~, data] = find(val);
+    counts = full(sum(val ~= 0, 1));
+    cidx = [0, cumsum(counts)];
+    isize = 4;
+    itype = 'int32';
+    if max(numel(data), rows(val)) >= 2^31
+      isize = 8;
+      itype = 'int64';
+    end
+    fid = fopen(path, 'w');
+    if fid < 0
+      error('oct2py:pyeval:raw', 'Could not open "%s" for writing', path);
+    end
+    unwind_protect
+      fwrite(fid, 'OCT2PYSP', 'uchar');
+      fwrite(fid, [10 * islogical(val), iscomplex(val), isize, size(val), numel(data)], 'int64');
+      write_padded(fid, cidx, itype, isize);
+      write_padded(fid, ridx - 1, itype, isize);
+      if islogical(val)
+        fwrite(fid, data, 'uint8');
+      elseif iscomplex(val)
+        fwrite(fid, [real(data(:)).'; imag(data(:)).'], 'double');
+      else
+        fwrite(fid, data, 'double');
+      end
+    unwind_protect_cleanup
+      fclose(fid);
+    end_unwind_protect
+end
+
+
+function write_padded(fid, vals, precision, itemsize)
+    % Write values and pad them to a multiple of 8 bytes.
+    fwrite(fid, vals, precision);
+    fwrite(fid, zeros(1, mod(-numel(vals) * itemsize, 8)), 'uint8');
+end
+
+
+function val = read_raw_sparse(fid, path)
+    % Load a sparse matrix from a raw sparse file after its magic.
+    header = fread(fid, [1, 6], 'int64=>double');
+    [cplx, isize, nr, nc, count] = deal(header(2), header(3), header(4), header(5), header(6));
+    itype = 'int32=>double';
+    if isize == 8
+      itype = 'int64=>double';
+    end
+    cidx = read_padded(fid, nc + 1, itype, isize);
+    ridx = read_padded(fid, count, itype, isize);
+    if header(1) == 10
+      data = logical(fread(fid, count, 'uint8=>double'));
+    elseif cplx
+      data = fread(fid, [2, count], 'double=>double');
+      data = complex(data(1, :), data(2, :)).';
+    else
+      data = fread(fid, count, 'double=>double');
+    end
+    if numel(cidx) != nc + 1 || numel(ridx) != count || numel(data) != count
+      error('oct2py:pyeval:raw', 'Truncated raw array file "%s"', path);
+    end
+    cols = repelem((1:nc).', diff(cidx));
+    val = sparse(ridx + 1, cols, data, nr, nc);
+end
+
+
+function vals = read_padded(fid, count, precision, itemsize)
+    % Read values and skip the padding to a multiple of 8 bytes.
+    vals = fread(fid, count, precision);
+    fseek(fid, mod(-count * itemsize, 8), SEEK_CUR);
+end
+
+
+function val = read_raw(path)
+    % Load an array from a raw array file written by oct2py.
+    fid = fopen(path, 'r');
+    if fid < 0
+      error('oct2py:pyeval:raw', 'Could not open "%s"', path);
+    end
+    unwind_protect
+      magic = fread(fid, [1, 8], 'uchar=>char');
+      if strcmp(magic, 'OCT2PYSP')
+        val = read_raw_sparse(fid, path);
+        return;
+      end
+      if ~strcmp(magic, 'OCT2PYRW')
+        error('oct2py:pyeval:raw', 'Invalid raw array file "%s"', path);
+      end
+      header = fread(fid, [1, 4], 'int64=>double');
+      dims = fread(fid, [1, header(4)], 'int64=>double');
+      classes = raw_classes();
+      cls = classes{header(1) + 1};
+      precision = cls;
+      if strcmp(cls, 'logical')
+        precision = 'uint8';
+      end
+      precision = [precision '=>' precision];
+      % Row-major data is read with the dimensions reversed, then permuted.
+      if header(3)
+        dims = fliplr(dims);
+      end
+      count = prod(dims);
+      if header(2)
+        data = fread(fid, [2, count], precision);
+        val = complex(data(1, :), data(2, :));
+      else
+        val = fread(fid, count, precision);
+      end
+      if numel(val) != count
+        error('oct2py:pyeval:raw', 'Truncated raw array file "%s"', path);
+      end
+      if strcmp(cls, 'logical')
+        val = logical(val);
+      end
+      val = reshape(val, dims);
+      if header(3)
+        val = permute(val, numel(dims):-1:1);
+      end
+    unwind_protect_cleanup
+      fclose(fid);
+    end_unwind_protect
+end
 
 
 function result = get_ans(sentinel)
@@ -165,8 +458,21 @@ function result = get_ans(sentinel)
     end
 end
 
-function save_safe_struct(output_file, result, err)
-    % NOTE: result is cell{1,1} containing other data
+function save_safe_struct(output_file, result, err, hdf5_threshold)
+    % NOTE: result is a cell of outputs (or of output cells for a batch)
+    if hdf5_threshold > 0 && isempty(err) && ~any(cellfun(@has_object, result))
+      info = whos('result');
+      if info.bytes >= hdf5_threshold
+        try
+          result = coerce_value(result);
+          save('-hdf5', output_file, 'result', 'err');
+          return;
+        catch
+          % Fall back to a MAT file.
+        end
+      end
+    end
+
     warn_state = warning('off', 'all');
     try
         save('-v6', '-mat-binary', output_file, 'result', 'err');
@@ -177,18 +483,23 @@ function save_safe_struct(output_file, result, err)
         % parse.  Plain numerics/structs/cells never have this problem, so
         % the extra load is skipped in the common case to avoid the I/O
         % overhead (issue #166).
-        if any(cellfun(@isobject, result))
+        if any(cellfun(@has_object, result))
             load(output_file);
         end
         warning(warn_state);
     catch ME
         warning(warn_state);
         % Recursively coerce result to types that MAT v6 can serialize.
-        result{1,1} = coerce_value(result{1,1});
+        result = coerce_value(result);
         save('-v6', '-mat-binary', output_file, 'result', 'err');
     end
 end
 
+function tf = has_object(val)
+    % Batch results hold one cell of outputs per request, so look inside.
+    tf = isobject(val) || (iscell(val) && any(cellfun(@isobject, val)));
+end
+
 function val = coerce_value(val)
     % Recursively make val serializable to MAT v6 format.
     %   - structs/cells: recurse into fields/elements
@@ -211,7 +522,11 @@ function val = coerce_value(val)
             val{i} = coerce_value(val{i});
         end
     elseif any(strcmp(class(val), primitive_types))
-        % already serializable — return as-is
+        % Diagonal, permutation and range matrices have their own storage
+        % types, which are made full so that every reader can load them.
+        if ~isempty(regexp(typeinfo(val), 'diagonal|permutation|range', 'once'))
+            val = full(val);
+        end
     elseif isa(val, 'function_handle')
         val = func2str(val);
     else
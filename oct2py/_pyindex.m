@@ -0,0 +1,80 @@
+function out = _pyindex(x, subs)
+% _PYINDEX: Index a value with numpy-style subscripts for oct2py.
+%
+%   Each element of the subs cell is ':' (a whole dimension), '...' (as
+%   many whole dimensions as needed), a struct with start, stop and step
+%   fields (a slice, with NaN for unset fields), a logical mask, or an
+%   array of zero-based indices that may be negative.  Missing trailing
+%   subscripts select whole dimensions.  A single subscript on a vector
+%   indexes its elements.
+
+subs = subs(:)';
+nd = ndims(x);
+ellipsis = find(cellfun(@(s) ischar(s) && strcmp(s, '...'), subs));
+if numel(ellipsis) > 1
+  error('oct2py:pyindex', 'an index can only have a single ellipsis');
+end
+
+if numel(subs) == 1 && isempty(ellipsis) && isvector(x)
+  dims = numel(x);
+else
+  fill = repmat({':'}, 1, max(nd - numel(subs) + numel(ellipsis), 0));
+  if isempty(ellipsis)
+    subs = [subs, fill];
+  else
+    subs = [subs(1:ellipsis-1), fill, subs(ellipsis+1:end)];
+  end
+  dims = arrayfun(@(k) size(x, k), 1:numel(subs));
+end
+
+for k = 1:numel(subs)
+  s = subs{k};
+  if isstruct(s)
+    subs{k} = slice_indices(s, dims(k));
+  elseif isnumeric(s)
+    s(s < 0) += dims(k);
+    subs{k} = s + 1;
+  end
+end
+
+out = x(subs{:});
+
+end  % function
+
+
+function idx = slice_indices(s, n)
+% Return the one-based indices of a slice, as Python's slice.indices.
+step = s.step;
+if isnan(step)
+  step = 1;
+elseif step == 0
+  error('oct2py:pyindex', 'slice step cannot be zero');
+end
+if step > 0
+  lower = 0;
+  upper = n;
+  start = bound(s.start, n, lower, upper, lower);
+  stop = bound(s.stop, n, lower, upper, upper);
+  idx = (start:step:stop - 1) + 1;
+else
+  lower = -1;
+  upper = n - 1;
+  start = bound(s.start, n, lower, upper, upper);
+  stop = bound(s.stop, n, lower, upper, lower);
+  idx = (start:step:stop + 1) + 1;
+end
+
+end  % function
+
+
+function val = bound(val, n, lower, upper, default)
+% Resolve a slice start or stop against a dimension of length n.
+if isnan(val)
+  val = default;
+elseif val < 0
+  val = max(val + n, lower);
+else
+  val = min(val, upper);
+end
+
+end  % function
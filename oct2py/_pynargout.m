@@ -0,0 +1,21 @@
+function [path, nout] = _pynargout(name, dname)
+% _PYNARGOUT: Find the file and the most outputs of a function for oct2py.
+%
+%   Returns the file that defines the function (empty for built-in
+%   functions) and the absolute value of its `nargout`, which counts
+%   `varargout` as one output.  Scripts and functions whose outputs are
+%   unknown get 0.  If `dname` is given, it is added to the path first,
+%   as `_pyeval` does.
+
+if ~isempty(dname)
+  addpath(dname);
+end
+
+path = which(name);
+try
+  nout = abs(nargout(name));
+catch
+  nout = 0;
+end
+
+end  % function
@@ -0,0 +1,27 @@
+function [values, status] = _pypull(names)
+% _PYPULL: Look up names in the base workspace for oct2py's `pull`.
+%
+%   Returns a cell array holding the value of each name that is a
+%   variable, and an array holding the `exist` code of each name.  Names
+%   that are not variables are left empty in the values.  A name that
+%   `exist` does not know but that still evaluates (such as a package
+%   function) gets a code of 2, and a missing name gets a code of 0.
+
+values = cell(1, numel(names));
+status = zeros(1, numel(names));
+
+for idx=1:numel(names)
+  name = names{idx};
+  status(idx) = evalin('base', sprintf('exist("%s")', name));
+  if status(idx) == 1
+    values{idx} = evalin('base', name);
+  elseif status(idx) == 0
+    try
+      evalin('base', sprintf('class(%s);', name));
+      status(idx) = 2;
+    catch
+    end
+  end
+end
+
+end  % function
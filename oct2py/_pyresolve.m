@@ -0,0 +1,25 @@
+function [code, isobj] = _pyresolve(name)
+% _PYRESOLVE: Find out what a name is in the base workspace for oct2py.
+%
+%   Returns the `exist` code of the name and whether it is an object.  A
+%   name that `exist` does not know but that still evaluates (such as a
+%   package function) gets a code of 2, and a missing name gets a code
+%   of 0.  Functions are never reported as objects.
+
+code = evalin('base', sprintf('exist("%s")', name));
+isobj = false;
+
+if code == 0
+  try
+    evalin('base', sprintf('class(%s);', name));
+    code = 2;
+  catch
+  end
+elseif code ~= 2 && code ~= 5
+  try
+    isobj = logical(evalin('base', sprintf('isobject(%s)', name)));
+  catch
+  end
+end
+
+end  % function
@@ -0,0 +1,10 @@
+function out = _pyselect(s, names)
+% _PYSELECT: Return a struct with only the named fields, in that order.
+
+missing = setdiff(names, fieldnames(s));
+if ~isempty(missing)
+  error('oct2py:pyselect', 'invalid use of undefined field "%s"', missing{1});
+end
+out = orderfields(rmfield(s, setdiff(fieldnames(s), names)), names);
+
+end  % function
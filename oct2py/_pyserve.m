@@ -0,0 +1,41 @@
+function _pyserve(request_fifo, response_fifo)
+% _PYSERVE: Run _pyeval requests from oct2py until told to stop.
+%
+%   Blocks on the request_fifo named pipe for one line per request,
+%   holding the input and output files for _pyeval separated by a tab.
+%   After each request stdout is flushed and "done" is written to the
+%   response_fifo named pipe.  "ready" is written once the pipes are open.
+%   A line of "quit" (or the pipe closing) returns to the prompt.
+
+req_fid = fopen(request_fifo, 'r');
+resp_fid = fopen(response_fifo, 'w');
+if req_fid < 0 || resp_fid < 0
+  error('oct2py:pyserve', 'Could not open the request server pipes');
+end
+
+unwind_protect
+  fputs(resp_fid, "ready\n");
+  fflush(resp_fid);
+
+  while true
+    line = fgetl(req_fid);
+    if ~ischar(line) || strcmp(line, 'quit')
+      break;
+    end
+    files = strsplit(line, "\t");
+    try
+      _pyeval(files{1}, files{2});
+    catch err
+      % _pyeval saves its own errors, so keep serving whatever happens.
+      disp(err.message);
+    end
+    fflush(stdout);
+    fputs(resp_fid, "done\n");
+    fflush(resp_fid);
+  end
+unwind_protect_cleanup
+  fclose(req_fid);
+  fclose(resp_fid);
+end_unwind_protect
+
+end  % function
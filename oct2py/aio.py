@@ -0,0 +1,348 @@
+"""An asyncio interface to an Octave session."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import asyncio
+import re
+
+import numpy as np
+from metakernel.pexpect import EOF, TIMEOUT
+
+from .core import Oct2Py, _remove_raw_args, _unpack_result
+from .io import read_file
+from .utils import Oct2PyError
+
+
+class AsyncOct2Py:
+    """An Octave session whose calls are coroutines.
+
+    While a call runs, the event loop waits on the Octave pty with a
+    reader callback instead of blocking a thread.  An Octave session runs
+    one call at a time, so calls on the same instance are queued; use
+    several instances to run calls concurrently.
+
+    Cancelling a call interrupts Octave, and a call that times out is
+    interrupted and raises an `Oct2PyError`, like `Oct2Py`.
+
+    Parameters
+    ----------
+    session : Oct2Py, optional
+        The session to use.  If not given, a new session is created with
+        the other arguments, which are passed to `Oct2Py`.
+    **kwargs
+        Arguments for `Oct2Py` when creating a session.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from oct2py import AsyncOct2Py
+    >>> async def main():
+    ...     async with AsyncOct2Py() as oc:
+    ...         await oc.push("x", [1, 2, 3])
+    ...         return await oc.feval("sum", oc.session.get_pointer("x"))
+    >>> asyncio.run(main())  # doctest: +SKIP
+    6.0
+    """
+
+    def __init__(self, session=None, **kwargs):
+        self.session = session if session is not None else Oct2Py(**kwargs)
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close the session on exit."""
+        self.exit()
+
+    def exit(self):
+        """Close the Octave session."""
+        self.session.exit()
+
+    async def feval(  # noqa: PLR0913
+        self,
+        func_path,
+        *func_args,
+        nout=1,
+        quiet=False,
+        store_as="",
+        verbose=True,
+        stream_handler=None,
+        timeout=None,
+    ):
+        """Run a function in Octave and return the result.
+
+        Takes the same arguments as `Oct2Py.feval`, except for the plot
+        arguments.  Figures are left open in Octave.
+
+        Parameters
+        ----------
+        func_path : str
+            Name of function to run or a path to an m-file.
+        func_args : object, optional
+            Args to send to the function.
+        nout : int or str, optional
+            The desired number of returned values, defaults to 1.
+        quiet : bool, optional
+            If True, execute the function but do not capture or return any
+            output.
+        store_as : str, optional
+            If given, saves the result to the given Octave variable name
+            instead of returning it.
+        verbose : bool, optional
+            Log Octave output at INFO level.  If False, log at DEBUG level.
+        stream_handler : callable, optional
+            A function that is called for each line of output.
+        timeout : float, optional
+            The timeout in seconds for the call.
+
+        Returns
+        -------
+        The Python value(s) returned by the Octave function call.
+        """
+        session = self.session
+        if quiet:
+            nout = -1
+        elif nout == "max_nout":
+            nout = await self._get_max_nout(func_path, timeout)
+        func_name, dname = session._split_func_path(func_path)
+        req = session._make_request(func_name, func_args, dname=dname, nout=nout, store_as=store_as)
+        resp = await self._send_request(req, timeout, verbose, stream_handler)
+        if resp is None:
+            return None
+        if resp["err"]:
+            msg = session._parse_error(resp["err"])
+            raise Oct2PyError(msg)
+        return _unpack_result(resp["result"])
+
+    async def eval(  # noqa: PLR0913
+        self, cmds, nout=0, quiet=False, verbose=True, stream_handler=None, timeout=None
+    ):
+        """Evaluate an Octave command or commands.
+
+        Parameters
+        ----------
+        cmds : str or list
+            Commands(s) to pass to Octave.
+        nout : int, optional
+            The desired number of returned values, defaults to 0.
+        quiet : bool, optional
+            If True, do not capture or return any output.
+        verbose : bool, optional
+            Log Octave output at INFO level.  If False, log at DEBUG level.
+        stream_handler : callable, optional
+            A function that is called for each line of output.
+        timeout : float, optional
+            The timeout in seconds for each command.
+
+        Returns
+        -------
+        out : object
+            Octave "ans" variable, or None.
+        """
+        if isinstance(cmds, str):
+            cmds = [cmds]
+        ans = None
+        for cmd in cmds:
+            resp = await self.feval(
+                "evalin",
+                "base",
+                cmd,
+                nout=nout,
+                quiet=quiet,
+                verbose=verbose,
+                stream_handler=stream_handler,
+                timeout=timeout,
+            )
+            if resp is not None:
+                ans = resp
+        return ans
+
+    async def push(self, name, var, timeout=None, verbose=True):
+        """Put a variable or variables into the Octave session.
+
+        Parameters
+        ----------
+        name : str or list
+            Name of the variable(s).
+        var : object or list
+            The value(s) to pass.
+        timeout : float, optional
+            Time to wait for response from Octave.
+        verbose : bool, optional
+            Log Octave output at INFO level.  If False, log at DEBUG level.
+        """
+        session = self.session
+        if isinstance(name, str):
+            name = [name]
+            var = [var]
+        reqs = [
+            session._make_request("assignin", ("base", n, v), nout=-1)
+            for n, v in zip(name, var, strict=False)
+        ]
+        resp = await self._send_request(dict(batch=tuple(reqs)), timeout, verbose)
+        if resp is not None and resp["err"]:
+            msg = session._parse_error(resp["err"])
+            raise Oct2PyError(msg)
+
+    async def pull(self, var, timeout=None, verbose=True, as_dataframe=False):
+        """Retrieve a value or values from the Octave session.
+
+        Parameters
+        ----------
+        var : str or list
+            Name of the variable(s) to retrieve.
+        timeout : float, optional
+            Time to wait for response from Octave.
+        verbose : bool, optional
+            Log Octave output at INFO level.  If False, log at DEBUG level.
+        as_dataframe : bool, optional
+            If True, return each value as a ``pandas.DataFrame``.
+
+        Returns
+        -------
+        out : object
+            Object returned by Octave.
+        """
+        if isinstance(var, str):
+            var = [var]
+        values, status = await self.feval(
+            "_pypull", tuple(var), nout=2, timeout=timeout, verbose=verbose
+        )
+        codes = np.atleast_1d(status).ravel().tolist()
+        pointers = {}
+        if 0 not in codes:
+            for name, exist in zip(var, codes, strict=True):
+                if exist != 1:
+                    pointers[name] = await self._get_pointer(name, timeout)
+        return self.session._pull_outputs(var, values, status, timeout, as_dataframe, pointers)
+
+    async def _get_pointer(self, name, timeout=None):
+        """Get a pointer to a name that is not a variable."""
+        session = self.session
+        exist, isobject = await self._resolve(name, timeout)
+        if isobject and name not in session._user_classes:
+            # Making a user class asks Octave for its fields and methods.
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, session._get_user_class, name)
+        return session._make_pointer(name, exist, isobject)
+
+    async def _resolve(self, name, timeout=None):
+        """Return the `exist` code of a name and whether it is an object."""
+        session = self.session
+        entry = session.resolution_cache.get(name)
+        if entry is None:
+            exist, isobject = await self.feval(
+                "_pyresolve", name, nout=2, timeout=timeout, verbose=False
+            )
+            entry = (int(exist), bool(isobject))
+            session.resolution_cache.set(name, *entry)
+        return entry
+
+    async def _get_max_nout(self, func_path, timeout=None):
+        """Get the maximum nout of a function, as `Oct2Py` does."""
+        session = self.session
+        nout, args = session._cached_max_nout(func_path)
+        if nout is None:
+            path, nout = await self.feval(
+                "_pynargout", *args, nout=2, timeout=timeout, verbose=False
+            )
+            nout = session._cache_max_nout(func_path, path, nout)
+        return nout
+
+    async def _send_request(self, req, timeout=None, verbose=True, stream_handler=None):
+        """Send a request to `_pyeval` and return the response dict.
+
+        Returns None if the session was closed while waiting.
+        """
+        session = self.session
+        if timeout is None:
+            timeout = session._settings.timeout
+        if not stream_handler:
+            stream_handler = session.logger.info if verbose else session.logger.debug
+
+        async with self._lock:
+            engine = session._engine
+            if engine is None:
+                msg = "Session is closed"
+                raise Oct2PyError(msg)
+            session._stop_server()
+            try:
+                out_file, in_file = session._write_request(req)
+                engine.repl.sendline(f'_pyeval("{out_file}", "{in_file}");')
+                await asyncio.wait_for(self._wait(engine, stream_handler), timeout)
+            except asyncio.CancelledError:
+                stream_handler(await self._interrupt(engine))
+                raise
+            except TimeoutError:
+                stream_handler(await self._interrupt(engine))
+                msg = "Timed out, interrupting"
+                raise Oct2PyError(msg) from None
+            except EOF:
+                if not session._engine:
+                    return None
+                # Starting Octave again takes a while, so keep it off the loop.
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, session.restart)
+                msg = "Session died, restarting"
+                raise Oct2PyError(msg) from None
+            finally:
+                _remove_raw_args(req)
+                session._update_resolutions(req)
+
+            return read_file(in_file, session)
+
+    async def _interrupt(self, engine):
+        """Interrupt Octave without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, engine.repl.interrupt)
+
+    async def _wait(self, engine, stream_handler):
+        """Wait for the Octave prompt, streaming the output line by line."""
+        repl = engine.repl
+        child = repl.child
+        prompt = re.compile(repl.prompt_regex)
+        stdin_prompt = re.compile(repl.stdin_prompt_regex)
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(child.child_fd, readable.set)
+        # Output that pexpect has already read is held in its buffer.
+        text = child.buffer
+        child.buffer = ""
+        try:
+            while True:
+                text = text.replace("\r\n", "\n")
+                match = prompt.search(text)
+                if match:
+                    for line in text[: match.start()].split("\n"):
+                        if line:
+                            stream_handler(line)
+                    return
+
+                match = stdin_prompt.search(text)
+                if match and engine.stdin_handler:
+                    request = text[: match.end()].split("\n")[-1]
+                    resp = await loop.run_in_executor(None, engine.stdin_handler, request)
+                    text = text[: match.start()]
+                    repl.sendline(resp)
+
+                *lines, text = text.split("\n")
+                for line in lines:
+                    stream_handler(line.rstrip())
+
+                await readable.wait()
+                readable.clear()
+                try:
+                    text += child.read_nonblocking(65536, 0)
+                except TIMEOUT:
+                    continue
+                except EOF:
+                    # Pass on the output that Octave wrote before it exited,
+                    # which `expect` would have left in `child.before`.
+                    if text:
+                        stream_handler(text.rstrip())
+                    raise
+        finally:
+            loop.remove_reader(child.child_fd)
@@ -0,0 +1,257 @@
+"""Batched Octave calls."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+from concurrent.futures import Future
+
+import numpy as np
+
+from .utils import Oct2PyError
+
+
+class BatchFuture(Future):  # type:ignore[type-arg]
+    """The pending result of a call queued on an `OctaveBatch`.
+
+    The result is set when the batch runs.  A future can be passed as an
+    argument to a later call in the same batch, in which case the value is
+    used directly in Octave without being sent back and forth.  Index the
+    future (``future[1]``) to refer to one of several outputs.
+    """
+
+    def __init__(self, batch, index):
+        """Initialize the future."""
+        super().__init__()
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, output):
+        """Refer to one of the outputs of the call."""
+        return BatchOutput(self, output)
+
+
+class BatchOutput:
+    """A reference to one output of a call queued on an `OctaveBatch`."""
+
+    def __init__(self, future, output):
+        """Initialize the reference."""
+        self.future = future
+        self.output = output
+
+    def result(self, timeout=None):
+        """Return this output of the call once the batch has run."""
+        value = self.future.result(timeout)
+        if isinstance(value, list):
+            return value[self.output]
+        if self.output != 0:
+            raise IndexError(self.output)
+        return value
+
+
+class OctaveBatch:
+    """A queue of Octave calls that run in a single round trip.
+
+    Create one with :meth:`Oct2Py.batch`.  Each queued call returns a
+    `BatchFuture`.  The calls are encoded into one request when the
+    ``with`` block exits (or when :meth:`run` is called), executed in
+    order by Octave, and the results are decoded into the futures.
+    Execution stops at the first call that fails: its future holds the
+    error, the futures of the remaining calls are cancelled, and the error
+    is raised.
+
+    Parameters
+    ----------
+    session : Oct2Py
+        The session to run the calls in.
+    timeout : float, optional
+        The timeout in seconds for the whole batch.
+    verbose : bool, optional
+        Log Octave output at INFO level.  If False, log at DEBUG level.
+    stream_handler : callable, optional
+        A function that is called for each line of output.
+    """
+
+    def __init__(self, session, timeout=None, verbose=True, stream_handler=None):
+        self._session = session
+        self._timeout = timeout
+        self._verbose = verbose
+        self._stream_handler = stream_handler
+        self._reqs = []
+        self._futures = []
+
+    def __enter__(self):
+        """Return the batch."""
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        """Run the queued calls, unless the block raised."""
+        if type_ is not None:
+            self.cancel()
+            return
+        self.run()
+
+    def __len__(self):
+        """The number of queued calls."""
+        return len(self._reqs)
+
+    def feval(self, func_path, *func_args, nout=1, store_as="", quiet=False):
+        """Queue a function call.
+
+        Parameters
+        ----------
+        func_path : str
+            Name of function to run or a path to an m-file.
+        func_args : object, optional
+            Args to send to the function.  Futures from earlier calls in this
+            batch (or outputs of them, e.g. ``future[1]``) are passed by
+            reference inside Octave.
+        nout : int or str, optional
+            The desired number of returned values, defaults to 1.  If nout
+            value is 'max_nout', _get_max_nout() will be used.
+        store_as : str, optional
+            If given, saves the result to the given Octave variable name
+            instead of returning it.
+        quiet : bool, optional
+            If True, execute the function but do not capture or return any
+            output.
+
+        Returns
+        -------
+        BatchFuture
+            The future result of the call.
+        """
+        session = self._session
+        if quiet:
+            nout = -1
+        elif nout == "max_nout":
+            nout = session._get_max_nout(func_path)
+        func_name, dname = session._split_func_path(func_path)
+        return self._queue(func_name, func_args, dname=dname, nout=nout, store_as=store_as)
+
+    def push(self, name, var):
+        """Queue setting a variable in the Octave session.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable.
+        var : object
+            The value to set, or a future from this batch.
+
+        Returns
+        -------
+        BatchFuture
+            A future that resolves to None once the variable is set.
+        """
+        return self._queue("assignin", ("base", name, var), nout=-1)
+
+    def pull(self, name):
+        """Queue retrieving a variable from the Octave session.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable.
+
+        Returns
+        -------
+        BatchFuture
+            The future value of the variable.
+        """
+        return self._queue("evalin", ("base", name), nout=1)
+
+    def run(self):
+        """Run the queued calls and set the results on their futures.
+
+        Raises
+        ------
+        Oct2PyError
+            If one of the calls fails.
+        """
+        reqs, futures = self._reqs, self._futures
+        self._reqs, self._futures = [], []
+        if not reqs:
+            return
+
+        session = self._session
+        if not session._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+        stream_handler = self._stream_handler
+        if not stream_handler:
+            logger = session.logger
+            stream_handler = logger.info if self._verbose else logger.debug
+
+        try:
+            results, err = session._feval_batch(
+                reqs, timeout=self._timeout, stream_handler=stream_handler
+            )
+        except BaseException as e:
+            for future in futures:
+                future.set_exception(e)
+            raise
+
+        for future, result in zip(futures, results, strict=False):
+            future.set_result(result)
+        if not err:
+            return
+
+        # The call after the last completed one is the one that failed.
+        index = len(results)
+        error = Oct2PyError(session._parse_error(err))
+        if index < len(futures):
+            futures[index].set_exception(error)
+        for future in futures[index + 1 :]:
+            future.cancel()
+        raise error
+
+    def cancel(self):
+        """Cancel all of the queued calls."""
+        for future in self._futures:
+            future.cancel()
+        self._reqs, self._futures = [], []
+
+    def _queue(self, func_name, func_args, dname="", nout=1, store_as=""):
+        """Add a request to the batch and return its future."""
+        func_args = list(func_args)
+        refs = []
+        for i, value in enumerate(func_args):
+            ref = self._resolve_ref(value)
+            if ref is None:
+                continue
+            if isinstance(ref, tuple):
+                # [arg index, request index, output index], 1-based.
+                refs.append((i + 1, ref[0] + 1, ref[1] + 1))
+                func_args[i] = None
+            else:
+                func_args[i] = ref.result()
+
+        req = self._session._make_request(
+            func_name, func_args, dname=dname, nout=nout, store_as=store_as
+        )
+        if refs:
+            req["batch_refs"] = np.array(refs, dtype=np.float64)
+        future = BatchFuture(self, len(self._reqs))
+        self._reqs.append(req)
+        self._futures.append(future)
+        return future
+
+    def _resolve_ref(self, value):
+        """Find the request and output referenced by a batch argument.
+
+        Returns None for plain values, a ``(request, output)`` tuple for a
+        reference to a queued call in this batch, or the completed
+        future or output itself, whose value is then sent instead.
+        """
+        if isinstance(value, BatchFuture):
+            future, output = value, 0
+        elif isinstance(value, BatchOutput):
+            future, output = value.future, value.output
+        else:
+            return None
+
+        if future.done():
+            return value
+        if future._batch is not self:
+            msg = "Cannot use a pending result from another batch"
+            raise Oct2PyError(msg)
+        return (future._index, output)
@@ -4,10 +4,12 @@
 
 import atexit
 import contextlib
+import functools
 import glob
 import logging
 import os
 import os.path as osp
+import re
 import shutil
 import signal
 import sys
@@ -16,12 +18,18 @@ import threading
 import uuid
 import warnings
 import weakref
+from typing import get_args
 
 import numpy as np
 from metakernel.pexpect import EOF, TIMEOUT
 from octave_kernel.kernel import STDIN_PROMPT, OctaveEngine
+from scipy.sparse import issparse
 
+from ._version import __version__
+from .batch import OctaveBatch
+from .doccache import DocCache
 from .dynamic import (
+    OctaveBoundFunction,
     OctaveNamespaceProxy,
     OctavePtr,
     _make_function_ptr_instance,
@@ -29,24 +37,77 @@ from .dynamic import (
     _make_user_class,
     _make_variable_ptr_instance,
 )
-from .io import Cell, StructArray, read_file, write_file
+from .io import (
+    Cell,
+    StructArray,
+    _encode,
+    _raw_code,
+    _sparse_nbytes,
+    _to_dataframe,
+    read_file,
+    write_file,
+    write_raw,
+    write_raw_sparse,
+)
+from .memo import OctaveMemoizedFunction
+from .resolution import ResolutionCache
+from .server import RequestServer
 from .settings import Oct2PySettings
+from .spares import SpareEngines
 from .utils import (
     Oct2PyError,
     Oct2PyWarning,
     _augment_path_for_windows,
     _create_macos_ramdisk,
     _detach_macos_ramdisk,
+    _file_mtime,
     get_log,
 )
 
 HERE = osp.realpath(osp.dirname(__file__))
 
+# The default size of the pieces sent by `push_chunked` and `iter_pull`.
+_CHUNK_BYTES = 64 * 1024 * 1024
+
 
 # Registry of all live Oct2Py instances, held via weak references so they can
 # be garbage-collected normally.  Used by the post-fork handler below.
 _instances: weakref.WeakSet["Oct2Py"] = weakref.WeakSet()
 
+# Octave engines started in the background for the `spare_engines` setting.
+_spare_engines = SpareEngines()
+
+# Octave functions whose calls can change the path, and with it what names
+# resolve to, the docs of a name and the number of outputs of a function.
+_PATH_FUNCS = frozenset(
+    [
+        "addpath",
+        "cd",
+        "chdir",
+        "path",
+        "pkg",
+        "restoredefaultpath",
+        "rmpath",
+    ]
+)
+
+# Octave functions whose calls can change which variables exist.
+_NAMESPACE_FUNCS = frozenset(
+    [
+        "assignin",
+        "clear",
+        "clearvars",
+        "eval",
+        "evalin",
+        "load",
+        "run",
+        "source",
+    ]
+)
+
+# The names in a piece of Octave code.
+_NAME_RE = re.compile(r"[A-Za-z_]\w*")
+
 
 def _reset_instances_after_fork() -> None:
     """Detach inherited Oct2Py sessions in a freshly forked child process.
@@ -68,8 +129,10 @@ def _reset_instances_after_fork() -> None:
                 # garbage-collecting the engine in the child would call
                 # waitpid() on the parent's Octave PID, raising ECHILD.
                 inst._engine.repl.terminated = True
-        # Prevent exit() / __del__ from touching the parent's engine.
+        # Prevent exit() / __del__ from touching the parent's engine (or
+        # removing the named pipes of its request server).
         inst._engine = None
+        inst._server = None
         inst._temp_dir_owner = False
         inst._settings.temp_dir = None
     # The parent's atexit.register(shutil.rmtree, temp_dir, ...) calls are
@@ -77,12 +140,68 @@ def _reset_instances_after_fork() -> None:
     # parent's /dev/shm temp directories on exit.  Any new Oct2Py instances
     # created in the child will register their own handlers afterwards.
     atexit.unregister(shutil.rmtree)
+    _spare_engines.forget()
 
 
 if hasattr(os, "register_at_fork"):
     os.register_at_fork(after_in_child=_reset_instances_after_fork)
 
 
+def _start_engine(executable, cli_options, load_octaverc, logger=None, stdin_handler=None):
+    """Start an Octave engine with the oct2py scripts on its path."""
+    # Preserve the SIGINT handler across engine startup.  The underlying
+    # pexpect spawn temporarily replaces SIGINT with SIG_DFL so that the
+    # Octave child process inherits a clean disposition.  If a concurrent
+    # thread (e.g. from a scipy/sympy lazy initialiser) transiently sets
+    # SIGINT to SIG_IGN at exactly the wrong moment, pexpect's finally
+    # block can "restore" that transient SIG_IGN value, leaving SIGINT
+    # permanently ignored for the rest of the Python process (issue #168).
+    # Restoring the handler we observed before the spawn prevents engine
+    # startup from having any net effect on the caller's SIGINT disposition.
+    _saved_sigint = None
+    if threading.current_thread() is threading.main_thread():
+        with contextlib.suppress(Exception):
+            _saved_sigint = signal.getsignal(signal.SIGINT)
+
+    _qt_plugin_path = None
+    try:
+        # Strip QT_QPA_PLATFORM_PLUGIN_PATH before spawning Octave if it
+        # was injected by opencv-python.  opencv injects its own bundled
+        # Qt plugin directory (always under a "cv2" package path) into
+        # this variable; pexpect inherits os.environ, so the Octave child
+        # process would pick up the incompatible path and crash with
+        # "Could not load the Qt platform plugin" (issue #240).
+        # System-set paths (e.g. from the octave_kernel CI action on
+        # macOS) are safe to keep — stripping them breaks octave_kernel's
+        # _validate_executable, which needs to run octave successfully.
+        _qt_path = os.environ.get("QT_QPA_PLATFORM_PLUGIN_PATH", "")
+        _qt_plugin_path = (
+            os.environ.pop("QT_QPA_PLATFORM_PLUGIN_PATH") if "cv2" in _qt_path else None
+        )
+        engine = OctaveEngine(
+            executable=executable,
+            stdin_handler=stdin_handler,
+            logger=logger,
+            cli_options=cli_options,
+            load_octaverc=load_octaverc,
+        )
+    finally:
+        if _saved_sigint is not None:
+            with contextlib.suppress(Exception):
+                signal.signal(signal.SIGINT, _saved_sigint)
+        if _qt_plugin_path is not None:
+            os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = _qt_plugin_path
+
+    # Add local Octave scripts.
+    engine.eval('addpath("%s");' % HERE.replace(osp.sep, "/"))
+
+    # Octave's default max_recursion_depth is 256, which is lower than
+    # MATLAB's default and causes deep recursive functions to crash the
+    # session.  Raise it to match a more permissive default (issue #326).
+    engine.eval("max_recursion_depth(2500);")
+    return engine
+
+
 class OctaveWorkspaceProxy:
     """Dict-like proxy for the Octave base workspace.
 
@@ -198,6 +317,48 @@ class Oct2Py:
         automatically on session exit.  Has no effect on Linux (where
         ``/dev/shm`` is used automatically) or on Windows.  Defaults to
         ``0`` (disabled).
+    raw_threshold_bytes : int, optional
+        When set to a positive integer, dense numeric and logical arrays of
+        at least this many bytes are exchanged with Octave as raw binary
+        files in the temp directory, skipping the MAT file encoding.  Arrays
+        returned this way, including inside cells and structs, are
+        memory-mapped rather than copied.  Defaults to
+        ``0`` (disabled).
+    transfer_format : {'v6', 'hdf5'}, optional
+        The file format of responses from Octave.  ``"v6"`` (default)
+        always uses MAT v6 files, which cannot hold variables over 2 GB.
+        ``"hdf5"`` saves responses of at least ``hdf5_threshold_bytes`` in
+        Octave's HDF5 format, which is read with ``h5py`` and memory-mapped
+        where possible, while smaller responses keep using MAT v6 files.
+    hdf5_threshold_bytes : int, optional
+        The size of the response at which ``transfer_format="hdf5"``
+        switches to HDF5 (default 64 MiB).
+    request_server : bool, optional
+        If True, Octave runs a loop that waits for requests on a named
+        pipe instead of each call being typed at the Octave prompt, which
+        lowers the fixed cost of small calls.  Output is still streamed
+        and calls can still be interrupted, but calls that read from stdin
+        (such as ``input`` or ``keyboard``) are not supported.  Not
+        available on Windows.  Defaults to False.
+    spare_engines : int, optional
+        When set to a positive integer, this many Octave processes with
+        the same executable and options are started in the background and
+        kept ready.  Later sessions and restarts adopt one instead of
+        waiting for Octave to start, and it is replaced in the background.
+        Defaults to ``0`` (disabled).
+    doc_cache_dir : str, optional
+        The directory where the documentation of Octave functions is
+        cached between processes, keyed by the Octave version and the
+        file that defines each function.  Defaults to an ``oct2py/docs``
+        directory in the user cache directory.  Set to an empty string to
+        disable the cache.
+    headless : bool, optional
+        If True, calls do not apply plot settings or look for figures to
+        show after they run, which saves work on every call in sessions
+        that never plot.  A call that passes ``plot_dir`` or
+        ``plot_backend`` uses graphics as usual, and later calls check for
+        figures again.  Figures created before that are not shown.
+        Defaults to False.
     """
 
     def __init__(  # noqa
@@ -220,9 +381,21 @@ class Oct2Py:
         plot_height=None,
         plot_res=None,
         ramdisk_size_mb=None,
+        raw_threshold_bytes=None,
+        transfer_format=None,
+        hdf5_threshold_bytes=None,
+        request_server=None,
+        spare_engines=None,
+        doc_cache_dir=None,
+        headless=None,
     ):
         if settings is None:
             settings = Oct2PySettings()
+        # Overrides are not validated by `model_copy`, so check the choices.
+        formats = get_args(Oct2PySettings.model_fields["transfer_format"].annotation)
+        if transfer_format is not None and transfer_format not in formats:
+            msg = "transfer_format must be one of %s, not %r" % (formats, transfer_format)
+            raise ValueError(msg)
         # Apply any explicit kwargs as overrides on top of the settings object.
         _locals = locals()
         _overrides = {
@@ -236,12 +409,20 @@ class Oct2Py:
             _auto_show = bool(os.environ.get("PYCHARM_HOSTED"))
             if _overrides.get("backend", settings.backend) == "disable":
                 _auto_show = False
+            if _overrides.get("headless", settings.headless):
+                _auto_show = False
         self._settings = settings.model_copy(update={**_overrides, "auto_show": _auto_show})
         self._engine = None
         self._logger = None
         self.logger = logger
+        self.resolution_cache = ResolutionCache()
+        self._docs = {}
+        self._max_nouts = {}
+        self._path_dirs = set()
+        self._plot_settings = None
         self._temp_dir_owner = False
         self._ramdisk_device = None
+        self._server = None
         self._out_fh = None
         self._user_classes = {}
         self._function_ptrs = {}
@@ -287,6 +468,9 @@ class Oct2Py:
 
     def exit(self):
         """Quits this octave session and cleans up."""
+        if self._server:
+            self._server.close()
+            self._server = None
         if self._engine:
             if callable(atexit.unregister):
                 atexit.unregister(self._engine._cleanup)
@@ -334,16 +518,31 @@ class Oct2Py:
         Integer type arguments will be converted to floating point
         unless `convert_to_float=False`.
 
+        All of the variables are written to a single MAT file and assigned
+        in one Octave call, so pushing many variables at once is much
+        faster than pushing them one at a time.
+
         """
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+
         timeout = timeout if timeout is not None else self._settings.timeout
         if isinstance(name, str):
             name = [name]
             var = [var]
 
-        for n, v in zip(name, var, strict=False):
-            self.feval("assignin", "base", n, v, nout=0, timeout=timeout, verbose=verbose)
+        reqs = [
+            self._make_request("assignin", ("base", n, v), nout=-1)
+            for n, v in zip(name, var, strict=False)
+        ]
+        stream_handler = self.logger.info if verbose else self.logger.debug
+        results, err = self._feval_batch(reqs, timeout=timeout, stream_handler=stream_handler)
+        if err:
+            msg = 'Failed to push "%s": %s' % (name[len(results)], self._parse_error(err))
+            raise Oct2PyError(msg)
 
-    def pull(self, var, timeout=None, verbose=True):
+    def pull(self, var, timeout=None, verbose=True, as_dataframe=False):
         """
         Retrieve a value or values from the Octave session.
 
@@ -355,6 +554,10 @@ class Oct2Py:
             Time to wait for response from Octave (per line).
         verbose: bool
              Log Octave output at INFO level.  If False, log at DEBUG level.
+        as_dataframe : bool, optional
+            If True, return each value as a ``pandas.DataFrame``.  The
+            values must be structs of column vectors, such as a pushed
+            ``DataFrame``.
 
         Returns
         -------
@@ -364,7 +567,8 @@ class Oct2Py:
         Raises
         ------
         Oct2PyError
-            If the variable does not exist in the Octave session.
+            If any of the variables do not exist in the Octave session.
+            The error names all of the missing variables.
 
         Examples
         --------
@@ -377,22 +581,273 @@ class Oct2Py:
           >>> octave.pull(['x', 'y'])  # doctest: +SKIP
           [u'spam', array([[1, 2, 3, 4]])]
 
+        Notes
+        -----
+        The existence check and the values of all of the variables are
+        fetched in a single Octave call.  Names that are not variables
+        (such as functions) are returned as pointers.
+
         """
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+
         timeout = timeout if timeout is not None else self._settings.timeout
         if isinstance(var, str):
             var = [var]
+        stream_handler = self.logger.info if verbose else self.logger.debug
+        values, status = self._feval(
+            "_pypull",
+            (tuple(var),),
+            nout=2,
+            timeout=timeout,
+            stream_handler=stream_handler,
+        )
+        return self._pull_outputs(var, values, status, timeout, as_dataframe)
+
+    def _pull_outputs(  # noqa: PLR0913
+        self, var, values, status, timeout=None, as_dataframe=False, pointers=None
+    ):
+        """Convert the outputs of `_pypull` to the return value of `pull`.
+
+        The names that are not variables are looked up with `get_pointer`,
+        unless their pointers are given in the `pointers` dict.
+        """
+        values = values.ravel().tolist()
+        status = np.atleast_1d(status).ravel().tolist()
+
+        missing = [name for name, exist in zip(var, status, strict=True) if exist == 0]
+        if len(missing) == 1:
+            raise Oct2PyError('"%s" is undefined' % missing[0])
+        if missing:
+            raise Oct2PyError("%s are undefined" % ", ".join('"%s"' % name for name in missing))
+
         outputs = []
-        for name in var:
-            exist = self._exist(name)
+        for name, value, exist in zip(var, values, status, strict=True):
             if exist == 1:
-                outputs.append(self.feval("evalin", "base", name, timeout=timeout, verbose=verbose))
+                outputs.append(value)
+            elif pointers is not None:
+                outputs.append(pointers[name])
             else:
                 outputs.append(self.get_pointer(name, timeout=timeout))
 
+        if as_dataframe:
+            outputs = [_to_dataframe(value) for value in outputs]
         if len(outputs) == 1:
             return outputs[0]
         return outputs
 
+    def push_chunked(  # noqa: PLR0913
+        self, name, data, axis=0, chunk_bytes=None, timeout=None, verbose=True
+    ):
+        """
+        Put a large array into the Octave session in bounded-size pieces.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable.
+        data : array_like or iterable
+            A numpy array (which may be memory-mapped), or an iterable of
+            blocks such as a generator reading from disk.  The result is the
+            same as pushing ``np.concatenate(list(data), axis)``.
+        axis : int, optional
+            The axis to split or join the array along.
+        chunk_bytes : int, optional
+            The most bytes to send in one piece (default 64 MiB).  Larger
+            blocks from an iterable are split.
+        timeout : float, optional
+            Time to wait for response from Octave (per piece).
+        verbose: bool
+             Log Octave output at INFO level.  If False, log at DEBUG level.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from oct2py import octave
+        >>> octave.push_chunked('x', np.arange(6.0).reshape(3, 2), chunk_bytes=16)
+        >>> octave.pull('x')
+        array([[0., 1.],
+               [2., 3.],
+               [4., 5.]])
+        >>> blocks = (np.full((1, 2), i) for i in range(3))
+        >>> octave.push_chunked('y', blocks)
+        >>> octave.pull('y')
+        array([[0., 0.],
+               [1., 1.],
+               [2., 2.]])
+
+        Notes
+        -----
+        Each piece is sent in its own Octave call, so only about one piece
+        is held in memory on either side at a time.  For an array, the
+        Octave variable is allocated at its full size by the first piece
+        and the rest are assigned into it in place.  The length of an
+        iterable is not known in advance, so its pieces are collected in
+        Octave and joined once at the end.
+
+        """
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+
+        timeout = timeout if timeout is not None else self._settings.timeout
+        chunk_bytes = chunk_bytes or _CHUNK_BYTES
+        stream_handler = self.logger.info if verbose else self.logger.debug
+
+        def send(block, cmd):
+            reqs = [
+                self._make_request("assignin", ("base", "_oct2py_chunk", block), nout=-1),
+                self._make_request("evalin", ("base", cmd + " clear _oct2py_chunk"), nout=-1),
+            ]
+            _, err = self._feval_batch(reqs, timeout=timeout, stream_handler=stream_handler)
+            if err:
+                msg = self._parse_error(err)
+                raise Oct2PyError(msg)
+
+        if isinstance(data, np.ndarray):
+            data, oct_axis = self._chunk_shape(data, axis)
+            dims = " ".join(str(dim) for dim in data.shape)
+            start = 0
+            for block in _split_chunks(data, oct_axis, chunk_bytes):
+                if not start:
+                    cmd = f"{name} = resize(_oct2py_chunk, [{dims}]);"
+                else:
+                    index = _index_expr(data.ndim, oct_axis, start, start + block.shape[oct_axis])
+                    cmd = f"{name}{index} = _oct2py_chunk;"
+                send(block, cmd)
+                start += block.shape[oct_axis]
+            if not start:
+                self.push(name, data, timeout=timeout, verbose=verbose)
+            return
+
+        count = 0
+        for item in data:
+            arr, oct_axis = self._chunk_shape(np.asarray(item), axis)
+            for block in _split_chunks(arr, oct_axis, chunk_bytes):
+                if not count:
+                    send(block, "_oct2py_chunks = {_oct2py_chunk};")
+                else:
+                    send(block, "_oct2py_chunks{end+1} = _oct2py_chunk;")
+                count += 1
+        if not count:
+            cmd = f"{name} = [];"
+        else:
+            cmd = f"{name} = cat({oct_axis + 1}, _oct2py_chunks{{:}}); clear _oct2py_chunks"
+        self._feval(
+            "evalin", ("base", cmd), nout=-1, timeout=timeout, stream_handler=stream_handler
+        )
+
+    def iter_pull(self, name, axis=0, chunk_rows=None, timeout=None, verbose=True):
+        """
+        Retrieve a large array from the Octave session in bounded-size pieces.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable.  It must hold a numeric or logical array.
+        axis : int, optional
+            The axis to split the array along.
+        chunk_rows : int, optional
+            The number of slices along `axis` in each block.  By default
+            blocks are about 64 MiB.
+        timeout : float, optional
+            Time to wait for response from Octave (per block).
+        verbose: bool
+             Log Octave output at INFO level.  If False, log at DEBUG level.
+
+        Yields
+        ------
+        block : ndarray
+            The next block of the array, with the full size along every
+            other axis.
+
+        Raises
+        ------
+        Oct2PyError
+            If the variable does not exist or is not a numeric or logical
+            array.
+
+        Examples
+        --------
+        >>> from oct2py import octave
+        >>> octave.push('x', [[1, 2], [3, 4], [5, 6]])
+        >>> [block.tolist() for block in octave.iter_pull('x', chunk_rows=2)]
+        [[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0]]]
+
+        Notes
+        -----
+        Each block is fetched in its own Octave call, so only about one
+        block is held in memory on the Python side at a time.  The array
+        is read as it is when each block is fetched.
+
+        """
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+
+        timeout = timeout if timeout is not None else self._settings.timeout
+        stream_handler = self.logger.info if verbose else self.logger.debug
+        reqs = [
+            self._make_request("evalin", ("base", f"size({name})"), nout=1),
+            self._make_request("evalin", ("base", f"sizeof({name})"), nout=1),
+            self._make_request(
+                "evalin", ("base", f"isnumeric({name}) || islogical({name})"), nout=1
+            ),
+        ]
+        results, err = self._feval_batch(reqs, timeout=timeout, stream_handler=stream_handler)
+        if err:
+            msg = self._parse_error(err)
+            raise Oct2PyError(msg)
+        shape, nbytes, is_array = results
+        if not is_array:
+            msg = f'"{name}" is not a numeric or logical array'
+            raise Oct2PyError(msg)
+
+        shape = [int(dim) for dim in np.ravel(shape)]
+        axis = axis + len(shape) if axis < 0 else axis
+        if not 0 <= axis < len(shape):
+            msg = f"axis {axis} is out of bounds for {name} with {len(shape)} dimensions"
+            raise Oct2PyError(msg)
+        length = shape[axis]
+        if not chunk_rows:
+            row_bytes = int(nbytes) // length if length else 0
+            chunk_rows = max(1, _CHUNK_BYTES // row_bytes) if row_bytes else length
+
+        for start in range(0, length, chunk_rows):
+            stop = min(start + chunk_rows, length)
+            index = _index_expr(len(shape), axis, start, stop)
+            block = self._feval(
+                "evalin",
+                ("base", f"{name}{index}"),
+                nout=1,
+                timeout=timeout,
+                stream_handler=stream_handler,
+            )
+            shape[axis] = stop - start
+            yield np.asarray(block).reshape(shape)
+
+    def _chunk_shape(self, arr, axis):
+        """Return the array as Octave will see it, and the matching axis.
+
+        1-D arrays are written as row or column vectors, depending on
+        `oned_as`.
+        """
+        if arr.ndim == 0:
+            arr = arr.reshape(1)
+        if arr.ndim == 1:
+            if axis not in (0, -1):
+                msg = f"axis {axis} is out of bounds for a 1-D array"
+                raise Oct2PyError(msg)
+            if self._settings.oned_as == "column":
+                return arr.reshape(-1, 1), 0
+            return arr.reshape(1, -1), 1
+        axis = axis + arr.ndim if axis < 0 else axis
+        if not 0 <= axis < arr.ndim:
+            msg = f"axis {axis} is out of bounds for an array with {arr.ndim} dimensions"
+            raise Oct2PyError(msg)
+        return arr, axis
+
     def get_pointer(self, name, timeout=None, expr=False):
         """Get a pointer to a named object in the Octave workspace.
 
@@ -466,7 +921,10 @@ class Oct2Py:
 
         exist = self._exist(name)
         isobject = self._isobject(name, exist)
+        return self._make_pointer(name, exist, isobject)
 
+    def _make_pointer(self, name, exist, isobject):
+        """Make the pointer for a name from its `exist` code."""
         if exist == 0:
             raise Oct2PyError('"%s" is undefined' % name)
 
@@ -536,6 +994,7 @@ class Oct2Py:
         except ImportError:  # pragma: no cover
             return
 
+        self._stop_server()
         plot_dir = tempfile.mkdtemp(dir=self._settings.temp_dir)
         try:
             # Temporarily switch to inline mode so _make_figures uses a
@@ -662,39 +1121,10 @@ class Oct2Py:
             nout = self._get_max_nout(func_path)
 
         plot_dir = kwargs.get("plot_dir")
-
-        # Choose appropriate plot backend.
-        default_backend = "inline" if plot_dir else self._settings.backend
-        backend = kwargs.get("plot_backend", default_backend)
-        # Map "disable" to "inline" so octave_kernel sets defaultfigurevisible=off.
-        if backend == "disable":
-            backend = "inline"
-
-        settings = dict(
-            backend=backend,
-            format=kwargs.get("plot_format"),
-            name=kwargs.get("plot_name"),
-            width=kwargs.get("plot_width"),
-            height=kwargs.get("plot_height"),
-            resolution=kwargs.get("plot_res"),
-        )
-        self._engine.plot_settings = settings
+        self._set_plot_settings(**kwargs)
 
         _is_dotted_name = kwargs.pop("_is_dotted_name", False)
-        if _is_dotted_name:
-            func_name = func_path
-            dname = ""
-        else:
-            dname = osp.dirname(func_path)
-            fname = osp.basename(func_path)
-            func_name, ext = osp.splitext(fname)
-            if ext and ext != ".m":
-                msg = "Need to give path to .m file"
-                raise TypeError(msg)
-
-        if func_name == "clear":
-            msg = 'Cannot use `clear` command directly, use eval("clear(var1, var2)")'
-            raise Oct2PyError(msg)
+        func_name, dname = self._split_func_path(func_path, _is_dotted_name)
 
         stream_handler = kwargs.get("stream_handler")
         verbose = kwargs.get("verbose", True)
@@ -715,6 +1145,175 @@ class Oct2Py:
             plot_dir=plot_dir,
         )
 
+    def bind(self, func_path, nout=1, store_as=None, **kwargs):
+        """Return a callable that runs an Octave function with fixed options.
+
+        The function path, `nout` and the plot settings are resolved once,
+        so calling the result costs less than `feval` when a small
+        function is called many times.
+
+        Parameters
+        ----------
+        func_path : str
+            Name of function to run or a path to an m-file.
+        nout : int or str, optional
+            The desired number of returned values, defaults to 1.  If
+            'max_nout', it is found once when binding.
+        store_as : str, optional
+            If given, saves the result to the given Octave variable name
+            instead of returning it.
+        **kwargs
+            The other keyword arguments of `feval`, such as ``quiet``,
+            ``verbose``, ``stream_handler``, ``timeout``, ``plot_dir`` and
+            the ``plot_*`` settings.
+
+        Returns
+        -------
+        OctaveBoundFunction
+            A callable that takes the arguments of the function.
+
+        Examples
+        --------
+        >>> from oct2py import octave
+        >>> plus = octave.bind('plus')
+        >>> plus(1, 2)
+        3.0
+        >>> u, s, v = octave.bind('svd', nout=3)(octave.hilb(3))
+        >>> s.shape
+        (3, 3)
+        """
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+
+        if kwargs.get("quiet"):
+            nout = -1
+        elif nout == "max_nout":
+            nout = self._get_max_nout(func_path)
+        func_name, dname = self._split_func_path(func_path)
+
+        return OctaveBoundFunction(
+            weakref.ref(self),
+            func_name,
+            dname=dname,
+            nout=nout,
+            store_as=store_as or "",
+            timeout=kwargs.get("timeout"),
+            verbose=kwargs.get("verbose", True),
+            stream_handler=kwargs.get("stream_handler"),
+            plot_settings=self._get_plot_settings(**kwargs),
+            plot_dir=kwargs.get("plot_dir"),
+        )
+
+    def memoize(self, func_path, nout=1, maxsize=128, ttl=None, **kwargs):
+        """Return a callable that caches the results of an Octave function.
+
+        Use this for deterministic functions that are called with the same
+        arguments many times.  Arguments are hashed by value, so equal
+        arrays share a result, and a repeated call returns a copy of the
+        cached result without calling Octave.  The cache is dropped when
+        the file that defines the function changes.
+
+        Parameters
+        ----------
+        func_path : str
+            Name of function to run or a path to an m-file.
+        nout : int or str, optional
+            The desired number of returned values, defaults to 1.  If
+            'max_nout', it is found once when memoizing.
+        maxsize : int, optional
+            The number of results to keep, defaults to 128.  The least
+            recently used result is dropped first.  If None, the cache is
+            not bounded.
+        ttl : float, optional
+            The number of seconds a result is kept for.  If None, results
+            do not expire.
+        **kwargs
+            The other keyword arguments of `bind`.
+
+        Returns
+        -------
+        OctaveMemoizedFunction
+            A callable that takes the arguments of the function.  Calls
+            with arguments that cannot be hashed by value, such as an
+            `OctavePtr`, are not cached.
+
+        Examples
+        --------
+        >>> from oct2py import octave
+        >>> hilb = octave.memoize('hilb')
+        >>> bool((hilb(3) == hilb(3)).all())
+        True
+        >>> hilb.stats['hits']
+        1
+        """
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+        if kwargs.get("store_as"):
+            msg = "Cannot memoize a function that stores its result"
+            raise Oct2PyError(msg)
+
+        bound = self.bind(func_path, nout=nout, **kwargs)
+        if osp.isabs(func_path):
+            path = func_path
+        else:
+            paths, _, _, _ = self._feval(
+                "_pydoc", ((bound.name,), False), nout=4, stream_handler=self.logger.debug
+            )
+            path = paths.ravel().tolist()[0]
+        return OctaveMemoizedFunction(bound, path, maxsize=maxsize, ttl=ttl)
+
+    def batch(self, timeout=None, verbose=True, stream_handler=None):
+        """Queue several calls and run them in a single Octave round trip.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The timeout in seconds for the whole batch.  If not given, the
+            instance `timeout` is used.
+        verbose : bool, optional
+            Log Octave output at INFO level.  If False, log at DEBUG level.
+        stream_handler : callable, optional
+            A function that is called for each line of output from the
+            evaluation.
+
+        Returns
+        -------
+        OctaveBatch
+            A batch whose calls run when the ``with`` block exits.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from oct2py import octave
+        >>> with octave.batch() as b:
+        ...     _ = b.push('A', np.eye(3))
+        ...     f1 = b.feval('svd', b.pull('A'), nout=3)
+        ...     f2 = b.feval('norm', f1[1])
+        >>> f2.result()
+        1.0
+        """
+        return OctaveBatch(self, timeout=timeout, verbose=verbose, stream_handler=stream_handler)
+
+    def _split_func_path(self, func_path, is_dotted_name=False):
+        """Split a function name or m-file path into its name and directory."""
+        if is_dotted_name:
+            func_name = func_path
+            dname = ""
+        else:
+            dname = osp.dirname(func_path)
+            fname = osp.basename(func_path)
+            func_name, ext = osp.splitext(fname)
+            if ext and ext != ".m":
+                msg = "Need to give path to .m file"
+                raise TypeError(msg)
+
+        if func_name == "clear":
+            msg = 'Cannot use `clear` command directly, use eval("clear(var1, var2)")'
+            raise Oct2PyError(msg)
+        return func_name, dname
+
     def eval(  # noqa: PLR0913
         self,
         cmds,
@@ -731,6 +1330,8 @@ class Oct2Py:
         plot_res=None,
         nout=0,
         quiet=False,
+        batch=False,
+        per_command_ans=False,
         **kwargs,
     ):
         """Evaluate an Octave command or commands.
@@ -776,6 +1377,15 @@ class Oct2Py:
             The plot backend to use.
         plot_res: int, optional
             The plot resolution in pixels per inch.
+        batch : bool, optional
+            If True, send all of the commands to Octave in a single request
+            instead of one request per command.  Execution stops at the
+            first command that fails, and the error names that command.
+            Only the `ans` of the last command is returned unless
+            `per_command_ans` is given.
+        per_command_ans : bool, optional
+            When `batch` is True, return a list with the `ans` of every
+            command instead of only the last one.
         **kwargs Deprecated kwargs.
 
         Examples
@@ -800,6 +1410,12 @@ class Oct2Py:
         >>> lines  # doctest: +SKIP
         [' 1', ' 2', ' 3']
 
+        >>> from oct2py import octave
+        >>> octave.eval(['a = 2;', 'b = a + 1;', 'a * b'], batch=True)
+        6.0
+        >>> octave.eval(['a + 1', 'b + 1'], batch=True, per_command_ans=True)
+        [3.0, 4.0]
+
         Returns
         -------
         out : object
@@ -848,34 +1464,101 @@ class Oct2Py:
             stream_handler = lines.append
 
         ans = None
-        for cmd in cmds:
-            resp = self.feval(
-                "evalin",
-                "base",
-                cmd,
-                nout=nout,
-                quiet=quiet,
-                timeout=timeout,
-                stream_handler=stream_handler,
-                verbose=verbose,
-                plot_dir=plot_dir,
-                plot_name=plot_name,
-                plot_format=plot_format,
-                plot_backend=plot_backend,
-                plot_width=plot_width,
-                plot_height=plot_height,
-                plot_res=plot_res,
-            )
-            if resp is not None:
-                ans = resp
-
-        self._settings.temp_dir = prev_temp_dir
-        self.logger.setLevel(prev_log_level)
+        try:
+            if batch:
+                ans = self._eval_batch(
+                    cmds,
+                    nout=nout,
+                    quiet=quiet,
+                    per_command_ans=per_command_ans,
+                    timeout=timeout,
+                    stream_handler=stream_handler,
+                    verbose=verbose,
+                    plot_dir=plot_dir,
+                    plot_name=plot_name,
+                    plot_format=plot_format,
+                    plot_backend=plot_backend,
+                    plot_width=plot_width,
+                    plot_height=plot_height,
+                    plot_res=plot_res,
+                )
+            else:
+                for cmd in cmds:
+                    resp = self.feval(
+                        "evalin",
+                        "base",
+                        cmd,
+                        nout=nout,
+                        quiet=quiet,
+                        timeout=timeout,
+                        stream_handler=stream_handler,
+                        verbose=verbose,
+                        plot_dir=plot_dir,
+                        plot_name=plot_name,
+                        plot_format=plot_format,
+                        plot_backend=plot_backend,
+                        plot_width=plot_width,
+                        plot_height=plot_height,
+                        plot_res=plot_res,
+                    )
+                    if resp is not None:
+                        ans = resp
+        finally:
+            # The code can change the graphics toolkit or figure visibility
+            # directly, so apply the plot settings again on the next call.
+            # An empty dict still marks that graphics have been used.
+            if self._plot_settings is not None:
+                self._plot_settings = {}
+            self._settings.temp_dir = prev_temp_dir
+            self.logger.setLevel(prev_log_level)
 
         if return_both:
             return "\n".join(lines), ans
         return ans
 
+    def _eval_batch(  # noqa: PLR0913
+        self,
+        cmds,
+        nout=0,
+        quiet=False,
+        per_command_ans=False,
+        timeout=None,
+        stream_handler=None,
+        verbose=True,
+        plot_dir=None,
+        **kwargs,
+    ):
+        """Evaluate a list of commands in a single Octave request."""
+        if not self._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+
+        self._set_plot_settings(plot_dir, **kwargs)
+        if not stream_handler:
+            stream_handler = self.logger.info if verbose else self.logger.debug
+        if nout == "max_nout":
+            # `evalin` is a built-in function whose commands may not
+            # return a value.
+            nout = 0
+
+        reqs = []
+        for i, cmd in enumerate(cmds):
+            # Skip capturing `ans` for commands whose value is not returned.
+            keep = not quiet and (per_command_ans or i == len(cmds) - 1)
+            reqs.append(self._make_request("evalin", ("base", cmd), nout=nout if keep else -1))
+
+        results, err = self._feval_batch(reqs, timeout=timeout, stream_handler=stream_handler)
+        if err:
+            index = min(len(results), len(cmds) - 1)
+            msg = self._parse_error(err)
+            msg += "\nerror: in command %d of %d: %s" % (index + 1, len(cmds), cmds[index])
+            raise Oct2PyError(msg)
+
+        self._handle_figures(plot_dir)
+        if per_command_ans:
+            return results
+        return results[-1] if results else None
+
     def run(self, script, **kwargs):
         """Run an Octave script file in the base workspace.
 
@@ -932,8 +1615,16 @@ class Oct2Py:
 
     def restart(self):  # noqa: PLR0912, PLR0915
         """Restart an Octave session in a clean state"""
+        if self._server:
+            self._server.close()
+            self._server = None
         if self._engine:
             self._engine.repl.terminate()
+        self.resolution_cache.invalidate()
+        self._docs.clear()
+        self._max_nouts.clear()
+        self._path_dirs.clear()
+        self._plot_settings = None
 
         # Close any open writer file handle — its path is tied to the old
         # temp_dir and will be invalid after we create a new one below.
@@ -943,64 +1634,33 @@ class Oct2Py:
 
         # Use the stored executable (may be empty, letting OctaveEngine resolve).
         _executable = self._settings.executable or ""
-
-        # Preserve the SIGINT handler across engine startup.  The underlying
-        # pexpect spawn temporarily replaces SIGINT with SIG_DFL so that the
-        # Octave child process inherits a clean disposition.  If a concurrent
-        # thread (e.g. from a scipy/sympy lazy initialiser) transiently sets
-        # SIGINT to SIG_IGN at exactly the wrong moment, pexpect's finally
-        # block can "restore" that transient SIG_IGN value, leaving SIGINT
-        # permanently ignored for the rest of the Python process (issue #168).
-        # Restoring the handler we observed before the spawn prevents engine
-        # startup from having any net effect on the caller's SIGINT disposition.
-        _saved_sigint = None
-        if threading.current_thread() is threading.main_thread():
-            with contextlib.suppress(Exception):
-                _saved_sigint = signal.getsignal(signal.SIGINT)
-
-        _qt_plugin_path = None
-        try:
-            # Use a weakref-based wrapper so that OctaveEngine (and its atexit
-            # registration) does not hold a strong reference back to this Oct2Py
-            # instance, which would otherwise prevent __del__ / exit() from ever
-            # being called and cause Octave subprocesses to accumulate.
-            #
-            # Strip QT_QPA_PLATFORM_PLUGIN_PATH before spawning Octave if it
-            # was injected by opencv-python.  opencv injects its own bundled
-            # Qt plugin directory (always under a "cv2" package path) into
-            # this variable; pexpect inherits os.environ, so the Octave child
-            # process would pick up the incompatible path and crash with
-            # "Could not load the Qt platform plugin" (issue #240).
-            # System-set paths (e.g. from the octave_kernel CI action on
-            # macOS) are safe to keep — stripping them breaks octave_kernel's
-            # _validate_executable, which needs to run octave successfully.
-            _qt_path = os.environ.get("QT_QPA_PLATFORM_PLUGIN_PATH", "")
-            _qt_plugin_path = (
-                os.environ.pop("QT_QPA_PLATFORM_PLUGIN_PATH") if "cv2" in _qt_path else None
-            )
-            _weak_self = weakref.ref(self)
-
-            def _stdin_handler(line):
-                inst = _weak_self()
-                if inst is not None:
-                    return inst._handle_stdin(line)
-                return None
-
-            self._engine = OctaveEngine(
-                executable=_executable,
-                stdin_handler=_stdin_handler,
-                logger=self.logger,
-                cli_options=self._settings.extra_cli_options,
-                load_octaverc=self._settings.load_octaverc,
-            )
-        except Exception as e:
-            raise Oct2PyError(str(e)) from None
-        finally:
-            if _saved_sigint is not None:
-                with contextlib.suppress(Exception):
-                    signal.signal(signal.SIGINT, _saved_sigint)
-            if _qt_plugin_path is not None:
-                os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = _qt_plugin_path
+        spare_key = (_executable, self._settings.extra_cli_options, self._settings.load_octaverc)
+
+        # Use a weakref-based wrapper so that OctaveEngine (and its atexit
+        # registration) does not hold a strong reference back to this Oct2Py
+        # instance, which would otherwise prevent __del__ / exit() from ever
+        # being called and cause Octave subprocesses to accumulate.
+        _weak_self = weakref.ref(self)
+
+        def _stdin_handler(line):
+            inst = _weak_self()
+            if inst is not None:
+                return inst._handle_stdin(line)
+            return None
+
+        # Adopt an engine started in the background if there is one.
+        engine = None
+        if self._settings.spare_engines > 0:
+            engine = _spare_engines.take(spare_key)
+        if engine is not None:
+            engine.stdin_handler = _stdin_handler
+            engine.logger = self.logger
+        else:
+            try:
+                engine = _start_engine(*spare_key, logger=self.logger, stdin_handler=_stdin_handler)
+            except Exception as e:
+                raise Oct2PyError(str(e)) from None
+        self._engine = engine
 
         self._settings.executable = self._engine.executable
         _augment_path_for_windows(self._settings.executable)
@@ -1034,13 +1694,20 @@ class Oct2Py:
         if self._out_fh is None or self._out_fh.closed:  # type: ignore[unreachable]
             self._out_fh = open(osp.join(self._settings.temp_dir, "writer.mat"), "w+b")  # noqa: SIM115
 
-        # Add local Octave scripts.
-        self._engine.eval('addpath("%s");' % HERE.replace(osp.sep, "/"))
+        if self._settings.spare_engines > 0:
+            _spare_engines.alias(spare_key, self._settings.executable)
+            _spare_engines.fill(
+                spare_key,
+                self._settings.spare_engines,
+                functools.partial(_start_engine, *spare_key, logger=get_log()),
+            )
 
-        # Octave's default max_recursion_depth is 256, which is lower than
-        # MATLAB's default and causes deep recursive functions to crash the
-        # session.  Raise it to match a more permissive default (issue #326).
-        self._engine.eval("max_recursion_depth(2500);")
+        if self._settings.request_server:
+            if os.name == "nt":
+                msg = "The request server is not available on Windows"
+                warnings.warn(msg, Oct2PyWarning, stacklevel=2)
+            else:
+                self._server = RequestServer(self._engine, self._settings.temp_dir)
 
     def _feval(  # noqa
         self,
@@ -1054,17 +1721,117 @@ class Oct2Py:
         plot_dir=None,
     ):
         """Run the given function with the given args."""
-        engine = self._engine
-        if engine is None:
-            msg = "Session is closed"
+        req = self._make_request(func_name, func_args, dname=dname, nout=nout, store_as=store_as)
+        return self._run_request(req, timeout, stream_handler, plot_dir)
+
+    def _run_request(self, req, timeout=None, stream_handler=None, plot_dir=None):
+        """Send a request and return the result of the call."""
+        resp = self._send_request(req, timeout=timeout, stream_handler=stream_handler)
+        if resp is None:
+            return None
+
+        if resp["err"]:
+            msg = self._parse_error(resp["err"])
             raise Oct2PyError(msg)
 
-        # Set up our mat file paths.
-        out_file = osp.join(self._settings.temp_dir, "writer.mat")
-        out_file = out_file.replace(osp.sep, "/")
-        in_file = osp.join(self._settings.temp_dir, "reader.mat")
-        in_file = in_file.replace(osp.sep, "/")
+        result = _unpack_result(resp["result"])
+        self._handle_figures(plot_dir)
+        return result
+
+    def _set_plot_settings(self, plot_dir=None, **kwargs):
+        """Set the engine plot settings for a call from `plot_*` kwargs."""
+        self._apply_plot_settings(self._get_plot_settings(plot_dir, **kwargs))
+
+    def _get_plot_settings(self, plot_dir=None, **kwargs):
+        """Return the engine plot settings for a call from `plot_*` kwargs.
+
+        Returns None in a headless session when the call does not use
+        graphics.
+        """
+        if self._settings.headless and not plot_dir and kwargs.get("plot_backend") is None:
+            return None
 
+        # Choose appropriate plot backend.
+        default_backend = "inline" if plot_dir else self._settings.backend
+        backend = kwargs.get("plot_backend", default_backend)
+        # Map "disable" to "inline" so octave_kernel sets defaultfigurevisible=off.
+        if backend == "disable":
+            backend = "inline"
+
+        return dict(
+            backend=backend,
+            format=kwargs.get("plot_format"),
+            name=kwargs.get("plot_name"),
+            width=kwargs.get("plot_width"),
+            height=kwargs.get("plot_height"),
+            resolution=kwargs.get("plot_res"),
+        )
+
+    def _apply_plot_settings(self, settings, bound=False):
+        """Apply plot settings to the engine.
+
+        The engine sets the graphics toolkit and the figure visibility each
+        time, which undoes any change a call made to them.  Bound calls and
+        calls through the request server skip settings that have not changed,
+        since applying them is a round trip to Octave (and leaves the request
+        server loop), which costs more than a small call.
+        """
+        if settings is None:
+            return
+        skip = bound or self._server is not None
+        if skip and settings == self._plot_settings:
+            return
+        self._stop_server()
+        # Other calls can change the graphics state themselves, so the next
+        # bound call applies the settings again.  An empty dict still marks
+        # that graphics have been used.
+        self._plot_settings = dict(settings) if skip else {}
+        # The engine fills in defaults in the dict it is given.
+        self._engine.plot_settings = dict(settings)  # type:ignore[union-attr]
+
+    def _handle_figures(self, plot_dir=None):
+        """Save or show the figures created by a call."""
+        if plot_dir:
+            self._stop_server()
+            self._engine.make_figures(plot_dir)  # type:ignore[union-attr]
+        elif self._settings.auto_show:
+            self._show_figures()
+
+    def _feval_batch(self, reqs, timeout=None, stream_handler=None):
+        """Run a sequence of requests in a single Octave round trip.
+
+        Parameters
+        ----------
+        reqs : list of dict
+            Requests created by `_make_request`, run in order.
+        timeout : float, optional
+            The timeout in seconds for the whole batch.
+        stream_handler : callable, optional
+            A function that is called for each line of output.
+
+        Returns
+        -------
+        results : list
+            The results of the requests that completed, in order.
+        err : object
+            The Octave error raised by the first request that failed, or
+            None.  The failing request is ``reqs[len(results)]``.
+        """
+        resp = self._send_request(
+            dict(batch=tuple(reqs)), timeout=timeout, stream_handler=stream_handler
+        )
+        if resp is None:
+            return [], None
+        results = [_unpack_result(item) for item in resp["result"].ravel().tolist()]
+        return results, resp["err"] or None
+
+    def _make_request(self, func_name, func_args=(), dname="", nout=0, store_as=""):
+        """Create a request dict for `_pyeval`."""
+        skeleton = dict(func_name=func_name, dname=dname or "", nout=nout, store_as=store_as or "")
+        return self._fill_request(skeleton, func_args)
+
+    def _fill_request(self, skeleton, func_args):
+        """Create a request dict for `_pyeval` from a skeleton and arguments."""
         func_args = list(func_args)
         ref_indices = []
         for i, value in enumerate(func_args):
@@ -1073,30 +1840,70 @@ class Oct2Py:
                 func_args[i] = value.address
         ref_arr = np.array(ref_indices)
 
-        # Save the request data to the output file.
-        req = dict(
-            func_name=func_name,
-            func_args=tuple(func_args),
-            dname=dname or "",
-            nout=nout,
-            store_as=store_as or "",
-            ref_indices=ref_arr,
-        )
+        req = dict(skeleton, func_args=tuple(func_args), ref_indices=ref_arr)
+        threshold = self._settings.raw_threshold_bytes
+        if threshold > 0:
+            self._add_raw_args(req, threshold)
+        return req
 
-        write_file(
-            req,
-            self._out_fh,
-            oned_as=self._settings.oned_as,
-            convert_to_float=self._settings.convert_to_float,
-        )
+    def _add_raw_args(self, req, threshold):
+        """Send the large array arguments of a request as raw array files.
+
+        Large sparse arguments are sent as raw sparse files.  Octave writes
+        large array outputs back the same way, to files named after
+        ``raw_prefix``.
+        """
+        prefix = osp.join(self._settings.temp_dir, "raw_%s" % uuid.uuid4().hex)
+        prefix = prefix.replace(osp.sep, "/")
+        func_args = list(req["func_args"])
+        raw_indices = []
+        for i, value in enumerate(func_args):
+            if issparse(value):
+                value = _encode(value, self._settings.convert_to_float)  # noqa:PLW2901
+                if _sparse_nbytes(value) < threshold:
+                    continue
+                path = "%s_arg%d.bin" % (prefix, i + 1)
+                write_raw_sparse(value, path)
+                raw_indices.append(i + 1)
+                func_args[i] = path
+                continue
+            if not isinstance(value, np.ndarray) or value.dtype.kind not in "biufc":
+                continue
+            value = _encode(value, self._settings.convert_to_float)  # noqa:PLW2901
+            if value.nbytes < threshold or _raw_code(value.dtype) is None:
+                continue
+            path = "%s_arg%d.bin" % (prefix, i + 1)
+            write_raw(value, path, oned_as=self._settings.oned_as)
+            raw_indices.append(i + 1)
+            func_args[i] = path
+        req["func_args"] = tuple(func_args)
+        req["raw_indices"] = np.array(raw_indices)
+        req["raw_threshold"] = float(threshold)
+        req["raw_prefix"] = prefix
+
+    def _send_request(self, req, timeout=None, stream_handler=None):
+        """Send a request to `_pyeval` and return the response dict.
+
+        Returns None if the session was closed while waiting.
+        """
+        engine = self._engine
+        if engine is None:
+            msg = "Session is closed"
+            raise Oct2PyError(msg)
+
+        out_file, in_file = self._write_request(req)
 
         # Set up the engine and evaluate the `_pyeval()` function.
-        engine.line_handler = stream_handler or self.logger.info
+        stream_handler = stream_handler or self.logger.info
+        engine.line_handler = stream_handler
         if timeout is None:
             timeout = self._settings.timeout
 
         try:
-            engine.eval(f'_pyeval("{out_file}", "{in_file}");', timeout=timeout)
+            if self._server:
+                self._server.eval(out_file, in_file, timeout=timeout, stream_handler=stream_handler)
+            else:
+                engine.eval(f'_pyeval("{out_file}", "{in_file}");', timeout=timeout)
         except KeyboardInterrupt:
             stream_handler(engine.repl.interrupt())
             raise
@@ -1106,37 +1913,83 @@ class Oct2Py:
             raise Oct2PyError(msg) from None
         except EOF:
             if not self._engine:
-                return
+                return None
             stream_handler(engine.repl.child.before)
             self.restart()
             msg = "Session died, restarting"
             raise Oct2PyError(msg) from None
+        finally:
+            _remove_raw_args(req)
+            self._update_resolutions(req)
 
         # Read in the output.
-        resp = read_file(in_file, self)
-        if resp["err"]:
-            msg = self._parse_error(resp["err"])
-            raise Oct2PyError(msg)
+        return read_file(in_file, self)
 
-        result = resp["result"].ravel().tolist()
-        if isinstance(result, list) and len(result) == 1:
-            result = result[0]
+    def _update_resolutions(self, req):
+        """Drop the cached resolutions of the names a request can change.
 
-        # Check for sentinel value.
-        if (
-            isinstance(result, Cell)
-            and result.size == 1
-            and isinstance(result[0], str)
-            and result[0] == "__no_value__"
-        ):
-            result = None
+        Calls that change the path drop every cached resolution, doc and
+        nout.  Calls that only change variables drop the resolutions of the
+        names they can assign, or all of the resolutions when the names are
+        not known.  Evaluated code is scanned for the names it uses, so a
+        function that changes the namespace internally still needs a call to
+        `resolution_cache.invalidate`.
+        """
+        for item in req.get("batch", (req,)):
+            func_name, func_args = item["func_name"], item["func_args"]
+            code: object = ""
+            if func_name == "eval" and func_args:
+                code = func_args[0]
+            elif func_name == "evalin" and len(func_args) > 1:
+                code = func_args[1]
+            code = code if isinstance(code, str) else ""
+            names = set(_NAME_RE.findall(code))
+            dname = func_args[1] if func_name == "_pynargout" else item["dname"]
+            if func_name in _PATH_FUNCS or names & _PATH_FUNCS:
+                self._clear_path_caches()
+                return
+            if dname and dname not in self._path_dirs:
+                # `_pyeval` and `_pynargout` add the directory to the path.
+                self._clear_path_caches()
+                self._path_dirs.add(dname)
+            if code and not names & _NAMESPACE_FUNCS:
+                self.resolution_cache.invalidate(sorted(names))
+            elif func_name == "assignin":
+                self.resolution_cache.invalidate(func_args[1])
+            elif func_name in _NAMESPACE_FUNCS or names & _NAMESPACE_FUNCS:
+                self.resolution_cache.invalidate()
+            if item["store_as"]:
+                self.resolution_cache.invalidate(item["store_as"])
+
+    def _clear_path_caches(self):
+        """Drop everything cached about the names on the path."""
+        self.resolution_cache.invalidate()
+        self._docs.clear()
+        self._max_nouts.clear()
+        self._path_dirs.clear()
+
+    def _write_request(self, req):
+        """Save a request for `_pyeval` and return its input and output files."""
+        # Set up our mat file paths.
+        out_file = osp.join(self._settings.temp_dir, "writer.mat")
+        out_file = out_file.replace(osp.sep, "/")
+        in_file = osp.join(self._settings.temp_dir, "reader.mat")
+        in_file = in_file.replace(osp.sep, "/")
 
-        if plot_dir:
-            engine.make_figures(plot_dir)
-        elif self._settings.auto_show:
-            self._show_figures()
+        if self._settings.transfer_format == "hdf5":
+            req = dict(req, hdf5_threshold=float(self._settings.hdf5_threshold_bytes))
+        # No figures can exist until a headless session uses graphics.
+        if self._settings.headless and self._plot_settings is None:
+            req = dict(req, headless=True)
 
-        return result
+        # Save the request data to the output file.
+        write_file(
+            req,
+            self._out_fh,
+            oned_as=self._settings.oned_as,
+            convert_to_float=self._settings.convert_to_float,
+        )
+        return out_file, in_file
 
     def _parse_error(self, err):
         """Create a traceback for an Octave evaluation error."""
@@ -1193,20 +2046,114 @@ class Oct2Py:
            If the procedure or object function has a syntax error.
 
         """
-        doc = "No documentation for %s" % name
+        doc = self._fetch_docs([name])[name]
+        if isinstance(doc, Oct2PyError):
+            raise doc
+        return doc
 
-        engine = self._engine
-        if not engine:
+    def prefetch_docs(self, names, timeout=None):
+        """Fetch the documentation of several Octave functions at once.
+
+        The documentation that is not cached is fetched in a single Octave
+        call.  It is then cached for the session, so that ``help()`` and
+        ``__doc__`` on the functions are immediate, and on disk (see the
+        `doc_cache_dir` setting) for later sessions.
+
+        Parameters
+        ----------
+        names : str or list
+            The names of the functions.
+        timeout : float, optional
+            Time to wait for response from Octave (per line).
+
+        Returns
+        -------
+        docs : dict
+            The documentation of each name.  Names whose documentation
+            cannot be read, such as m-files with syntax errors, are left
+            out.
+
+        Examples
+        --------
+        >>> from oct2py import octave
+        >>> docs = octave.prefetch_docs(['ones', 'zeros'])
+        >>> sorted(docs)
+        ['ones', 'zeros']
+        """
+        if isinstance(names, str):
+            names = [names]
+        docs = {}
+        for name, doc in self._fetch_docs(names, timeout=timeout).items():
+            if isinstance(doc, Oct2PyError):
+                self.logger.debug("No documentation for %s: %s", name, doc)
+            else:
+                docs[name] = doc
+        return docs
+
+    def _fetch_docs(self, names, timeout=None):
+        """Return the documentation of the names, or the error for each.
+
+        Documentation is looked up in the session and then on disk, by
+        the file that defines each name, and the rest is fetched with one
+        call to `_pydoc`.
+        """
+        if not self._engine:
             msg = "Session is not open"
             raise Oct2PyError(msg)
-        doc = engine.eval('help("%s")' % name, silent=True)
-
-        if "syntax error:" in doc.lower():
-            raise Oct2PyError(doc)
 
-        if "error:" in doc.lower():
-            doc = engine.eval('type("%s")' % name, silent=True)
-            doc = "\n".join(doc.splitlines()[:3])
+        docs = {name: self._docs[name] for name in names if name in self._docs}
+        missing = [name for name in dict.fromkeys(names) if name not in docs]
+        if not missing:
+            return docs
+
+        directory = self._settings.doc_cache_dir
+        disk = DocCache(directory) if directory != "" else None
+        paths, version, _, _ = self._feval(
+            "_pydoc",
+            (tuple(missing), False),
+            nout=4,
+            timeout=timeout,
+            stream_handler=self.logger.debug,
+        )
+        keys = {}
+        for name, path in zip(missing, paths.ravel().tolist(), strict=True):
+            keys[name] = _doc_key(name, path, version)
+            doc = disk.get(keys[name]) if disk and keys[name] else None
+            if doc is not None:
+                docs[name] = self._docs[name] = doc
+        fetch = [name for name in missing if name not in docs]
+        if not fetch:
+            return docs
+
+        _, _, helps, types = self._feval(
+            "_pydoc",
+            (tuple(fetch), True),
+            nout=4,
+            timeout=timeout,
+            stream_handler=self.logger.debug,
+        )
+        helps = helps.ravel().tolist()
+        types = types.ravel().tolist()
+        for name, help_text, type_text in zip(fetch, helps, types, strict=True):
+            try:
+                doc = self._render_doc(name, help_text, type_text)
+            except Oct2PyError as e:
+                docs[name] = e
+                continue
+            docs[name] = self._docs[name] = doc
+            # Only documentation that `help` found is stored on disk.
+            if disk and keys[name] and not type_text:
+                disk.set(keys[name], doc)
+        return docs
+
+    def _render_doc(self, name, help_text, type_text):
+        """Build the docstring of a function from its `help` or `type` text."""
+        if type_text:
+            if "syntax error" in help_text.lower():
+                raise Oct2PyError(help_text)
+            doc = "\n".join(type_text.splitlines()[:3])
+        else:
+            doc = help_text or "No documentation for %s" % name
 
         default = self.feval.__doc__
         default = (
@@ -1226,33 +2173,37 @@ class Oct2Py:
         return doc
 
     def _exist(self, name):
-        """Test whether a name exists and return the name code.
-
-        Raises an error when the name does not exist.
-        """
-        cmd = 'exist("%s")' % name
-        if not self._engine:
-            msg = "Session is not open"
-            raise Oct2PyError(msg)
-        resp = self._engine.eval(cmd, silent=True).strip()
-        exist = int(resp.split()[-1])
-        if exist == 0:
-            cmd = "class(%s)" % name
-            resp = self._engine.eval(cmd, silent=True).strip()
-            if "error:" not in resp:
-                exist = 2
-        return exist
+        """Test whether a name exists and return the name code."""
+        return self._resolve(name)[0]
 
     def _isobject(self, name, exist):
         """Test whether the name is an object."""
         if exist in [2, 5]:
             return False
-        cmd = "isobject(%s)" % name
+        return self._resolve(name)[1]
+
+    def _resolve(self, name):
+        """Return the `exist` code of a name and whether it is an object.
+
+        Both are found with one call to `_pyresolve` and kept in the
+        resolution cache.
+        """
         if not self._engine:
             msg = "Session is not open"
             raise Oct2PyError(msg)
-        resp = self._engine.eval(cmd, silent=True).strip()
-        return resp == "ans =  1"
+        entry = self.resolution_cache.get(name)
+        if entry is None:
+            exist, isobject = self._feval(
+                "_pyresolve", (name,), nout=2, stream_handler=self.logger.debug
+            )
+            entry = (int(exist), bool(isobject))
+            self.resolution_cache.set(name, *entry)
+        return entry
+
+    def _stop_server(self):
+        """Return to the Octave prompt if the request server is running."""
+        if self._server:
+            self._server.stop()
 
     def _get_function_ptr(self, name):
         """Get or create a function pointer of the given name."""
@@ -1312,33 +2263,99 @@ class Oct2Py:
         return obj
 
     def _get_max_nout(self, func_path):
-        """Get or count maximum nout of .m function."""
-
-        if not osp.isabs(func_path):
-            func_path = self.which(func_path)
-
-        nout = 0  # default nout of eval
-        status = "NOT FUNCTION"
-        if func_path.endswith(".m"):  # only if `func_path` is .m file
-            with open(func_path, encoding="utf8") as fid:
-                for line in fid:
-                    if line[0] != "f":  # noqa # not function
-                        if status == "NOT FUNCTION":
-                            continue
-                    line = line.translate(  # noqa
-                        str.maketrans("", "", "[]()")
-                    ).split()  # type:ignore[assignment]
-                    try:  # noqa
-                        line.remove("function")  # type:ignore[attr-defined]
-                    except Exception:  # noqa
-                        pass
-                    for char in line:
-                        if char == "...":
-                            status = "FUNCTION"
-                            continue
-                        if char != "=":
-                            nout += 1
-                        else:
-                            return nout
+        """Get the maximum nout of a function.
+
+        Octave's `nargout` is asked once per function, and the answer is
+        kept until the file that defines the function changes or a call
+        changes the path.
+        """
+        nout, args = self._cached_max_nout(func_path)
+        if nout is None:
+            path, nout = self._feval("_pynargout", args, nout=2, stream_handler=self.logger.debug)
+            nout = self._cache_max_nout(func_path, path, nout)
+        return nout
+
+    def _cached_max_nout(self, func_path):
+        """Return the known max nout of a function and the `_pynargout` args.
 
+        The nout is None when Octave has to be asked.
+        """
+        if osp.isabs(func_path):
+            if not func_path.endswith(".m"):
+                return 0, ()
+            func_name, dname = self._split_func_path(func_path)
+        else:
+            func_name, dname = func_path, ""
+
+        entry = self._max_nouts.get(func_path)
+        if entry is not None:
+            path, mtime, nout = entry
+            if _file_mtime(path) == mtime:
+                return nout, ()
+        return None, (func_name, dname)
+
+    def _cache_max_nout(self, func_path, path, nout):
+        """Keep the max nout of a function until its file changes."""
+        nout = int(nout)
+        self._max_nouts[func_path] = (path, _file_mtime(path), nout)
         return nout
+
+
+def _index_expr(ndim, axis, start, stop):
+    """Return an Octave index selecting ``start:stop`` along an axis."""
+    parts = [":"] * ndim
+    parts[axis] = f"{start + 1}:{stop}"
+    return "(%s)" % ",".join(parts)
+
+
+def _split_chunks(arr, axis, chunk_bytes):
+    """Yield consecutive slices of an array along an axis within a size."""
+    length = arr.shape[axis]
+    row_bytes = arr.nbytes // length if length else 0
+    step = max(1, chunk_bytes // row_bytes) if row_bytes else max(length, 1)
+    index = [slice(None)] * arr.ndim
+    for start in range(0, length, step):
+        index[axis] = slice(start, start + step)
+        yield arr[tuple(index)]
+
+
+def _doc_key(name, path, version):
+    """Return the doc cache key of a function, or None if it cannot be cached.
+
+    Functions defined in files are keyed by the modification time of the
+    file, and built-in functions by the Octave version alone.
+    """
+    mtime = 0
+    if osp.isabs(path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            # The file is not visible from Python (such as in a sandbox).
+            return None
+    return [__version__, version, name, path, mtime]
+
+
+def _remove_raw_args(req):
+    """Remove the raw array files written for the arguments of a request."""
+    for item in req.get("batch", (req,)):
+        for index in item.get("raw_indices", ()):
+            with contextlib.suppress(OSError):
+                os.remove(item["func_args"][index - 1])
+
+
+def _unpack_result(result):
+    """Convert the outputs cell of a `_pyeval` response to a Python value."""
+    result = result.ravel().tolist()
+    if isinstance(result, list) and len(result) == 1:
+        result = result[0]
+
+    # Check for sentinel value.
+    if (
+        isinstance(result, Cell)
+        and result.size == 1
+        and isinstance(result[0], str)
+        and result[0] == "__no_value__"
+    ):
+        result = None
+
+    return result
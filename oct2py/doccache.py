@@ -0,0 +1,68 @@
+"""An on-disk cache of Octave function documentation."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import hashlib
+import json
+import os
+import os.path as osp
+import sys
+import tempfile
+
+from .utils import get_log
+
+
+class DocCache:
+    """Rendered documentation of Octave functions, stored in a directory.
+
+    Each entry is one file, named after a hash of its key.  Keys hold the
+    Octave version and the file that defines a function with its
+    modification time, so editing an m-file or upgrading Octave misses the
+    old entries instead of returning them.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The cache directory.  Defaults to an ``oct2py/docs`` directory in
+        the user cache directory of the platform.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+
+    def get(self, key):
+        """Return the documentation stored for a key, or None."""
+        try:
+            with open(self._path(key), encoding="utf-8") as fid:
+                return fid.read()
+        except OSError:
+            return None
+
+    def set(self, key, doc):
+        """Store the documentation for a key, ignoring write errors."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a new file and rename it, so other processes never
+            # read a partial entry.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fid:
+                fid.write(doc)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            get_log().debug("Could not write to the doc cache: %s", e)
+
+    def _path(self, key):
+        """Return the file of a key."""
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return osp.join(self.directory, digest + ".txt")
+
+
+def default_cache_dir():
+    """Return the default directory of the doc cache."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or osp.expanduser("~/AppData/Local")
+    elif sys.platform == "darwin":
+        base = osp.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or osp.expanduser("~/.cache")
+    return osp.join(base, "oct2py", "docs")
@@ -9,7 +9,7 @@ from typing import Any
 
 import numpy as np
 
-from .utils import Oct2PyWarning
+from .utils import Oct2PyError, Oct2PyWarning
 
 try:
     from scipy.io.matlab import MatlabObject
@@ -58,6 +58,56 @@ class _DocDescriptor:
         return self.doc
 
 
+class OctaveBoundFunction:
+    """An Octave function bound to a session with fixed call options.
+
+    Created by `Oct2Py.bind`.  The function path, the number of outputs
+    and the plot settings are resolved when binding, so each call only
+    encodes its arguments and sends the request.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        session_weakref,
+        func_name,
+        dname,
+        nout,
+        store_as,
+        timeout,
+        verbose,
+        stream_handler,
+        plot_settings,
+        plot_dir,
+    ):
+        """Initialize the bound function."""
+        self._ref = session_weakref
+        self.name = func_name
+        self._skeleton = dict(func_name=func_name, dname=dname, nout=nout, store_as=store_as)
+        self._timeout = timeout
+        self._verbose = verbose
+        self._stream_handler = stream_handler
+        self._plot_settings = plot_settings
+        self._plot_dir = plot_dir
+
+    def __call__(self, *inputs):
+        """Call the function with the given arguments."""
+        session = self._ref()
+        if session is None or not session._engine:
+            msg = "Session is not open"
+            raise Oct2PyError(msg)
+        stream_handler = self._stream_handler
+        if not stream_handler:
+            logger = session.logger
+            stream_handler = logger.info if self._verbose else logger.debug
+        session._apply_plot_settings(self._plot_settings, bound=True)
+        req = session._fill_request(self._skeleton, inputs)
+        return session._run_request(req, self._timeout, stream_handler, self._plot_dir)
+
+    def __repr__(self):
+        """A string repr of the bound function."""
+        return '<bound Octave function "%s">' % self.name
+
+
 class OctaveVariablePtr(OctavePtr):
     """An object that acts as a pointer to an Octave value."""
 
@@ -73,6 +123,36 @@ class OctaveVariablePtr(OctavePtr):
     def value(self, obj):
         self._ref().push(self.address, obj)
 
+    def __getitem__(self, key):
+        """Get part of the value, indexing it in Octave.
+
+        Integers, slices, ellipses, integer sequences and boolean masks are
+        supported, with the same meaning as for a numpy array, except that
+        integers do not remove a dimension.  Missing trailing subscripts
+        select whole dimensions, and a single subscript on a vector indexes
+        its elements.  Only the selected part is sent back.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        subs = tuple(_index_sub(item) for item in key)
+        return self._ref().feval("_pyindex", self, subs)
+
+    def field(self, name):
+        """Get a field of the struct value, or a nested field as ``"a.b"``.
+
+        Only the field is sent back.
+        """
+        return self._ref().feval("getfield", self, *name.split("."))
+
+    def select(self, names):
+        """Get a struct holding only the given fields of the struct value.
+
+        Only those fields are sent back.
+        """
+        if isinstance(names, str):
+            names = [names]
+        return self._ref().feval("_pyselect", self, tuple(names))
+
 
 class OctaveFunctionPtr(OctavePtr):
     """An object that acts as a pointer to an Octave function."""
@@ -316,6 +396,24 @@ def _make_function_ptr_instance(session, name):
     return custom(ref, name)
 
 
+def _index_sub(item):
+    """Encode a numpy-style subscript for `_pyindex`."""
+    if item is Ellipsis:
+        return "..."
+    if isinstance(item, slice):
+        if item == slice(None):
+            return ":"
+        fields = dict(start=item.start, stop=item.stop, step=item.step)
+        return {key: np.nan if val is None else float(val) for key, val in fields.items()}
+    arr = np.asarray(item)
+    if arr.dtype.kind == "b":
+        return arr
+    if arr.dtype.kind not in "ui" and arr.size:
+        msg = "Invalid index: %r" % (item,)
+        raise TypeError(msg)
+    return arr.astype(np.float64)
+
+
 def _make_variable_ptr_instance(session, name):
     """Make a pointer instance for a given variable by name."""
     return OctaveVariablePtr(weakref.ref(session), name, name)
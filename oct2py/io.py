@@ -5,27 +5,14 @@
 import dis
 import inspect
 import os
+import re
+import sys
 import threading
 
 import numpy as np
 from scipy.io import loadmat, savemat
 from scipy.io.matlab import MatlabFunction, MatlabObject
-from scipy.sparse import spmatrix
-
-try:
-    from pandas import DataFrame, Series
-except Exception:  # pragma: no cover
-
-    class Series:  # type:ignore[no-redef]
-        """placeholder."""
-
-        pass
-
-    class DataFrame:  # type:ignore[no-redef]
-        """placeholder."""
-
-        pass
-
+from scipy.sparse import csc_matrix, issparse
 
 from .dynamic import OctaveFunctionPtr, OctaveUserClass, OctaveVariablePtr
 from .utils import Oct2PyError
@@ -35,10 +22,14 @@ _WRITE_LOCK = threading.Lock()
 
 def read_file(path, session=None, keep_matlab_shapes=False):
     """Read the data from the given file path."""
+    # Only sessions that ask for HDF5 responses can get them.
+    hdf5 = True
     if session:
         keep_matlab_shapes = keep_matlab_shapes or session.settings.keep_matlab_shapes
+        hdf5 = session.settings.transfer_format == "hdf5"
     try:
-        data = loadmat(path, struct_as_record=True)
+        hdf5 = hdf5 and _is_hdf5(path)
+        data = read_hdf5(path) if hdf5 else loadmat(path, struct_as_record=True)
     except UnicodeDecodeError as e:
         raise Oct2PyError(str(e)) from None
     except TypeError as e:
@@ -84,6 +75,312 @@ def write_file(obj, path_or_fh, oned_as="row", convert_to_float=True):
         raise Exception(msg) from None
 
 
+# The element types of raw array files, indexed by the class code in the
+# header.  Complex arrays use the code of their real type.
+_RAW_DTYPES = [
+    np.float64,
+    np.float32,
+    np.int8,
+    np.uint8,
+    np.int16,
+    np.uint16,
+    np.int32,
+    np.uint32,
+    np.int64,
+    np.uint64,
+    np.bool_,
+]
+_RAW_MAGIC = b"OCT2PYRW"
+_RAW_SPARSE_MAGIC = b"OCT2PYSP"
+
+# The size of the indices in a raw sparse file, unless they need 64 bits.
+_RAW_INDEX_SIZE = 4
+
+
+def _raw_code(dtype):
+    """Return the raw file class code for a dtype, or None if unsupported."""
+    if dtype.kind == "c":
+        dtype = np.dtype(dtype.char.lower())
+    for code, raw_dtype in enumerate(_RAW_DTYPES):
+        if dtype == raw_dtype:
+            return code
+    return None
+
+
+def write_raw(arr, path, oned_as="row"):
+    """Save a dense numeric array to a raw array file.
+
+    The file holds an 8 byte magic, an int64 header of the class code,
+    complex flag, order flag (0 for column-major, 1 for row-major), number
+    of dimensions and the dimensions, followed by the array data in native
+    byte order.  Complex values are stored interleaved.  The array is
+    written in whichever order it is already laid out in, so no transpose
+    is needed on the Python side.
+    """
+    if not arr.dtype.isnative:
+        arr = arr.astype(arr.dtype.newbyteorder("="))
+    code = _raw_code(arr.dtype)
+    if code is None:
+        msg = "Cannot write %s arrays as raw data" % arr.dtype
+        raise Oct2PyError(msg)
+    if arr.ndim == 1:
+        arr = arr.reshape((1, -1) if oned_as == "row" else (-1, 1))
+    if arr.ndim > 1 and arr.flags.f_contiguous:
+        order, data = 0, arr.T
+    else:
+        order, data = 1, np.ascontiguousarray(arr)
+    header = np.array([code, arr.dtype.kind == "c", order, arr.ndim, *arr.shape], dtype=np.int64)
+    with open(path, "wb") as fid:
+        fid.write(_RAW_MAGIC)
+        fid.write(header.tobytes())
+        data.tofile(fid)
+
+
+def write_raw_sparse(mat, path):
+    """Save a sparse matrix to a raw sparse file.
+
+    The file holds an 8 byte magic, an int64 header of the class code,
+    complex flag, index size in bytes, number of rows, number of columns
+    and number of stored values, followed by the CSC column pointers, row
+    indices and values in native byte order.  Each section starts on an 8
+    byte boundary.
+    """
+    mat = _encode(mat, True).tocsc()
+    nnz = int(mat.indptr[-1])
+    indptr, indices = mat.indptr, mat.indices[:nnz]
+    itype = np.result_type(indptr.dtype, indices.dtype)
+    data = mat.data[:nnz]
+    if not data.dtype.isnative:
+        data = data.astype(data.dtype.newbyteorder("="))
+    code = _raw_code(data.dtype)
+    header = [code, data.dtype.kind == "c", itype.itemsize, *mat.shape, nnz]
+    with open(path, "wb") as fid:
+        fid.write(_RAW_SPARSE_MAGIC)
+        fid.write(np.array(header, dtype=np.int64).tobytes())
+        for section in (indptr.astype(itype, copy=False), indices.astype(itype, copy=False)):
+            section.tofile(fid)
+            fid.write(bytes(-section.nbytes % 8))
+        data.tofile(fid)
+
+
+def read_raw(path):
+    """Load an array from a raw array file written by `_pyeval`.
+
+    The array is a copy-on-write view of a memory map of the file, so the
+    data is not copied into Python.  The file is removed once it is mapped.
+    Raw sparse files are returned as a CSC matrix viewing the file.
+    """
+    if os.name == "nt":
+        # Windows cannot remove a file while it is mapped.
+        buf = np.fromfile(path, dtype=np.uint8)
+    else:
+        buf = np.memmap(path, dtype=np.uint8, mode="c")
+    try:
+        if bytes(buf[:8]) == _RAW_SPARSE_MAGIC:
+            return _read_raw_sparse(buf, path)
+        if bytes(buf[:8]) != _RAW_MAGIC:
+            msg = "Invalid raw array file: %s" % path
+            raise Oct2PyError(msg)
+        code, is_complex, order, ndim = np.frombuffer(buf, np.int64, 4, 8).tolist()
+        shape = tuple(np.frombuffer(buf, np.int64, ndim, 40).tolist())
+        dtype = np.dtype(_RAW_DTYPES[code])
+        if is_complex:
+            dtype = np.result_type(dtype, np.complex64)
+        offset = 40 + 8 * ndim
+        count = int(np.prod(shape))
+        if buf.size != offset + count * dtype.itemsize:
+            msg = "Truncated raw array file: %s" % path
+            raise Oct2PyError(msg)
+        data = buf[offset:].view(dtype).reshape(shape, order="C" if order else "F")
+    finally:
+        os.remove(path)
+    return data.view(np.ndarray)
+
+
+def _read_raw_sparse(buf, path):
+    """Create a CSC matrix viewing the sections of a raw sparse file."""
+    code, is_complex, isize, nrows, ncols, nnz = np.frombuffer(buf, np.int64, 6, 8).tolist()
+    itype = np.dtype(np.int32 if isize == _RAW_INDEX_SIZE else np.int64)
+    dtype = np.dtype(_RAW_DTYPES[code])
+    if is_complex:
+        dtype = np.result_type(dtype, np.complex64)
+    sections = []
+    offset = 56
+    for count, section_dtype in ((ncols + 1, itype), (nnz, itype), (nnz, dtype)):
+        nbytes = count * section_dtype.itemsize
+        if buf.size < offset + nbytes:
+            msg = "Truncated raw array file: %s" % path
+            raise Oct2PyError(msg)
+        sections.append(buf[offset : offset + nbytes].view(section_dtype).view(np.ndarray))
+        offset += nbytes + (-nbytes % 8)
+    indptr, indices, data = sections
+    return csc_matrix((data, indices, indptr), shape=(nrows, ncols))
+
+
+def _sparse_nbytes(mat):
+    """Return the number of bytes of a sparse matrix in a raw sparse file."""
+    index_bytes = (mat.nnz + mat.shape[1] + 1) * _RAW_INDEX_SIZE
+    return mat.nnz * mat.dtype.itemsize + index_bytes
+
+
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+
+# The Octave HDF5 types that are stored as a plain (or complex) dataset.
+_HDF5_NUMERIC_TYPES = {"scalar", "matrix", "bool", "bool matrix"}
+for _prefix in ("", "float "):
+    _HDF5_NUMERIC_TYPES.update({_prefix + "complex scalar", _prefix + "complex matrix"})
+_HDF5_NUMERIC_TYPES.update({"float scalar", "float matrix"})
+for _bits in (8, 16, 32, 64):
+    for _kind in ("int", "uint"):
+        _HDF5_NUMERIC_TYPES.update({"%s%d scalar" % (_kind, _bits), "%s%d matrix" % (_kind, _bits)})
+
+
+# Datasets smaller than this are read rather than memory-mapped.
+_HDF5_MMAP_BYTES = 1024 * 1024
+
+
+def _is_hdf5(path):
+    """Test whether a file is an HDF5 file rather than a MAT file."""
+    with open(path, "rb") as fid:
+        return fid.read(8) == _HDF5_SIGNATURE
+
+
+def read_hdf5(path):
+    """Read the variables of a file saved by Octave with ``save -hdf5``.
+
+    The values are returned in the form `loadmat` uses, so they can be
+    passed to `_extract`.  Large uncompressed datasets are memory-mapped
+    copy-on-write rather than read into memory, and the file is removed
+    afterwards so the next response does not overwrite the mapped data.
+    """
+    try:
+        import h5py  # noqa: PLC0415
+    except ImportError:
+        msg = "h5py is required to read HDF5 responses from Octave"
+        raise Oct2PyError(msg) from None
+
+    # Windows cannot remove a file while it is mapped.
+    mmap = os.name != "nt"
+    with h5py.File(path, "r") as fid:
+        out = {name: _read_hdf5_value(group, path, mmap) for name, group in fid.items()}
+    if mmap:
+        os.remove(path)
+    return out
+
+
+def _read_hdf5_value(group, path, mmap):  # noqa
+    """Read an Octave variable group of an HDF5 file."""
+    type_ = group["type"][()]
+    if isinstance(type_, bytes):
+        type_ = type_.decode("ascii")
+    type_ = type_.rstrip("\x00")
+    value = group.get("value")
+
+    if type_ in _HDF5_NUMERIC_TYPES:
+        data = _read_hdf5_dataset(value, path, mmap)
+        if type_.startswith("bool"):
+            data = data.astype(np.bool_)
+        return data
+
+    if type_ in ("string", "sq_string"):
+        chars = np.atleast_2d(value[()]).T.astype(np.uint8)
+        rows = [bytes(row).decode("utf-8") for row in chars]
+        return np.array(rows or [""])
+
+    if type_ in ("null_string", "null_sq_string"):
+        return np.array([""])
+
+    if type_ == "null_matrix":
+        return np.empty((0, 0))
+
+    if type_ == "range":
+        data = value[()]
+        base, limit, inc = float(data["base"]), float(data["limit"]), float(data["increment"])
+        nelem = value.attrs.get("OCTAVE_RANGE_NELEM")
+        if nelem is None:
+            nelem = int(np.floor((limit - base) / inc + 1 + 1e-10)) if inc else 0
+        return (base + inc * np.arange(int(nelem))).reshape(1, -1)
+
+    if type_ == "cell":
+        return _read_hdf5_cell(value, path, mmap)
+
+    if type_ == "scalar struct":
+        fields = _hdf5_fields(value)
+        out = np.empty((1, 1), dtype=[(field, object) for field in fields])
+        for field in fields:
+            out[0, 0][field] = _read_hdf5_value(value[field], path, mmap)
+        return out
+
+    if type_ == "struct":
+        # Each field of a struct array is saved as a cell of its values.
+        cells = {field: _read_hdf5_value(value[field], path, mmap) for field in _hdf5_fields(value)}
+        shape = next(iter(cells.values())).shape if cells else (1, 1)
+        out = np.empty(shape, dtype=[(field, object) for field in cells])
+        for field, cell in cells.items():
+            out[field] = cell
+        return out
+
+    if type_ in ("sparse matrix", "bool sparse matrix", "complex sparse matrix"):
+        shape = (int(value["nr"][()]), int(value["nc"][()]))
+        data = _read_hdf5_dataset(value["data"], path, False).ravel()
+        if type_.startswith("bool"):
+            data = data.astype(np.bool_)
+        indices = value["ridx"][()].ravel()
+        indptr = value["cidx"][()].ravel()
+        return csc_matrix((data, indices, indptr), shape=shape)
+
+    msg = 'Cannot read Octave values of type "%s" from an HDF5 file' % type_
+    raise Oct2PyError(msg)
+
+
+def _hdf5_fields(value):
+    """Return the names of the variable groups in a struct group."""
+    return [name for name, item in value.items() if hasattr(item, "keys")]
+
+
+def _read_hdf5_cell(value, path, mmap):
+    """Read the elements of an Octave cell group of an HDF5 file."""
+    # Octave saves the dims (and the matrices) in reverse order.
+    shape = tuple(int(dim) for dim in value["dims"][()].ravel()[::-1])
+    out = np.empty(int(np.prod(shape)), dtype=object)
+    for i in range(out.size):
+        out[i] = _read_hdf5_value(value["_%d" % i], path, mmap)
+    return out.reshape(shape, order="F")
+
+
+def _read_hdf5_dataset(dataset, path, mmap):
+    """Read an Octave matrix dataset, mapping it into memory if possible."""
+    data = None
+    if (
+        mmap
+        and dataset.nbytes >= _HDF5_MMAP_BYTES
+        and dataset.chunks is None
+        and dataset.compression is None
+    ):
+        offset = dataset.id.get_offset()
+        if offset is not None:
+            data = np.memmap(path, dataset.dtype, "c", offset, dataset.shape).view(np.ndarray)
+    if data is None:
+        data = dataset[()]
+    data = np.asarray(data)
+
+    # Complex values are saved as a compound of the real and imaginary parts.
+    fields = data.dtype.fields
+    if fields and "imag" in fields:
+        real = data.dtype["real"]
+        offset = fields["imag"][1]
+        if data.dtype.itemsize == 2 * real.itemsize and offset == real.itemsize:
+            data = data.view(np.dtype("%sc%d" % (real.str[0], 2 * real.itemsize)))
+        else:
+            data = data["real"] + 1j * data["imag"]
+
+    # Octave saves the dims in reverse order, so the transpose is a
+    # column-major view of the data.
+    if data.ndim <= 1:
+        return data.reshape(1, -1)
+    return data.T
+
+
 class Struct(dict):  # type:ignore[type-arg]
     """
     Octave style struct, enhanced.
@@ -177,12 +474,11 @@ class StructArray(np.recarray):
             value = value.squeeze(axis=value.ndim - 1)
         value = np.atleast_1d(value)
 
-        # Extract the values.
-        obj = np.empty(value.size, dtype=value.dtype).view(cls)
-        for i, item in enumerate(value.ravel()):
-            for name in value.dtype.names:
-                obj[i][name] = _extract(item[name], session, keep_matlab_shapes)
-        return obj.reshape(value.shape)
+        # Extract the values a field at a time.
+        obj = np.empty(value.size, dtype=value.dtype)
+        for name in value.dtype.names:
+            obj[name] = _extract_items(value[name].ravel(), session, keep_matlab_shapes)
+        return obj.view(cls).reshape(value.shape)
 
     @property
     def fieldnames(self):
@@ -245,9 +541,7 @@ class Cell(np.ndarray):
         value = np.atleast_2d(np.asarray(value, dtype=object))
 
         # Extract the values.
-        obj = np.empty(value.size, dtype=object).view(cls)
-        for i, item in enumerate(value.ravel()):
-            obj[i] = _extract(item, session, keep_matlab_shapes)
+        obj = _extract_items(value.ravel(), session, keep_matlab_shapes).view(cls)
         obj = obj.reshape(value.shape)
         return obj
 
@@ -275,6 +569,10 @@ def _extract(data, session=None, keep_matlab_shapes=False):  # noqa
     if isinstance(data, list):
         return [_extract(d, session, keep_matlab_shapes) for d in data]
 
+    # Extract sparse matrices.
+    if issparse(data):
+        return _extract_sparse(data)
+
     # Ignore leaf objects.
     if not isinstance(data, np.ndarray):
         return data
@@ -287,6 +585,9 @@ def _extract(data, session=None, keep_matlab_shapes=False):  # noqa
 
     # Extract struct data.
     if data.dtype.names:
+        # Large arrays are sent as a reference to a raw array file.
+        if data.dtype.names == ("oct2py_raw_file",) and data.size == 1:
+            return read_raw(str(data["oct2py_raw_file"].item().item()))
         # Singular struct
         if data.size == 1:
             return _create_struct(data, session, keep_matlab_shapes)
@@ -316,6 +617,68 @@ def _extract(data, session=None, keep_matlab_shapes=False):  # noqa
     return data
 
 
+def _extract_sparse(data):
+    """Return a sparse matrix read from a MAT or HDF5 file as a CSC matrix."""
+    # Octave sparse matrices are double, complex or logical, and `loadmat`
+    # reads logical ones as uint8.
+    dtype = np.bool_ if data.dtype == np.uint8 else None
+    return csc_matrix(data, dtype=dtype)
+
+
+def _extract_items(items, session=None, keep_matlab_shapes=False):
+    """Extract a flat object array of Octave values.
+
+    Items that are all strings, all numeric scalars of one dtype, or all
+    numeric arrays that `_extract` leaves unchanged are converted at once.
+    Other items are extracted one at a time.
+    """
+    out = np.empty(items.size, dtype=object)
+    kind = _items_kind(items, keep_matlab_shapes)
+    if kind == "array":
+        out[:] = items
+    elif kind in ("scalar", "str"):
+        out[:] = np.concatenate(items.tolist(), axis=None).tolist()
+    else:
+        for i, item in enumerate(items):
+            out[i] = _extract(item, session, keep_matlab_shapes)
+    return out
+
+
+def _items_kind(items, keep_matlab_shapes=False):  # noqa: PLR0911
+    """Return the kind of values shared by all the items, or None.
+
+    "str" for single-row strings, "scalar" for numeric scalars of one dtype
+    and "array" for numeric arrays that are returned as they are.  Each
+    check returns as soon as an item rules its kind out.
+    """
+    if not items.size:
+        return None
+    first = items[0]
+    # Subclasses such as MatlabObject and MatlabFunction need `_extract`.
+    if type(first) is not np.ndarray:
+        return None
+    if first.dtype.kind == "U":
+        if all(type(x) is np.ndarray and x.dtype.kind == "U" and x.shape == (1,) for x in items):
+            return "str"
+        return None
+    if first.dtype.kind not in "biufc":
+        return None
+    if first.size == 1 and not keep_matlab_shapes:
+        dtype = first.dtype
+        if all(type(x) is np.ndarray and x.dtype == dtype and x.size == 1 for x in items):
+            return "scalar"
+        return None
+    if all(
+        type(x) is np.ndarray
+        and x.dtype.kind in "biufc"
+        and (x.size != 1 or keep_matlab_shapes)
+        and x.shape not in ((0,), (0, 0))
+        for x in items
+    ):
+        return "array"
+    return None
+
+
 def _create_struct(data, session, keep_matlab_shapes=False):
     """Create a struct from session data."""
     out = Struct()
@@ -362,8 +725,12 @@ def _encode(data, convert_to_float):  # noqa
     if isinstance(data, int):
         return float(data)
 
-    # Handle pandas series and dataframes
-    if isinstance(data, (DataFrame, Series)):
+    # Handle pandas series and dataframes.  Pandas is not imported here,
+    # since the data cannot be a pandas object unless it was imported.
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(data, pandas.DataFrame):
+        return _encode_dataframe(data, ctf)
+    if pandas is not None and isinstance(data, pandas.Series):
         return _encode(data.values, ctf)
 
     # Extract and encode values from dict-like objects.
@@ -383,6 +750,9 @@ def _encode(data, convert_to_float):  # noqa
 
     # Lists can be interpreted as numeric arrays or cell arrays.
     if isinstance(data, list):
+        arr = _simple_numeric_array(data)
+        if arr is not None:
+            return _encode(arr, ctf)
         if _is_simple_numeric(data):
             return _encode(np.array(data), ctf)
         return _encode(tuple(data), ctf)
@@ -390,13 +760,16 @@ def _encode(data, convert_to_float):  # noqa
     # Tuples are handled as cells.
     if isinstance(data, tuple):
         obj = np.empty(len(data), dtype=object)
+        # Strings are sent unchanged, so a cellstr needs no encoding.
+        if set(map(type, data)) <= {str}:
+            obj[:] = data
+            return obj
         for i, item in enumerate(data):
             obj[i] = _encode(item, ctf)
         return obj
 
-    # Sparse data must be floating type.
-    if isinstance(data, spmatrix):
-        return data.astype(np.float64)  # type:ignore[attr-defined]
+    if issparse(data):
+        return _encode_sparse(data)
 
     # Return other data types unchanged.
     if not isinstance(data, np.ndarray):
@@ -425,6 +798,88 @@ def _encode(data, convert_to_float):  # noqa
     return data
 
 
+def _encode_dataframe(data, convert_to_float):
+    """Encode a DataFrame as a struct of column vectors.
+
+    Numeric and logical columns are sent as arrays and other columns as
+    cells, so string columns become cellstrs.  Column names are made into
+    valid Octave field names.
+    """
+    out = {}
+    for name, column in data.items():
+        field = _field_name(name)
+        if field in out:
+            msg = 'Duplicate DataFrame column name "%s"' % field
+            raise Oct2PyError(msg)
+        values = column.to_numpy()
+        if values.dtype.kind in "biufc":
+            values = np.ascontiguousarray(values).reshape(-1, 1)
+            out[field] = _encode(values, convert_to_float)
+        else:
+            values = _encode(tuple(values.tolist()), convert_to_float)
+            out[field] = values.reshape(-1, 1)
+    return out
+
+
+def _field_name(name):
+    """Make a DataFrame column name into a valid Octave field name."""
+    field = re.sub("[^0-9A-Za-z_]", "_", str(name))
+    if not re.match("[A-Za-z]", field):
+        field = "x" + field
+    return field
+
+
+def _encode_sparse(data):
+    """Convert a sparse matrix to a type that Octave supports."""
+    # Octave sparse matrices are double, complex or logical.
+    if data.dtype.kind == "b":
+        return data
+    dtype = np.complex128 if data.dtype.kind == "c" else np.float64
+    return data.astype(dtype, copy=False)
+
+
+def _to_dataframe(value):
+    """Create a DataFrame from a struct of column vectors."""
+    import pandas as pd  # noqa: PLC0415
+
+    if not isinstance(value, dict):
+        msg = "Cannot convert a value of type %s to a DataFrame" % type(value).__name__
+        raise Oct2PyError(msg)
+    columns = {name: np.asarray(column).ravel() for name, column in value.items()}
+    return pd.DataFrame(columns)
+
+
+def _simple_numeric_array(data):
+    """Convert a list of simple numeric data to an array, or return None.
+
+    This gives the same result as `_is_simple_numeric` followed by
+    `np.array`, but lets numpy do the conversion first.  The type of every
+    element is still checked, but with `map` over each innermost list
+    rather than a recursive Python loop.
+    """
+    if data and not isinstance(data[0], (int, float, complex, list)):
+        return None
+    try:
+        arr = np.array(data)
+    except (ValueError, TypeError):
+        return None
+    if arr.dtype.kind not in "biufc":
+        return None
+    # Each level above the numbers must be made of lists, not tuples or
+    # arrays, which are sent as cells.
+    level = [data]
+    for _ in range(arr.ndim - 1):
+        if not all(isinstance(item, list) for row in level for item in row):
+            return None
+        level = [item for row in level for item in row]
+    types: set[type] = set()
+    for row in level:
+        types.update(map(type, row))
+    if all(issubclass(type_, (int, float, complex)) for type_ in types):
+        return arr
+    return None
+
+
 def _is_simple_numeric(data):
     """Test if a list contains simple numeric data."""
     item_len = None
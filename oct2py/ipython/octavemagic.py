@@ -79,7 +79,8 @@ class OctaveMagics(Magics):
 
     def __init__(self, shell):
         super().__init__(shell)
-        self._oct = oct2py.octave
+        # The default session, or a session of its own once `executable` is set.
+        self._oct: oct2py.Oct2Py | oct2py._LazyOct2Py = oct2py.octave
 
         # Allow display to be overridden for
         # testing purposes.
@@ -0,0 +1,203 @@
+"""Memoized Octave functions."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse import issparse
+
+from .utils import _file_mtime, get_log
+
+
+class MemoCache:
+    """A least recently used cache of function results.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The number of results to keep.  The least recently used result is
+        dropped when a new one does not fit.  If None, the cache is not
+        bounded.
+    ttl : float, optional
+        The number of seconds a result is kept for.  If None, results do
+        not expire.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """Return ``(True, result)`` for a cached key, or ``(False, None)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, key, result):
+        """Cache the result for a key."""
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop all of the cached results."""
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    @property
+    def stats(self):
+        """A dict of the hits, misses, invalidations and size of the cache."""
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self):
+        stats = ", ".join(f"{key}={value}" for key, value in self.stats.items())
+        return f"<MemoCache {stats}>"
+
+
+class OctaveMemoizedFunction:
+    """An Octave function whose results are cached by their arguments.
+
+    Created by `Oct2Py.memoize`.  Calls are made through a bound function,
+    and the results of calls with the same arguments are returned from an
+    in-process cache instead of calling Octave.  The cache holds copies of
+    the results and each hit returns a new copy, so changing a result in
+    place does not change the cache.  The cache is dropped when the file
+    that defines the function changes.
+    """
+
+    def __init__(self, bound, path, maxsize=128, ttl=None):
+        """Initialize the memoized function."""
+        self.name = bound.name
+        self.cache = MemoCache(maxsize=maxsize, ttl=ttl)
+        self._bound = bound
+        self._path = path
+        self._mtime = _file_mtime(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, *inputs):
+        """Call the function, or return the cached result for the arguments."""
+        try:
+            key = _hash_args(inputs)
+        except TypeError as e:
+            get_log().debug("Not caching the call to %s: %s", self.name, e)
+            return self._bound(*inputs)
+
+        with self._lock:
+            mtime = _file_mtime(self._path)
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.cache.invalidate()
+
+        found, result = self.cache.get(key)
+        if found:
+            return copy.deepcopy(result)
+        result = self._bound(*inputs)
+        self.cache.set(key, copy.deepcopy(result))
+        return result
+
+    def invalidate(self):
+        """Drop all of the cached results."""
+        self.cache.invalidate()
+
+    @property
+    def stats(self):
+        """A dict of the hits, misses, invalidations and size of the cache."""
+        return self.cache.stats
+
+    def __repr__(self):
+        """A string repr of the memoized function."""
+        return '<memoized Octave function "%s">' % self.name
+
+
+def _hash_args(args):
+    """Return a digest of function arguments.
+
+    Arrays are hashed by their dtype, shape and contents.
+
+    Raises
+    ------
+    TypeError
+        If an argument cannot be hashed by value, such as a pointer to an
+        Octave variable.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    _hash_value(args, digest)
+    return digest.hexdigest()
+
+
+def _hash_value(value, digest):  # noqa: PLR0912
+    """Add a value to a digest, tagged with its type."""
+    # Sparse formats are sent the same way, so they share a tag.
+    digest.update(b"sparse" if issparse(value) else type(value).__name__.encode())
+    if value is None or isinstance(value, (bool, int, float, complex, str)):
+        digest.update(repr(value).encode())
+    elif isinstance(value, bytes):
+        digest.update(str(len(value)).encode())
+        digest.update(value)
+    elif isinstance(value, np.generic):
+        digest.update(value.dtype.str.encode())
+        digest.update(value.tobytes())
+    elif isinstance(value, np.ndarray):
+        if value.dtype.kind == "O" or value.dtype.names:
+            digest.update(repr(value.shape).encode())
+            for item in value.ravel():
+                _hash_value(item, digest)
+        else:
+            digest.update(("%s%s" % (value.dtype.str, value.shape)).encode())
+            digest.update(np.ascontiguousarray(value).data)
+    elif issparse(value):
+        _hash_sparse(value, digest)
+    elif isinstance(value, (list, tuple, set)):
+        items = sorted(value, key=repr) if isinstance(value, set) else value
+        digest.update(str(len(items)).encode())
+        for item in items:
+            _hash_value(item, digest)
+    elif isinstance(value, dict):
+        digest.update(str(len(value)).encode())
+        for key in sorted(value, key=str):
+            _hash_value(key, digest)
+            _hash_value(value[key], digest)
+    else:
+        msg = "Cannot hash arguments of type %s" % type(value).__name__
+        raise TypeError(msg)
+
+
+def _hash_sparse(value, digest):
+    """Add the CSC parts of a sparse matrix to a digest."""
+    value = value.tocsc()
+    digest.update(repr(value.shape).encode())
+    for part in (value.indptr, value.indices, value.data):
+        _hash_value(part, digest)
@@ -0,0 +1,206 @@
+"""A pool of Octave sessions."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from metakernel.pexpect import EOF
+
+from .core import Oct2Py
+from .utils import Oct2PyError, get_log
+
+
+class Oct2PyPool(Executor):
+    """A `concurrent.futures.Executor` that runs calls on several sessions.
+
+    Each session has a worker thread, and each call goes to the next idle
+    session.  A session whose Octave process has died is restarted before
+    it takes its next call.  A call whose Octave process dies while it runs
+    fails with an `Oct2PyError`, and its session is restarted.  The call is
+    not run again, since it may already have had side effects.
+
+    Parameters
+    ----------
+    n : int, optional
+        The number of sessions.  Defaults to the number of CPUs.
+    settings : Oct2PySettings, optional
+        The settings of the sessions.
+    **kwargs
+        Other arguments for `Oct2Py`.
+
+    Examples
+    --------
+    >>> from oct2py import Oct2PyPool
+    >>> with Oct2PyPool(2) as pool:  # doctest: +SKIP
+    ...     list(pool.map("plus", range(4), range(4)))
+    [0.0, 2.0, 4.0, 6.0]
+    """
+
+    def __init__(self, n=None, settings=None, **kwargs):
+        n = n or os.cpu_count() or 1
+        self.logger = get_log()
+        self._tasks: queue.SimpleQueue = queue.SimpleQueue()  # type:ignore[type-arg]
+        self._shutdown = False
+        self._shutdown_lock = threading.Lock()
+
+        # Start the sessions in parallel, since each takes a while.
+        with ThreadPoolExecutor(n) as executor:
+            futures = [executor.submit(Oct2Py, settings=settings, **kwargs) for _ in range(n)]
+        errors = [error for future in futures if (error := future.exception()) is not None]
+        self.sessions = [future.result() for future in futures if future.exception() is None]
+        if errors:
+            for session in self.sessions:
+                session.exit()
+            raise errors[0]
+
+        self._threads = []
+        for session in self.sessions:
+            thread = threading.Thread(target=self._work, args=(session,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn, /, *args, **kwargs):
+        """Schedule a call on the next idle session.
+
+        Parameters
+        ----------
+        fn : str or callable
+            The name of an Octave function (or path to an m-file), which is
+            called with `Oct2Py.feval`, or a Python callable, which is
+            called with the session as its first argument.
+        *args
+            Arguments for the call.
+        **kwargs
+            Keyword arguments for the call.
+
+        Returns
+        -------
+        Future
+            The future result of the call.
+        """
+        with self._shutdown_lock:
+            if self._shutdown:
+                msg = "cannot schedule new calls after shutdown"
+                raise RuntimeError(msg)
+            future: Future = Future()  # type:ignore[type-arg]
+            self._tasks.put((future, fn, args, kwargs))
+            return future
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        """Call a function on the items of iterables across the sessions.
+
+        Parameters
+        ----------
+        fn : str or callable
+            The function, as for :meth:`submit`.
+        *iterables
+            Iterables of arguments, as for the builtin `map`.
+        timeout : float, optional
+            The most seconds to wait for each result.
+        chunksize : int, optional
+            The number of calls to send to a session at once.  For Octave
+            functions each chunk runs in a single round trip.
+
+        Returns
+        -------
+        iterator
+            The results, in order.
+        """
+        if chunksize <= 1:
+            return super().map(fn, *iterables, timeout=timeout)
+        chunks = _chunks(zip(*iterables, strict=False), chunksize)
+        results = super().map(_run_chunk, itertools.repeat(fn), chunks, timeout=timeout)
+        return itertools.chain.from_iterable(results)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """Stop the workers and close the sessions.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If True, wait for the pending calls to finish.
+        cancel_futures : bool, optional
+            If True, cancel the calls that have not started.
+        """
+        with self._shutdown_lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        future, *_ = self._tasks.get_nowait()
+                    except queue.Empty:
+                        break
+                    future.cancel()
+            for _ in self._threads:
+                self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self, session):
+        """Run the calls for one session until shutdown."""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = self._call(session, fn, args, kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        session.exit()
+
+    def _call(self, session, fn, args, kwargs):
+        """Run a call, restarting the session if Octave dies during it."""
+        self._revive(session)
+        try:
+            return _run_call(session, fn, args, kwargs)
+        except (Oct2PyError, EOF) as e:
+            # A callable that uses the engine directly can leave a dead
+            # session behind, so restart it before failing the call.
+            self._revive(session)
+            if isinstance(e, EOF):
+                msg = "Session died, restarting"
+                raise Oct2PyError(msg) from None
+            raise
+
+    def _revive(self, session):
+        """Restart a session whose Octave process has died."""
+        engine = session._engine
+        if engine is not None and engine.repl.child.isalive():
+            return
+        self.logger.warning("Restarting a dead Octave session")
+        session.restart()
+
+
+def _chunks(items, chunksize):
+    """Yield lists of up to chunksize items."""
+    items = iter(items)
+    while chunk := list(itertools.islice(items, chunksize)):
+        yield chunk
+
+
+def _run_call(session, fn, args, kwargs):
+    """Run a call for `Oct2PyPool.submit` on a session."""
+    if isinstance(fn, str):
+        return session.feval(fn, *args, **kwargs)
+    return fn(session, *args, **kwargs)
+
+
+def _run_chunk(session, fn, chunk):
+    """Run a chunk of calls for `Oct2PyPool.map` on a session."""
+    if not isinstance(fn, str):
+        return [fn(session, *args) for args in chunk]
+    with session.batch() as batch:
+        futures = [batch.feval(fn, *args) for args in chunk]
+    return [future.result() for future in futures]
@@ -0,0 +1,78 @@
+"""A cache of what names resolve to in an Octave session."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import threading
+
+
+class ResolutionCache:
+    """Cached answers to what a name is in an Octave session.
+
+    Each entry holds the `exist` code of a name and whether it is an
+    object.  The session drops entries when it runs calls that can change
+    the namespace, such as `cd`, `addpath`, `run`, `clear` and `push`, and
+    the names used by code passed to `eval`.  Call :meth:`invalidate` after
+    changing the namespace in other ways, such as writing m-files or calling
+    a function that changes the path or assigns variables.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, name):
+        """Return the cached ``(exist, isobject)`` of a name, or None."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return entry
+
+    def set(self, name, exist, isobject):
+        """Cache the resolution of a name."""
+        with self._lock:
+            self._entries[name] = (exist, isobject)
+
+    def invalidate(self, names=None):
+        """Drop the cached resolutions.
+
+        Parameters
+        ----------
+        names : str or list, optional
+            The names to drop.  By default, all of the names are dropped.
+        """
+        with self._lock:
+            self._invalidations += 1
+            if names is None:
+                self._entries.clear()
+                return
+            if isinstance(names, str):
+                names = [names]
+            for name in names:
+                self._entries.pop(name, None)
+
+    @property
+    def stats(self):
+        """A dict of the hits, misses, invalidations and size of the cache."""
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        stats = ", ".join(f"{key}={value}" for key, value in self.stats.items())
+        return f"<ResolutionCache {stats}>"
@@ -0,0 +1,144 @@
+"""A request server loop running inside Octave."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import contextlib
+import os
+import os.path as osp
+import select
+import time
+
+from metakernel.pexpect import EOF, TIMEOUT
+
+
+class RequestServer:
+    """Run `_pyeval` requests through a loop that Octave keeps running.
+
+    Normally each request is sent to Octave as a line of text on the
+    pty, and the response is found by matching the prompt.  The server
+    instead leaves Octave in `_pyserve`, which blocks on a named pipe for
+    requests and answers on another when each is done.  The pty is still
+    used for the output of the requests and for interrupts.
+
+    The server is started on the first request.  Anything else that needs
+    the Octave prompt must call :meth:`stop` first.
+
+    Parameters
+    ----------
+    engine : OctaveEngine
+        The engine of the session.
+    temp_dir : str
+        The directory to create the named pipes in.
+    """
+
+    def __init__(self, engine, temp_dir):
+        self.engine = engine
+        self.running = False
+        self._request_path = osp.join(temp_dir, "request.fifo")
+        self._response_path = osp.join(temp_dir, "response.fifo")
+        # The pipe file descriptors, or -1 until the pipes are opened.
+        self._request_fd = -1
+        self._response_fd = -1
+        self._response = ""
+
+    def start(self, timeout=None):
+        """Start the loop in Octave and wait until it is ready."""
+        if self.running:
+            return
+        if self._request_fd < 0:
+            for path in (self._request_path, self._response_path):
+                if not osp.exists(path):
+                    os.mkfifo(path)
+            # Open both ends read/write so that neither open blocks waiting
+            # for Octave, and Octave's opens do not block waiting for us.
+            self._request_fd = os.open(self._request_path, os.O_RDWR)
+            self._response_fd = os.open(self._response_path, os.O_RDWR)
+        self._response = ""
+
+        request_path = self._request_path.replace(osp.sep, "/")
+        response_path = self._response_path.replace(osp.sep, "/")
+        self.engine.repl.sendline(f'_pyserve("{request_path}", "{response_path}");')
+        self.running = True
+        self._wait("ready", timeout, None)
+
+    def stop(self, timeout=None):
+        """Leave the loop and wait for the Octave prompt."""
+        if not self.running:
+            return
+        self.running = False
+        os.write(self._request_fd, b"quit\n")
+        repl = self.engine.repl
+        repl.child.expect(repl.prompt_regex, timeout=timeout or -1)
+
+    def close(self):
+        """Close and remove the named pipes."""
+        self.running = False
+        for fd in (self._request_fd, self._response_fd):
+            if fd >= 0:
+                with contextlib.suppress(OSError):
+                    os.close(fd)
+        self._request_fd = self._response_fd = -1
+        for path in (self._request_path, self._response_path):
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+    def eval(self, input_file, output_file, timeout=None, stream_handler=None):
+        """Run `_pyeval` on the given files.
+
+        Output of the request is passed to the stream handler line by
+        line.  Raises TIMEOUT if the request does not finish in time and
+        EOF if Octave exits, like `OctaveEngine.eval`.  In both cases, and
+        if interrupted, the server is no longer running.
+        """
+        self.start(timeout)
+        os.write(self._request_fd, f"{input_file}\t{output_file}\n".encode())
+        self._wait("done", timeout, stream_handler)
+
+    def _wait(self, answer, timeout, stream_handler):
+        """Wait for an answer from the loop, streaming the pty output."""
+        child = self.engine.repl.child
+        deadline = None if timeout is None else time.monotonic() + timeout
+        partial = ""
+        try:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    msg = "Timed out"
+                    raise TIMEOUT(msg)
+                ready, _, _ = select.select([self._response_fd, child.child_fd], [], [], remaining)
+                if child.child_fd in ready:
+                    text = partial + child.read_nonblocking(65536, 0)
+                    partial = self._stream(text, stream_handler)
+                if self._response_fd in ready:
+                    self._response += os.read(self._response_fd, 1024).decode()
+                if "\n" in self._response:
+                    break
+        except (TIMEOUT, EOF, KeyboardInterrupt):
+            self.running = False
+            raise
+
+        line, _, self._response = self._response.partition("\n")
+        if line != answer:  # pragma: no cover
+            self.running = False
+            msg = f"Unexpected answer from the request server: {line!r}"
+            raise EOF(msg)
+
+        # The loop flushes stdout before answering, so the rest of the
+        # output is already waiting on the pty.
+        with contextlib.suppress(TIMEOUT):
+            while True:
+                text = partial + child.read_nonblocking(65536, 0)
+                partial = self._stream(text, stream_handler)
+        if partial and stream_handler:
+            stream_handler(partial)
+
+    def _stream(self, text, stream_handler):
+        """Pass the complete lines of the text to the stream handler.
+
+        Returns the trailing partial line.
+        """
+        *lines, partial = text.replace("\r\n", "\n").split("\n")
+        if stream_handler:
+            for line in lines:
+                stream_handler(line)
+        return partial
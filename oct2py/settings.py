@@ -2,6 +2,8 @@
 # Copyright (c) oct2py developers.
 # Distributed under the terms of the MIT License.
 
+from typing import Literal
+
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -61,6 +63,42 @@ class Oct2PySettings(BaseSettings):
         on session exit.  Has no effect on Linux (where ``/dev/shm`` is used
         automatically) or on Windows.  Defaults to ``0`` (disabled).
         Can also be set via the ``OCT2PY_RAMDISK_SIZE_MB`` environment variable.
+    raw_threshold_bytes : int
+        When set to a positive integer, dense numeric and logical arrays of
+        at least this many bytes are exchanged with Octave as raw binary
+        files instead of through the MAT file.  Arrays returned this way,
+        including inside cells and structs, are memory-mapped rather than
+        copied.  Defaults to ``0`` (disabled).
+    transfer_format : {"v6", "hdf5"}
+        The file format of responses from Octave.  ``"v6"`` (default) always
+        uses MAT v6 files, which cannot hold variables over 2 GB.
+        ``"hdf5"`` saves responses of at least ``hdf5_threshold_bytes`` in
+        Octave's HDF5 format, which is read with ``h5py`` and memory-mapped
+        where possible.  Smaller responses still use MAT v6 files.
+    hdf5_threshold_bytes : int
+        The size of the response at which ``transfer_format="hdf5"``
+        switches to HDF5 (default 64 MiB).
+    request_server : bool
+        If True, Octave runs a loop that waits for requests on a named pipe
+        instead of each call being typed at the Octave prompt, which lowers
+        the fixed cost of small calls.  Calls that read from stdin (such as
+        ``input`` or ``keyboard``) are not supported in this mode.  Not
+        available on Windows.  Defaults to False.
+    spare_engines : int
+        When set to a positive integer, this many Octave processes with the
+        same executable and options are kept started in the background, so
+        that new sessions and restarts can adopt one instead of waiting for
+        Octave to start.  Defaults to ``0`` (disabled).
+    doc_cache_dir : str, optional
+        The directory where the documentation of Octave functions is
+        cached between processes.  Defaults to an ``oct2py/docs``
+        directory in the user cache directory.  Set to an empty string to
+        disable the cache.
+    headless : bool
+        If True, calls skip the plot settings and the figure queries that
+        run after each call, for sessions that never plot.  Graphics are
+        used again once a call passes ``plot_dir`` or ``plot_backend``.
+        Defaults to False.
 
     Examples
     --------
@@ -100,3 +138,10 @@ class Oct2PySettings(BaseSettings):
     extra_cli_options: str = ""
     load_octaverc: bool = True
     ramdisk_size_mb: int = 0
+    raw_threshold_bytes: int = 0
+    transfer_format: Literal["v6", "hdf5"] = "v6"
+    hdf5_threshold_bytes: int = 64 * 1024 * 1024
+    request_server: bool = False
+    spare_engines: int = 0
+    doc_cache_dir: str | None = None
+    headless: bool = False
@@ -0,0 +1,104 @@
+"""Standby Octave engines for fast session start."""
+# Copyright (c) oct2py developers.
+# Distributed under the terms of the MIT License.
+
+import atexit
+import collections
+import contextlib
+import threading
+
+from .utils import get_log
+
+
+class SpareEngines:
+    """Started Octave engines kept ready for new and restarted sessions.
+
+    Engines are grouped by a key of the options they were started with,
+    and are refilled by background threads as sessions take them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines = collections.defaultdict(list)
+        self._pending: collections.Counter[tuple[object, ...]] = collections.Counter()
+        # Maps requested executables (such as "") to the resolved ones.
+        self._aliases = {}
+
+    def take(self, key):
+        """Return a live spare engine for the key, or None."""
+        key = self._resolve(key)
+        with self._lock:
+            engines = self._engines[key]
+            while engines:
+                engine = engines.pop(0)
+                if engine.repl.child.isalive():
+                    return engine
+                _terminate(engine)
+        return None
+
+    def fill(self, key, count, factory):
+        """Start engines in the background until the key has `count` spares.
+
+        `factory` is called with no arguments in a new thread and returns a
+        started engine.  The requested executable in the key is mapped to
+        the one the engine resolved.
+        """
+        resolved = self._resolve(key)
+        with self._lock:
+            missing = count - len(self._engines[resolved]) - self._pending[resolved]
+            if missing <= 0:
+                return
+            self._pending[resolved] += missing
+        for _ in range(missing):
+            thread = threading.Thread(target=self._start, args=(key, resolved, factory))
+            thread.daemon = True
+            thread.start()
+
+    def alias(self, key, executable):
+        """Record the executable that a key's requested executable resolves to."""
+        if key[0] != executable:
+            with self._lock:
+                self._aliases[key[0]] = executable
+
+    def clear(self):
+        """Terminate all of the spare engines."""
+        with self._lock:
+            engines = [engine for group in self._engines.values() for engine in group]
+            self._engines.clear()
+        for engine in engines:
+            _terminate(engine)
+
+    def forget(self):
+        """Drop the spare engines inherited by a forked child process."""
+        for group in self._engines.values():
+            for engine in group:
+                with contextlib.suppress(Exception):
+                    atexit.unregister(engine._cleanup)
+                with contextlib.suppress(Exception):
+                    engine.repl.terminated = True
+        self._lock = threading.Lock()
+        self._engines.clear()
+        self._pending.clear()
+
+    def _resolve(self, key):
+        """Return the key with its executable resolved, where known."""
+        executable = self._aliases.get(key[0], key[0])
+        return (executable, *key[1:])
+
+    def _start(self, key, resolved, factory):
+        """Start an engine and add it to the spares."""
+        try:
+            engine = factory()
+        except Exception as e:
+            get_log().debug("Could not start a spare Octave engine: %s", e)
+            engine = None
+        with self._lock:
+            self._pending[resolved] -= 1
+            if engine is not None:
+                self._engines[self._resolve(key)].append(engine)
+
+
+def _terminate(engine):
+    """Terminate an engine, ignoring errors."""
+    with contextlib.suppress(Exception):
+        engine.repl.terminate()
@@ -7,7 +7,7 @@ import timeit
 
 import numpy as np
 
-from . import Oct2Py, get_log
+from .utils import get_log
 
 
 class SpeedCheck:
@@ -20,6 +20,8 @@ class SpeedCheck:
 
     def __init__(self):
         # Create our Octave instance and initialize the data array
+        from .core import Oct2Py  # noqa:PLC0415
+
         self.octave = Oct2Py()
         self.array = []
 
@@ -5,7 +5,7 @@
 import datetime
 import threading
 
-from . import Oct2Py, Oct2PyError, get_log
+from .utils import Oct2PyError, get_log
 
 
 class ThreadClass(threading.Thread):
@@ -21,6 +21,8 @@ class ThreadClass(threading.Thread):
             If the thread does not successfully demonstrate independence
 
         """
+        from .core import Oct2Py  # noqa:PLC0415
+
         octave = Oct2Py()
         # write the same variable name in each thread and read it back
         octave.push("name", self.name)
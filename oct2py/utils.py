@@ -41,6 +41,14 @@ def get_log(name=None):
     return logging.getLogger(name)
 
 
+def _file_mtime(path):
+    """Return the modification time of a file, or None if it is not a file."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, ValueError):
+        return None
+
+
 def _create_macos_ramdisk(size_mb: int) -> tuple[str, str] | tuple[None, None]:
     """Create a RAM disk on macOS via hdiutil/diskutil.
 
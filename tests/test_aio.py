@@ -0,0 +1,250 @@
+"""Tests for the asyncio interface."""
+
+import asyncio
+import os
+import select
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from metakernel.pexpect import EOF, TIMEOUT
+
+from oct2py import AsyncOct2Py, Oct2PyError
+
+
+class FakeChild:
+    """A stand-in for the Octave pty, written to through a pipe."""
+
+    def __init__(self):
+        self.child_fd, self.write_fd = os.pipe()
+        self.buffer = ""
+
+    def read_nonblocking(self, size, timeout):
+        if not select.select([self.child_fd], [], [], timeout)[0]:
+            raise TIMEOUT("Timed out")
+        data = os.read(self.child_fd, size)
+        if not data:
+            raise EOF("End of file")
+        return data.decode()
+
+    def write(self, text):
+        os.write(self.write_fd, text.encode())
+
+    def close(self):
+        os.close(self.child_fd)
+        os.close(self.write_fd)
+
+
+class TestAsyncWait:
+    """Tests for waiting on the Octave pty without Octave."""
+
+    def _make_session(self):
+        session = MagicMock()
+        session._settings.timeout = None
+        session._write_request.return_value = ("writer.mat", "reader.mat")
+        engine = session._engine
+        engine.repl.child = FakeChild()
+        engine.repl.prompt_regex = "PROMPT>"
+        engine.repl.stdin_prompt_regex = "STDIN>"
+        engine.repl.interrupt.return_value = ""
+        engine.stdin_handler = None
+        return session
+
+    def test_wait_streams_lines_until_prompt(self):
+        """Complete lines are streamed as they arrive, up to the prompt."""
+        session = self._make_session()
+        child = session._engine.repl.child
+        oc = AsyncOct2Py(session=session)
+        lines = []
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.01, child.write, "line 1\r\nline ")
+            loop.call_later(0.02, child.write, "2\r\nPROMPT>")
+            await oc._wait(session._engine, lines.append)
+
+        asyncio.run(run())
+        assert lines == ["line 1", "line 2"]
+        child.close()
+
+    def test_wait_uses_buffered_output(self):
+        """Output that pexpect already read is streamed before waiting."""
+        session = self._make_session()
+        child = session._engine.repl.child
+        child.buffer = "early\r\nPROMPT>"
+        oc = AsyncOct2Py(session=session)
+        lines = []
+        asyncio.run(oc._wait(session._engine, lines.append))
+        assert lines == ["early"]
+        assert child.buffer == ""
+        child.close()
+
+    def test_wait_streams_output_before_eof(self):
+        """The output written before Octave exits is not lost."""
+        session = self._make_session()
+        child = session._engine.repl.child
+        oc = AsyncOct2Py(session=session)
+        lines = []
+        child.write("line 1\nfatal")
+        os.close(child.write_fd)
+        with pytest.raises(EOF):
+            asyncio.run(oc._wait(session._engine, lines.append))
+        assert lines == ["line 1", "fatal"]
+        os.close(child.child_fd)
+
+    def test_stdin_handler_runs_off_the_loop(self):
+        """The stdin handler does not block the event loop thread."""
+        session = self._make_session()
+        engine = session._engine
+        child = engine.repl.child
+        threads = []
+
+        def stdin_handler(prompt):
+            threads.append(threading.get_ident())
+            child.write("PROMPT>")
+            return "42"
+
+        engine.stdin_handler = stdin_handler
+        oc = AsyncOct2Py(session=session)
+        child.write("STDIN>")
+        asyncio.run(oc._wait(engine, lambda line: None))
+        assert threads and threads[0] != threading.get_ident()
+        engine.repl.sendline.assert_called_once_with("42")
+        child.close()
+
+    def test_timeout_interrupts(self):
+        """A call that times out interrupts Octave and raises."""
+        session = self._make_session()
+        oc = AsyncOct2Py(session=session)
+        with pytest.raises(Oct2PyError, match="Timed out"):
+            asyncio.run(oc._send_request({}, timeout=0.05))
+        session._engine.repl.interrupt.assert_called_once()
+        session._engine.repl.child.close()
+
+    def test_cancel_interrupts(self):
+        """Cancelling a call interrupts Octave."""
+        session = self._make_session()
+        oc = AsyncOct2Py(session=session)
+
+        async def run():
+            task = asyncio.ensure_future(oc._send_request({}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+        session._engine.repl.interrupt.assert_called_once()
+        session._engine.repl.child.close()
+
+    def test_lookups_are_requests(self):
+        """Name and nargout lookups are queued requests, not blocking calls."""
+        session = self._make_session()
+        session._cached_max_nout.return_value = (None, ("f", ""))
+        session._cache_max_nout.side_effect = lambda func_path, path, nout: int(nout)
+        session._split_func_path.side_effect = lambda func_path: (func_path, "")
+        session._make_request.side_effect = lambda name, args, **kwargs: dict(
+            func_name=name, func_args=args
+        )
+        session.resolution_cache.get.return_value = None
+        session._user_classes = {}
+        session._pull_outputs.side_effect = lambda *args: args[-1]["f"]
+        outputs = {
+            "_pypull": ([], np.array([2.0])),
+            "_pyresolve": (2.0, False),
+            "_pynargout": ("/f.m", 2.0),
+            "f": (1.0, 2.0),
+        }
+        sent = []
+
+        async def send_request(req, *args):
+            sent.append(req["func_name"])
+            await asyncio.sleep(0.01)
+            result = np.empty(2, dtype=object)
+            result[0], result[1] = outputs[req["func_name"]]
+            return dict(err=None, result=result)
+
+        oc = AsyncOct2Py(session=session)
+        oc._send_request = send_request  # type:ignore[method-assign]
+
+        async def run():
+            return await asyncio.gather(oc.pull("f"), oc.feval("f", nout="max_nout"))
+
+        pointer, result = asyncio.run(run())
+        assert pointer is session._make_pointer.return_value
+        session._make_pointer.assert_called_once_with("f", 2, False)
+        assert result == [1.0, 2.0]
+        assert sorted(sent) == ["_pynargout", "_pypull", "_pyresolve", "f"]
+        session._feval.assert_not_called()
+        session.get_pointer.assert_not_called()
+        session._engine.repl.child.close()
+
+
+class TestAsyncOctave:
+    """Exercise AsyncOct2Py against Octave."""
+
+    oc: AsyncOct2Py
+
+    @classmethod
+    def setup_class(cls):
+        cls.oc = AsyncOct2Py()
+
+    @classmethod
+    def teardown_class(cls):
+        cls.oc.exit()
+
+    def test_calls(self):
+        """feval, eval, push and pull work as coroutines."""
+
+        async def run():
+            await self.oc.push(["a", "b"], [1, np.ones((2, 2))])
+            a, b = await self.oc.pull(["a", "b"])
+            ones = await self.oc.feval("ones", 3)
+            total = await self.oc.eval("a + sum(b(:))", nout=1)
+            return a, b, ones, total
+
+        a, b, ones, total = asyncio.run(run())
+        assert a == 1
+        assert np.array_equal(b, np.ones((2, 2)))
+        assert ones.shape == (3, 3)
+        assert total == 5
+
+    def test_concurrent_calls_are_queued(self):
+        """Concurrent calls on one instance run one after another."""
+
+        async def run():
+            return await asyncio.gather(*(self.oc.feval("plus", i, 1) for i in range(5)))
+
+        assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+
+    def test_lookups_next_to_other_calls(self):
+        """Pulling a function and asking for its nout queue behind other calls."""
+
+        async def run():
+            return await asyncio.gather(
+                self.oc.eval("pause(0.2)"),
+                self.oc.pull("ones"),
+                self.oc.feval("ones", 2, nout="max_nout"),
+                self.oc.feval("plus", 1, 1),
+            )
+
+        _, ones, arr, total = asyncio.run(run())
+        assert ones.address == "@ones"
+        assert arr.shape == (2, 2)
+        assert total == 2
+
+    def test_errors_and_timeouts(self):
+        """Octave errors raise, and timed out calls leave a working session."""
+        lines = []
+
+        async def run():
+            with pytest.raises(Oct2PyError):
+                await self.oc.feval("error", "spam")
+            with pytest.raises(Oct2PyError, match="Timed out"):
+                await self.oc.eval("pause(10)", timeout=0.5)
+            await self.oc.eval("disp(42)", stream_handler=lines.append)
+            return await self.oc.feval("ones", 1)
+
+        assert asyncio.run(run()) == 1
+        assert lines == ["42"]
@@ -8,7 +8,7 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import pytest
 
-from oct2py import Oct2Py
+from oct2py import Oct2Py, Oct2PyError
 from oct2py.dynamic import (
     OctaveUserClassAttr,
     _make_variable_ptr_instance,
@@ -130,6 +130,90 @@ class TestEncodeOctaveVariablePtr:
         assert result == pytest.approx(42.0)
 
 
+# ---------------------------------------------------------------------------
+# OctaveVariablePtr indexing, fields and selection
+# ---------------------------------------------------------------------------
+
+
+class TestOctaveVariablePtrSubscripts:
+    def test_getitem_encodes_subscripts(self):
+        """Subscripts are encoded for _pyindex and sent with the pointer."""
+        session = MagicMock()
+        ptr = _make_variable_ptr_instance(session, "x")
+        ptr[1:5, :, ..., [0, -1], np.array([True, False]), 3]
+        name, target, subs = session.feval.call_args.args
+        assert (name, target) == ("_pyindex", ptr)
+        assert subs[0]["start"] == 1.0
+        assert subs[0]["stop"] == 5.0
+        assert np.isnan(subs[0]["step"])
+        assert subs[1:3] == (":", "...")
+        assert subs[3].tolist() == [0.0, -1.0]
+        assert subs[4].dtype == np.bool_
+        assert subs[5] == 3.0
+
+    def test_getitem_invalid_subscript_raises(self):
+        """Subscripts that are not integers, slices or masks are rejected."""
+        ptr = _make_variable_ptr_instance(MagicMock(), "x")
+        with pytest.raises(TypeError):
+            ptr[1.5]
+        with pytest.raises(TypeError):
+            ptr["a"]
+
+    def test_field_and_select(self):
+        """field and select call getfield and _pyselect on the pointer."""
+        session = MagicMock()
+        ptr = _make_variable_ptr_instance(session, "s")
+        ptr.field("a.b")
+        session.feval.assert_called_with("getfield", ptr, "a", "b")
+        ptr.select("a")
+        session.feval.assert_called_with("_pyselect", ptr, ("a",))
+
+
+class TestOctaveVariablePtrSubscriptsOctave:
+    oc: Oct2Py
+
+    @classmethod
+    def setup_class(cls):
+        cls.oc = Oct2Py()
+
+    @classmethod
+    def teardown_class(cls):
+        cls.oc.exit()
+
+    def test_getitem_matches_numpy(self):
+        """Slices are resolved in Octave as numpy would resolve them."""
+        arr = np.arange(60.0).reshape(3, 4, 5)
+        self.oc.push("_idx_var", arr)
+        ptr = self.oc.get_pointer("_idx_var")
+        for key in [
+            (slice(1, 3), slice(None), slice(None)),
+            (slice(None, None, -1), slice(-3, None), slice(0, 100, 2)),
+            (slice(1, 2), Ellipsis, slice(4, 0, -2)),
+            (slice(10, 20),),
+        ]:
+            expected = arr[key]
+            assert np.array_equal(np.asarray(ptr[key]).reshape(expected.shape), expected)
+        assert np.ravel(ptr[0, 1, [0, -1]]).tolist() == [arr[0, 1, 0], arr[0, 1, -1]]
+        assert np.ravel(ptr[0, 0, arr[0, 0] > 2]).tolist() == [3.0, 4.0]
+
+        self.oc.push("_idx_vec", np.arange(10.0))
+        vec = self.oc.get_pointer("_idx_vec")
+        assert vec[2:5].tolist() == [[2.0, 3.0, 4.0]]
+        assert vec[-1] == 9.0
+
+    def test_field_and_select(self):
+        """Only the requested fields of a struct are returned."""
+        self.oc.eval("_idx_s.a = 1; _idx_s.b.c = 'spam'; _idx_s.d = ones(10);")
+        ptr = self.oc.get_pointer("_idx_s")
+        assert ptr.field("a") == 1.0
+        assert ptr.field("b.c") == "spam"
+        selected = ptr.select(["d", "a"])
+        assert list(selected) == ["d", "a"]
+        assert selected["a"] == 1.0
+        with pytest.raises(Oct2PyError):
+            ptr.select(["a", "missing"])
+
+
 # ---------------------------------------------------------------------------
 # _reset_instances_after_fork — all branches
 # ---------------------------------------------------------------------------
@@ -13,6 +13,7 @@ from io import StringIO
 import numpy as np
 import pandas as pd
 import pytest
+import scipy.sparse
 from flaky import flaky
 
 import oct2py
@@ -475,7 +476,21 @@ class TestMisc:
         data = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
         df = pd.DataFrame(data, columns=["a", "b", "c"])
         self.oc.push("y", df)
-        assert np.allclose(data, self.oc.pull("y"))
+        y = self.oc.pull("y")
+        assert list(y) == ["a", "b", "c"]
+        assert np.allclose(data[:, 0:1], y.a)
+        assert np.allclose(data, self.oc.pull("y", as_dataframe=True).to_numpy())
+
+    def test_panda_dataframe_mixed_columns(self):
+        df = pd.DataFrame({"x": [1.5, 2.5], "name": ["a", "bc"], "ok": [True, False], 3: [1, 2]})
+        self.oc.push("df", df)
+        assert self.oc.eval("class(df.name)") == "cell"
+        assert self.oc.eval("size(df.x)").tolist() == [[2.0, 1.0]]
+        out = self.oc.pull("df", as_dataframe=True)
+        assert list(out.columns) == ["x", "name", "ok", "x3"]
+        assert out["name"].tolist() == ["a", "bc"]
+        assert out["x"].dtype == np.float64
+        assert out["ok"].astype(bool).tolist() == [True, False]
 
     def test_using_exited_session(self):
         with Oct2Py() as oc:
@@ -959,6 +974,189 @@ def test_write_file_handle_overwrites_on_second_call(tmp_path):
     assert result["x"].ravel().tolist() == [99.0, 100.0]
 
 
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.arange(12.0).reshape(3, 4),
+        np.asfortranarray(np.arange(24.0).reshape(2, 3, 4)),
+        np.arange(6, dtype=np.int16).reshape(2, 3)[:, ::2],
+        np.array([[1 + 2j, 3 - 4j]], dtype=np.complex64),
+        np.array([[True, False], [False, True]]),
+        np.arange(4.0).astype(">f8").reshape(2, 2),
+    ],
+)
+def test_raw_round_trip(tmp_path, arr):
+    """read_raw returns the array written by write_raw and removes the file."""
+    from oct2py.io import read_raw, write_raw
+
+    path = str(tmp_path / "arr.bin")
+    write_raw(arr, path)
+    out = read_raw(path)
+    assert not os.path.exists(path)
+    assert out.dtype == arr.dtype.newbyteorder("=")
+    assert out.shape == arr.shape
+    assert np.array_equal(out, arr)
+    out[...] = 0  # the copy-on-write view is writable
+
+
+@pytest.mark.parametrize(
+    "mat",
+    [
+        scipy.sparse.random_array((30, 20), density=0.2, format="csr", rng=0),
+        scipy.sparse.random_array((5, 8), density=0.5, rng=1).tocsc() * (1 + 2j),
+        scipy.sparse.csc_matrix(np.eye(4, dtype=bool)),
+        scipy.sparse.csr_array(np.arange(6, dtype=np.int16).reshape(2, 3)),
+        scipy.sparse.csc_array((3, 0)),
+    ],
+)
+def test_raw_sparse_round_trip(tmp_path, mat):
+    """read_raw returns the CSC values of a sparse matrix written by write_raw_sparse."""
+    from oct2py.io import read_raw, write_raw_sparse
+
+    path = str(tmp_path / "sparse.bin")
+    write_raw_sparse(mat, path)
+    out = read_raw(path)
+    assert not os.path.exists(path)
+    assert isinstance(out, scipy.sparse.csc_matrix)
+    assert out.dtype == (mat.dtype if mat.dtype.kind in "bc" else np.float64)
+    assert out.shape == mat.shape
+    assert np.array_equal(out.toarray(), mat.toarray())
+
+
+def test_encode_sparse():
+    """Sparse values keep logical and complex types and are not copied if double."""
+    from oct2py.io import _encode
+
+    mat = scipy.sparse.random_array((5, 5), density=0.5, format="csr", rng=0)
+    assert _encode(mat, convert_to_float=True) is mat
+    logical = scipy.sparse.csc_matrix(np.eye(3, dtype=bool))
+    assert _encode(logical, convert_to_float=True).dtype == np.bool_
+    ints = scipy.sparse.coo_array(np.eye(3, dtype=np.int32))
+    assert _encode(ints, convert_to_float=True).dtype == np.float64
+
+
+def test_extract_sparse(tmp_path):
+    """Sparse values read from a MAT file are CSC matrices, logical ones bool."""
+    from scipy.io import loadmat, savemat
+
+    from oct2py.io import _extract
+
+    # Responses hold their values in a cell, as `_pyeval` saves them.
+    path = str(tmp_path / "sparse.mat")
+    cell = np.empty((1, 1), dtype=object)
+    cell[0, 0] = scipy.sparse.random_array((4, 3), density=0.5, format="csr", rng=0)
+    savemat(path, {"x": cell})
+    out = _extract(loadmat(path)["x"][0, 0])
+    assert isinstance(out, scipy.sparse.csc_matrix)
+    assert out.dtype == np.float64
+    logical = _extract(scipy.sparse.csc_array(np.eye(3, dtype=np.uint8)))
+    assert isinstance(logical, scipy.sparse.csc_matrix)
+    assert logical.dtype == np.bool_
+    assert np.array_equal(logical.toarray(), np.eye(3, dtype=bool))
+
+
+def test_raw_oned_as(tmp_path):
+    """1-D arrays are written as row or column vectors."""
+    from oct2py.io import read_raw, write_raw
+
+    path = str(tmp_path / "arr.bin")
+    write_raw(np.arange(3.0), path, oned_as="column")
+    assert read_raw(path).shape == (3, 1)
+    write_raw(np.arange(3.0), path)
+    assert read_raw(path).shape == (1, 3)
+
+
+def test_raw_file_reference_extracted(tmp_path):
+    """A struct holding only a raw file path is read as that array."""
+    from oct2py.io import read_file, write_file, write_raw
+
+    raw_path = str(tmp_path / "arr.bin")
+    write_raw(np.eye(3), raw_path)
+    mat_path = str(tmp_path / "test.mat")
+    write_file({"x": {"oct2py_raw_file": raw_path}}, mat_path)
+    assert np.array_equal(read_file(mat_path)["x"], np.eye(3))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Raw files are copied on Windows")
+def test_raw_file_references_nested_are_mapped(tmp_path):
+    """Raw file references in cells and structs decode to mapped views."""
+    from oct2py.io import read_file, write_file, write_raw
+
+    paths = [str(tmp_path / ("arr%d.bin" % i)) for i in range(2)]
+    write_raw(np.eye(3), paths[0])
+    write_raw(np.arange(4.0), paths[1])
+    mat_path = str(tmp_path / "test.mat")
+    value = {"s": {"a": {"oct2py_raw_file": paths[0]}}, "c": ({"oct2py_raw_file": paths[1]}, 1)}
+    write_file(value, mat_path)
+    out = read_file(mat_path)
+    a, c0 = out["s"]["a"], out["c"][0, 0]
+    assert np.array_equal(a, np.eye(3))
+    assert np.array_equal(c0, [[0.0, 1.0, 2.0, 3.0]])
+    for arr in (a, c0):
+        base = arr
+        while not isinstance(base, np.memmap):
+            base = base.base
+    assert not any(os.path.exists(path) for path in paths)
+
+
+def _write_octave_hdf5_var(group, name, type_, value=None):
+    """Write a variable group in the layout of Octave's ``save -hdf5``."""
+    var = group.create_group(name)
+    var.attrs["OCTAVE_NEW_FORMAT"] = np.uint8(1)
+    var.create_dataset("type", data=np.bytes_(type_))
+    if value is not None:
+        var.create_dataset("value", data=value)
+    return var
+
+
+def test_read_file_hdf5(tmp_path):
+    """read_file decodes responses saved in Octave's HDF5 format."""
+    h5py = pytest.importorskip("h5py")
+    from oct2py.io import read_file
+
+    big = np.random.default_rng(0).random((600, 500))
+    complex_type = np.dtype([("real", "<f8"), ("imag", "<f8")])
+    path = str(tmp_path / "reader.mat")
+    with h5py.File(path, "w") as fid:
+        result = _write_octave_hdf5_var(fid, "result", "cell").create_group("value")
+        # Octave saves dims and matrices in reverse order.
+        result.create_dataset("dims", data=np.array([3, 1]))
+        _write_octave_hdf5_var(result, "_0", "matrix", big.T)
+        _write_octave_hdf5_var(result, "_1", "sq_string", np.frombuffer(b"spam", np.int8)[:, None])
+        struct = _write_octave_hdf5_var(result, "_2", "scalar struct").create_group("value")
+        _write_octave_hdf5_var(struct, "x", "scalar", 2.0)
+        _write_octave_hdf5_var(struct, "z", "complex matrix", np.ones((2, 1), complex_type))
+        _write_octave_hdf5_var(struct, "b", "bool matrix", np.array([[1, 0]], np.uint8))
+        _write_octave_hdf5_var(fid, "err", "sq_string", np.zeros((0, 0), np.int8))
+
+    out = read_file(path)
+    assert out["err"] == ""
+    value, text, struct = out["result"].ravel()
+    assert np.array_equal(value, big)
+    assert text == "spam"
+    assert struct.x == 2.0
+    assert struct.z.shape == (1, 2)
+    assert struct.z.dtype == np.complex128
+    assert struct.b.tolist() == [[True], [False]]
+    # The file is removed since the large matrix is mapped from it.
+    assert not os.path.exists(path)
+
+
+def test_read_file_skips_hdf5_probe(tmp_path):
+    """Sessions that do not ask for HDF5 responses never probe for them."""
+    from unittest.mock import MagicMock, patch
+
+    from oct2py import Oct2PySettings
+    from oct2py.io import read_file, write_file
+
+    path = str(tmp_path / "reader.mat")
+    write_file(dict(result=1.0), path)
+    session = MagicMock(settings=Oct2PySettings(transfer_format="v6"))
+    with patch("oct2py.io._is_hdf5") as is_hdf5:
+        assert read_file(path, session)["result"] == 1.0
+    is_hdf5.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Tests for macOS RAM disk helpers and ramdisk_size_mb (issue #322)
 # ---------------------------------------------------------------------------
@@ -1057,3 +1255,61 @@ class TestMacOSRamdisk:
             if device:
                 _detach_macos_ramdisk(device)
         assert not os.path.isdir(mount)
+
+
+def test_homogeneous_cells_and_struct_arrays(tmp_path):
+    """Cells and struct arrays of like values decode the same as mixed ones."""
+    from oct2py.io import Cell, StructArray, read_file, write_file
+
+    mat_path = str(tmp_path / "test.mat")
+    structs = np.empty(2, dtype=[("x", object), ("y", object)])
+    structs[0] = (1.0, "a")
+    structs[1] = (2.0, "bc")
+    value = {
+        "scalars": (1.0, 2.0, 3.0),
+        "strings": ("a", "bcd"),
+        "arrays": (np.eye(2), np.ones((3, 1))),
+        "mixed": (1.0, "a", np.eye(2)),
+        "structs": structs,
+    }
+    write_file(value, mat_path)
+    out = read_file(mat_path)
+    assert isinstance(out["scalars"], Cell)
+    assert out["scalars"].tolist() == [[1.0, 2.0, 3.0]]
+    assert out["strings"].tolist() == [["a", "bcd"]]
+    assert np.array_equal(out["arrays"][0, 1], np.ones((3, 1)))
+    assert out["mixed"][0, 1] == "a"
+    assert isinstance(out["structs"], StructArray)
+    assert out["structs"].x.tolist() == [[1.0, 2.0]]
+    assert out["structs"][0, 1].y == "bc"
+
+    out = read_file(mat_path, keep_matlab_shapes=True)
+    assert out["scalars"][0, 0].shape == (1, 1)
+    assert out["strings"][0, 1] == "bcd"
+
+
+@pytest.mark.parametrize(
+    ("data", "kind"),
+    [
+        ([1, 2.5, True], "f"),
+        ([[1, 2], [3, 4]], "f"),
+        ([1j, 2], "c"),
+        ([], "f"),
+        ([(1, 2), (3, 4)], "O"),
+        ([[1, 2], (3, 4)], "O"),
+        ([np.int64(1), 2], "O"),
+        ([np.ones(2), np.ones(2)], "O"),
+        (["a", "bc"], "O"),
+        ([1, "a"], "O"),
+    ],
+)
+def test_encode_lists(data, kind):
+    """Lists of simple numbers are sent as arrays and other lists as cells."""
+    from oct2py.io import _encode
+
+    out = _encode(data, convert_to_float=True)
+    assert out.dtype.kind == kind
+    if kind == "O":
+        assert out.shape == (len(data),)
+    else:
+        assert np.array_equal(out, np.array(data))
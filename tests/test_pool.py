@@ -0,0 +1,141 @@
+"""Tests for the session pool."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from metakernel.pexpect import EOF
+
+from oct2py import Oct2PyError, Oct2PyPool
+
+
+class FakeSession:
+    """A stand-in for Oct2Py that adds its arguments."""
+
+    def __init__(self, **kwargs):
+        self._engine = MagicMock()
+        self._engine.repl.child.isalive.return_value = True
+        self.thread = None
+        self.restarts = 0
+        self.closed = False
+
+    def feval(self, func_name, *args, **kwargs):
+        if func_name == "error":
+            raise Oct2PyError(args[0])
+        if func_name == "crash":
+            # Octave exits during the call, and the session restarts itself.
+            self.restart()
+            raise Oct2PyError("Session died, restarting")
+        time.sleep(0.01)
+        self.thread = threading.current_thread()
+        return sum(args)
+
+    def batch(self):
+        batch = MagicMock()
+        batch.__enter__.return_value = batch
+        batch.feval.side_effect = lambda name, *args: MagicMock(
+            result=MagicMock(return_value=self.feval(name, *args))
+        )
+        return batch
+
+    def restart(self):
+        self.restarts += 1
+        self._engine = MagicMock()
+
+    def exit(self):
+        self.closed = True
+
+
+class TestPoolFake:
+    """Tests for dispatch and lifecycle without Octave."""
+
+    def _make_pool(self, n=3):
+        with patch("oct2py.pool.Oct2Py", FakeSession):
+            return Oct2PyPool(n)
+
+    def test_submit_and_map(self):
+        """Calls run on all of the sessions and results keep their order."""
+        pool = self._make_pool()
+        assert pool.submit("plus", 1, 2).result() == 3
+        assert list(pool.map("plus", range(20), range(20))) == list(range(0, 40, 2))
+        assert len({session.thread for session in pool.sessions}) == 3
+        assert pool.submit(lambda oc, x: oc is not None and x, 5).result() == 5
+        pool.shutdown()
+        assert all(session.closed for session in pool.sessions)
+        with pytest.raises(RuntimeError):
+            pool.submit("plus", 1, 2)
+
+    def test_map_chunksize(self):
+        """Chunks of calls are batched and the results are flattened."""
+        pool = self._make_pool(2)
+        assert list(pool.map("plus", range(7), range(7), chunksize=3)) == list(range(0, 14, 2))
+        assert list(pool.map(lambda oc, x: x * 2, range(5), chunksize=2)) == [0, 2, 4, 6, 8]
+        pool.shutdown()
+
+    def test_errors_are_set_on_futures(self):
+        """A failing call does not stop its worker."""
+        with self._make_pool(1) as pool:
+            future = pool.submit("error", "spam")
+            with pytest.raises(Oct2PyError):
+                future.result()
+            assert pool.submit("plus", 1, 1).result() == 2
+
+    def test_dead_session_is_restarted(self):
+        """A session whose Octave process died is restarted before a call."""
+        with self._make_pool(1) as pool:
+            session = pool.sessions[0]
+            session._engine.repl.child.isalive.return_value = False
+            assert pool.submit("plus", 1, 1).result() == 2
+            assert session.restarts == 1
+            session._engine = None
+            assert pool.submit("plus", 1, 1).result() == 2
+            assert session.restarts == 2
+
+    def test_call_fails_when_octave_dies(self):
+        """A call whose Octave process dies fails once, on a restarted session."""
+        with self._make_pool(1) as pool:
+            session = pool.sessions[0]
+            calls = []
+
+            def crash(oc):
+                calls.append(oc._engine)
+                oc.feval("crash")
+
+            with pytest.raises(Oct2PyError, match="Session died"):
+                pool.submit(crash).result()
+            assert len(calls) == 1
+            assert session.restarts == 1
+
+            def die(oc):
+                oc._engine.repl.child.isalive.return_value = False
+                raise EOF("End of file")
+
+            with pytest.raises(Oct2PyError, match="Session died"):
+                pool.submit(die).result()
+            assert session.restarts == 2
+            with pytest.raises(Oct2PyError, match="spam"):
+                pool.submit("error", "spam").result()
+            assert pool.submit("plus", 1, 1).result() == 2
+            assert session.restarts == 2
+
+    def test_failed_start_closes_sessions(self):
+        """If a session cannot start, the others are closed."""
+        session = FakeSession()
+        with (
+            patch("oct2py.pool.Oct2Py", side_effect=[session, Oct2PyError("octave not found")]),
+            pytest.raises(Oct2PyError),
+        ):
+            Oct2PyPool(2)
+        assert session.closed
+
+
+class TestPoolOctave:
+    """Exercise the pool against Octave."""
+
+    def test_pool(self):
+        with Oct2PyPool(2) as pool:
+            values = list(pool.map("ones", range(1, 6), chunksize=2))
+            assert [np.size(value) for value in values] == [1, 4, 9, 16, 25]
+            assert pool.submit(lambda oc: oc.feval("pi")).result() == pytest.approx(np.pi)
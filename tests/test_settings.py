@@ -1,13 +1,15 @@
 """Tests for Oct2PySettings and configure()."""
 
 import os
+import subprocess
+import sys
 import tempfile
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 import oct2py
-from oct2py import Oct2Py, Oct2PySettings
+from oct2py import Oct2Py, Oct2PyError, Oct2PySettings
 
 
 class TestOct2PySettings:
@@ -140,6 +142,15 @@ class TestOct2PySettings:
         assert s.plot_height == 600
         assert s.plot_res == 150
 
+    def test_transfer_format_is_validated(self):
+        """transfer_format only accepts the supported file formats."""
+        with patch.dict(os.environ, {"OCT2PY_TRANSFER_FORMAT": "hdf5"}):
+            assert Oct2PySettings().transfer_format == "hdf5"
+        with pytest.raises(ValueError, match="transfer_format"):
+            Oct2PySettings(transfer_format="v7")
+        with pytest.raises(ValueError, match="transfer_format"):
+            Oct2Py(transfer_format="v7")
+
 
 @pytest.fixture()
 def restore_octave():
@@ -149,11 +160,14 @@ def restore_octave():
     never closed by configure() during a test.
     """
     saved = oct2py.octave
+    session, settings = saved._proxy_session, saved._proxy_settings
     with patch.object(saved, "exit"):
         yield
     # Null out the engine of whatever configure() installed, then restore.
-    if oct2py.octave is not saved:
-        oct2py.octave._engine = None
+    if saved._proxy_session is not session:
+        saved._proxy_session._engine = None
+    object.__setattr__(saved, "_proxy_session", session)
+    object.__setattr__(saved, "_proxy_settings", settings)
     oct2py.octave = saved
 
 
@@ -169,10 +183,10 @@ class TestConfigure:
     def test_configure_with_kwargs_builds_settings(self, restore_octave):
         """configure(**kwargs) builds an Oct2PySettings from kwargs."""
         fake = self._make_fake_engine()
-        original = oct2py.octave
+        original = oct2py.octave._proxy_session
         with patch("oct2py.core.OctaveEngine", return_value=fake):
             oct2py.configure(backend="disable", timeout=42)
-        new_instance = oct2py.octave
+        new_instance = oct2py.octave._proxy_session
         assert new_instance is not original
         assert new_instance.settings.backend == "disable"
         assert new_instance.settings.timeout == 42
@@ -181,10 +195,10 @@ class TestConfigure:
         """configure(settings=s) uses the provided settings object directly."""
         s = Oct2PySettings(backend="disable", timeout=99, oned_as="column")
         fake = self._make_fake_engine()
-        original = oct2py.octave
+        original = oct2py.octave._proxy_session
         with patch("oct2py.core.OctaveEngine", return_value=fake):
             oct2py.configure(settings=s)
-        new_instance = oct2py.octave
+        new_instance = oct2py.octave._proxy_session
         assert new_instance is not original
         assert new_instance.settings.backend == "disable"
         assert new_instance.settings.timeout == 99
@@ -193,22 +207,23 @@ class TestConfigure:
     def test_configure_no_args_uses_defaults(self, restore_octave):
         """configure() with no args creates a default-settings instance."""
         fake = self._make_fake_engine()
-        original = oct2py.octave
+        original = oct2py.octave._proxy_session
         with patch("oct2py.core.OctaveEngine", return_value=fake):
             oct2py.configure()
-        new_instance = oct2py.octave
+        new_instance = oct2py.octave._proxy_session
         assert new_instance is not original
         assert isinstance(new_instance.settings, Oct2PySettings)
         assert new_instance.settings.backend == "default"
 
-    def test_configure_replaces_global_octave(self, restore_octave):
-        """configure() replaces oct2py.octave with a new Oct2Py instance."""
+    def test_configure_replaces_default_session(self, restore_octave):
+        """configure() starts a new session behind the same oct2py.octave."""
         fake = self._make_fake_engine()
         before = oct2py.octave
         with patch("oct2py.core.OctaveEngine", return_value=fake):
             oct2py.configure(backend="disable")
-        assert oct2py.octave is not before
-        assert isinstance(oct2py.octave, Oct2Py)
+        assert oct2py.octave is before
+        assert isinstance(oct2py.octave._proxy_session, Oct2Py)
+        assert oct2py.octave.settings.backend == "disable"
 
     def test_configure_exits_old_instance(self):
         """configure() calls exit() on the previous global octave instance."""
@@ -245,3 +260,76 @@ class TestConfigure:
         # The instance settings are derived from s, so backend is preserved.
         assert oct2py.octave.settings.backend == "disable"
         assert oct2py.octave.settings.timeout != 77
+
+
+class TestLazyDefaultSession:
+    """Tests for the lazily started oct2py.octave session."""
+
+    def _make_fake_engine(self, executable="/resolved/octave"):
+        fake = MagicMock()
+        fake.tmp_dir = tempfile.mkdtemp()
+        fake.executable = executable
+        return fake
+
+    def test_session_starts_on_first_use(self):
+        """Creating the proxy does not start Octave; using it does."""
+        fake = self._make_fake_engine()
+        with patch("oct2py.core.OctaveEngine", return_value=fake) as engine_cls:
+            proxy = type(oct2py.octave)()
+            assert "not started" in repr(proxy)
+            proxy.exit()
+            proxy.restart()
+            assert engine_cls.call_count == 0
+            assert proxy.settings.backend == "default"
+            assert engine_cls.call_count == 1
+            logger = MagicMock()
+            proxy.logger = logger
+            assert proxy._proxy_session.logger is logger
+            proxy.restart()
+            assert engine_cls.call_count == 2
+        proxy._proxy_session._engine = None
+
+    def test_failed_start_is_explained(self):
+        """A failure to start the default session says which session failed."""
+        proxy = type(oct2py.octave)()
+        with (
+            patch("oct2py.core.OctaveEngine", side_effect=OSError("octave not found")),
+            pytest.raises(Oct2PyError, match="failed to create default session"),
+        ):
+            proxy.eval("1")
+        assert "not started" in repr(proxy)
+
+    def test_kill_octave_does_not_start_session(self):
+        """kill_octave() leaves a session that was never started alone."""
+        proxy = type(oct2py.octave)()
+        with (
+            patch.object(oct2py, "octave", proxy),
+            patch("os.system") as system,
+            patch("oct2py.core.OctaveEngine") as engine_cls,
+        ):
+            oct2py.kill_octave()
+        assert system.called
+        assert engine_cls.call_count == 0
+
+
+class TestLazyImports:
+    """Tests for the modules that importing oct2py loads."""
+
+    def test_import_does_not_load_heavy_modules(self):
+        """`import oct2py` defers scipy, pandas, pydantic and the kernel."""
+        code = (
+            "import sys, oct2py; "
+            "heavy = ['scipy', 'pandas', 'pydantic_settings', 'octave_kernel', 'metakernel']; "
+            "print([name for name in heavy if name in sys.modules])"
+        )
+        out = subprocess.check_output([sys.executable, "-c", code], text=True)  # noqa: S603
+        assert out.strip() == "[]"
+
+    def test_public_names_are_importable(self):
+        """The lazily loaded names resolve to their classes."""
+        from oct2py.core import Oct2Py as CoreOct2Py
+
+        assert oct2py.Oct2Py is CoreOct2Py
+        assert set(oct2py.__all__) <= set(dir(oct2py))
+        with pytest.raises(AttributeError):
+            oct2py.spam  # noqa:B018
@@ -4,13 +4,14 @@ import pickle
 import sys
 import tempfile
 from io import StringIO
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 from IPython.display import SVG
 
 from oct2py import Oct2Py, Oct2PyError, Struct
-from oct2py.io import MatlabFunction  # type:ignore[attr-defined]
+from oct2py.io import MatlabFunction, read_hdf5  # type:ignore[attr-defined]
 
 
 class TestUsage:
@@ -78,6 +79,42 @@ class TestUsage:
         assert spam == "foo"
         assert np.allclose(eggs, np.array([[1, 2, 3, 4]]))
 
+    def test_push_many_single_round_trip(self):
+        """Pushing several variables uses one Octave call."""
+        names = ["batch_push_%d" % i for i in range(20)]
+        engine = self.oc._engine
+        with patch.object(engine, "eval", wraps=engine.eval) as mock_eval:
+            self.oc.push(names, list(range(20)))
+        assert mock_eval.call_count == 1
+        assert self.oc.pull("batch_push_0") == 0
+        assert self.oc.pull("batch_push_19") == 19
+
+    def test_push_many_invalid_name(self):
+        """An invalid name in a multi-variable push raises an Oct2PyError."""
+        with pytest.raises(Oct2PyError, match='Failed to push "1invalid"'):
+            self.oc.push(["batch_push_ok", "1invalid"], [1, 2])
+
+    def test_pull_many_single_round_trip(self):
+        """Pulling several variables uses one Octave call."""
+        names = ["batch_pull_%d" % i for i in range(30)]
+        self.oc.push(names, list(range(30)))
+        engine = self.oc._engine
+        with patch.object(engine, "eval", wraps=engine.eval) as mock_eval:
+            values = self.oc.pull(names)
+        assert mock_eval.call_count == 1
+        assert values == list(range(30))
+
+    def test_pull_mixed_names(self):
+        """Non-variables come back as pointers and missing names raise."""
+        self.oc.push("batch_pull_var", 3)
+        value, func = self.oc.pull(["batch_pull_var", "ones"])
+        assert value == 3
+        assert func.address == "@ones"
+        with pytest.raises(Oct2PyError, match='"batch_pull_missing" is undefined'):
+            self.oc.pull(["batch_pull_var", "batch_pull_missing"])
+        with pytest.raises(Oct2PyError, match='"batch_pull_a", "batch_pull_b" are undefined'):
+            self.oc.pull(["batch_pull_a", "batch_pull_var", "batch_pull_b"])
+
     def test_help(self):
         """Testing help command"""
         doc = self.oc.cos.__doc__
@@ -299,6 +336,22 @@ class TestUsage:
         val = self.oc.feval("disp", self.oc.zeros)
         assert val.strip() == "@zeros"
 
+    def test_bind(self):
+        ones = self.oc.bind("ones")
+        assert np.allclose(ones(3), np.ones((3, 3)))
+        assert np.allclose(ones(2, 3), np.ones((2, 3)))
+
+        self.oc.push("x", 3)
+        assert np.allclose(ones(self.oc.get_pointer("x")), np.ones((3, 3)))
+
+        self.oc.bind("ones", store_as="foo")(2)
+        assert np.allclose(self.oc.pull("foo"), np.ones((2, 2)))
+
+        here = os.path.dirname(__file__)
+        x, cls = self.oc.bind(os.path.join(here, "roundtrip.m"), nout="max_nout")(1)
+        assert x == 1
+        assert cls == "double"
+
         lines: list[str] = []
         self.oc.feval(
             "evalin", "base", "disp(1);disp(2);disp(3)", nout=0, stream_handler=lines.append
@@ -332,6 +385,177 @@ class TestUsage:
             U, S, V = self.oc.eval("svd(hilb(3))", nout=3)
             assert isinstance(U, np.ndarray)
 
+    def test_eval_batch(self):
+        """A batch of commands runs in one Octave call."""
+        cmds = ["batch_a = 2;", "batch_b = batch_a + 1;", "batch_a * batch_b"]
+        engine = self.oc._engine
+        with patch.object(engine, "eval", wraps=engine.eval) as mock_eval:
+            ans = self.oc.eval(cmds, batch=True)
+        # One call for the plot settings and one for the batch.
+        assert mock_eval.call_count == 2
+        assert ans == 6
+
+        ans = self.oc.eval(["batch_a", "batch_b;", "batch_b"], batch=True, per_command_ans=True)
+        assert ans == [2, None, 3]
+
+        a = self.oc.eval(["zeros(3);", "ones(3);"], batch=True)
+        assert np.allclose(a, np.ones((3, 3)))
+
+    def test_eval_batch_error_stops(self):
+        """A failing command stops the batch and is named in the error."""
+        self.oc.push("batch_c", 0)
+        cmds = ["batch_c = 1;", "batch_undefined_func(1)", "batch_c = 3;"]
+        with pytest.raises(Oct2PyError, match="in command 2 of 3: batch_undefined_func"):
+            self.oc.eval(cmds, batch=True)
+        assert self.oc.pull("batch_c") == 1
+
+    def test_batch(self):
+        """Queued calls run in one Octave call and resolve their futures."""
+        A = np.array([[1.0, 2.0], [1.0, 3.0]])
+        engine = self.oc._engine
+        with patch.object(engine, "eval", wraps=engine.eval) as mock_eval:
+            with self.oc.batch() as b:
+                f0 = b.push("batch_A", A)
+                f1 = b.feval("svd", b.pull("batch_A"), nout=3)
+                f2 = b.feval("norm", f1[1])
+                f3 = b.pull("batch_A")
+            assert len(b) == 0
+        assert mock_eval.call_count == 1
+        assert f0.result() is None
+        U, S, V = f1.result()
+        assert np.allclose(U @ S @ V.T, A)
+        assert np.isclose(f2.result(), np.linalg.norm(A, 2))
+        assert np.allclose(f3.result(), A)
+
+    def test_batch_error(self):
+        """A failing call sets its future's error and cancels the rest."""
+        with pytest.raises(Oct2PyError), self.oc.batch() as b:
+            f0 = b.feval("ones", 2)
+            f1 = b.feval("batch_undefined_func", 1)
+            f2 = b.feval("ones", 3)
+        assert np.allclose(f0.result(), np.ones((2, 2)))
+        with pytest.raises(Oct2PyError):
+            f1.result()
+        assert f2.cancelled()
+
+    def test_raw_transport(self):
+        """Large arrays round trip through raw array files."""
+        with Oct2Py(raw_threshold_bytes=64) as oc:
+            A = np.arange(200.0).reshape(10, 20)
+            assert np.array_equal(oc.feval("transpose", A), A.T)
+            assert np.array_equal(oc.feval("transpose", np.asfortranarray(A)), A.T)
+            C = A + 1j * A
+            assert np.array_equal(oc.feval("double", C), C)
+            B = np.eye(20, dtype=bool)
+            out = oc.feval("logical", B)
+            assert out.dtype == np.bool_
+            assert np.array_equal(out, B)
+            i32 = oc.feval("int32", A)
+            assert i32.dtype == np.int32
+            assert np.array_equal(i32, A)
+            oc.push("raw_x", A)
+            assert np.array_equal(oc.pull("raw_x"), A)
+            assert oc.feval("ones", 2).shape == (2, 2)
+            oc.eval("raw_s.a = ones(10); raw_s.b = {zeros(10), 1};")
+            raw_s = oc.pull("raw_s")
+            assert np.array_equal(raw_s.a, np.ones((10, 10)))
+            assert np.array_equal(raw_s.b[0, 0], np.zeros((10, 10)))
+            assert raw_s.b[0, 1] == 1
+            names = os.listdir(oc.settings.temp_dir)
+            assert not [name for name in names if name.startswith("raw_")]
+
+    def test_raw_sparse_transport(self):
+        """Sparse matrices round trip through raw sparse files."""
+        from scipy.sparse import csc_matrix, csr_array, random_array
+
+        with Oct2Py(raw_threshold_bytes=64) as oc:
+            S = random_array((40, 30), density=0.2, format="csr", rng=0)
+            out = oc.feval("transpose", S)
+            assert isinstance(out, csc_matrix)
+            assert np.array_equal(out.toarray(), S.toarray().T)
+            C = S.tocsc() * (1 + 2j)
+            assert np.array_equal(oc.feval("double", C).toarray(), C.toarray())
+            B = csr_array(np.eye(3, dtype=bool))
+            out = oc.feval("logical", B)
+            assert out.dtype == np.bool_
+            assert oc.feval("issparse", B)
+            assert np.array_equal(out.toarray(), B.toarray())
+            assert oc.feval("nnz", S) == S.nnz
+            names = os.listdir(oc.settings.temp_dir)
+            assert not [name for name in names if name.startswith("raw_")]
+        # Without the raw transport, the MAT file gives the same types.
+        out = self.oc.feval("logical", B)
+        assert isinstance(out, csc_matrix)
+        assert out.dtype == np.bool_
+        assert isinstance(self.oc.feval("transpose", S), csc_matrix)
+
+    def test_push_chunked_iter_pull(self):
+        """Arrays and generators round trip in bounded pieces."""
+        A = np.arange(60.0).reshape(10, 6)
+        self.oc.push_chunked("chunked", A, chunk_bytes=100)
+        assert np.array_equal(self.oc.pull("chunked"), A)
+        self.oc.push_chunked("chunked", A, axis=1, chunk_bytes=100)
+        assert np.array_equal(self.oc.pull("chunked"), A)
+        blocks = list(self.oc.iter_pull("chunked", chunk_rows=3))
+        assert [len(block) for block in blocks] == [3, 3, 3, 1]
+        assert np.array_equal(np.concatenate(blocks), A)
+        blocks = list(self.oc.iter_pull("chunked", axis=1, chunk_rows=4))
+        assert np.array_equal(np.concatenate(blocks, axis=1), A)
+
+        self.oc.push_chunked("chunked", (A[i : i + 2] for i in range(0, 10, 2)))
+        assert np.array_equal(self.oc.pull("chunked"), A)
+        self.oc.push_chunked("chunked", np.arange(5.0), chunk_bytes=16)
+        assert np.array_equal(self.oc.pull("chunked"), [[0, 1, 2, 3, 4]])
+        self.oc.push_chunked("chunked", np.ones((3, 2), dtype=bool), chunk_bytes=2)
+        assert self.oc.pull("chunked").dtype == np.bool_
+        assert not self.oc.exist("_oct2py_chunk")
+
+        self.oc.eval("chunked = {1, 2};")
+        with pytest.raises(Oct2PyError):
+            list(self.oc.iter_pull("chunked"))
+
+    def test_hdf5_transfer_format(self):
+        """Large responses are saved as HDF5 and small ones as MAT files."""
+        pytest.importorskip("h5py")
+        with Oct2Py(transfer_format="hdf5", hdf5_threshold_bytes=1024) as oc:
+            small = oc.feval("ones", 2)
+            assert np.array_equal(small, np.ones((2, 2)))
+            with patch("oct2py.io.read_hdf5", wraps=read_hdf5) as mock_read:
+                oc.eval("hdf5_s.a = rand(40, 30); hdf5_s.b = {int8([1 2 3]), 'spam'};")
+                hdf5_s = oc.pull("hdf5_s")
+                value = oc.feval("complex", np.ones((40, 30)), 2.0)
+            assert mock_read.call_count == 2
+            assert hdf5_s.a.shape == (40, 30)
+            assert hdf5_s.b[0, 0].dtype == np.int8
+            assert hdf5_s.b[0, 1] == "spam"
+            assert np.array_equal(value, np.ones((40, 30)) + 2j)
+            with pytest.raises(Oct2PyError):
+                oc.eval("hdf5_undefined_func(ones(100))")
+
+    @pytest.mark.skipif(os.name == "nt", reason="Not available on Windows")
+    def test_request_server(self):
+        """Calls run through the request server loop."""
+        with Oct2Py(request_server=True) as oc:
+            assert np.allclose(oc.feval("ones", 3), np.ones((3, 3)))
+            assert oc._server.running
+
+            lines: list[str] = []
+            oc.eval("disp(1);disp(2);disp(3)", nout=0, stream_handler=lines.append)
+            assert [line.strip() for line in lines] == ["1", "2", "3"]
+
+            with pytest.raises(Oct2PyError):
+                oc.eval("_spam")
+
+            # Resolving a dynamic function leaves the loop for the prompt.
+            assert oc.zeros(2).shape == (2, 2)
+            oc.push("server_x", [1, 2])
+            assert np.allclose(oc.pull("server_x"), [1, 2])
+
+            with pytest.raises(Oct2PyError, match="Timed out"):
+                oc.eval("pause(10)", timeout=1)
+            assert not oc._server.running
+            assert oc.eval("1 + 1") == 2
+
     def test_no_args_returned(self):
         # Test a function that only works when nargout=0
         here = os.path.dirname(__file__)